@@ -0,0 +1,93 @@
+"""
+Batching - Background task that writes queued items in batches
+Callers enqueue without waiting; the task takes the first item, waits
+`interval` for more to arrive, and hands up to `batch_size` of them to
+`write`. stop() writes everything still held - queued items, the batch
+being collected, and a write that was in progress - so nothing is lost on
+shutdown.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        write: Callable[[List[Any]], Awaitable[None]],
+        batch_size: int,
+        interval: float,
+        max_queue: int,
+    ):
+        self.write = write
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Items taken off the queue but not yet handed to write()
+        self._collecting: List[Any] = []
+        self._inflight: Optional[asyncio.Future] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        return (self._queue.qsize() if self._queue else 0) + len(self._collecting)
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the task and write everything still held"""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # A batch interrupted mid-write is shielded; let it finish
+        if self._inflight and not self._inflight.done():
+            await self._inflight
+        remaining = self._collecting + self._drain(self._queue.qsize())
+        self._collecting = []
+        while remaining:
+            await self.write(remaining[:self.batch_size])
+            remaining = remaining[self.batch_size:]
+
+    def put(self, item: Any) -> bool:
+        """Queue an item. Returns False if the writer isn't running or is full."""
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _drain(self, limit: int) -> List[Any]:
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return items
+
+    async def _run(self):
+        while True:
+            # Held on self, so stop() can write it if we're cancelled while waiting
+            self._collecting = [await self._queue.get()]
+            # Give concurrent callers a moment to add to this batch
+            await asyncio.sleep(self.interval)
+            batch = self._collecting + self._drain(self.batch_size - len(self._collecting))
+            self._collecting = []
+            self._inflight = asyncio.ensure_future(self.write(batch))
+            await asyncio.shield(self._inflight)
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -14,6 +15,73 @@ class Settings(BaseSettings):
     mail_port: Optional[int] = 587
     mail_server: Optional[str] = "smtp.gmail.com"
     
+    # Password hashing (pbkdf2_sha256); raising rounds rehashes users on next login
+    PASSWORD_HASH_ROUNDS: Optional[int] = None  # None = passlib default
+    PASSWORD_HASH_WORKERS: int = 4  # 0 = hash inline on the event loop
+    PASSWORD_HASH_MAX_PENDING: int = 64  # queued + running before returning 503
+    
+    # Initialise mail / payments / PDF rendering at startup instead of on first use
+    WARMUP_ON_STARTUP: bool = True
+    
+    # Payment gateway (Razorpay REST API; point at scripts/fake_payment_gateway.py for tests)
+    RAZORPAY_API_BASE: str = "https://api.razorpay.com/v1"
+    PAYMENT_GATEWAY_TIMEOUT_SECONDS: float = 10.0
+    PAYMENT_GATEWAY_MAX_CONNECTIONS: int = 20
+    PAYMENT_GATEWAY_MAX_RETRIES: int = 2
+    PAYMENT_GATEWAY_BREAKER_THRESHOLD: int = 5  # consecutive failures before failing fast
+    PAYMENT_GATEWAY_BREAKER_RESET_SECONDS: float = 30.0
+    RAZORPAY_WEBHOOK_SECRET: Optional[str] = None
+    PAYMENT_EVENT_BATCH_SIZE: int = 50
+    PAYMENT_EVENT_POLL_SECONDS: float = 30.0  # also picks up events stored by other workers
+    PAYMENT_EVENT_MAX_ATTEMPTS: int = 5
+    
+    # New-inquiry emails to an owner are batched over this window
+    INQUIRY_DIGEST_WINDOW_SECONDS: int = 120
+    INQUIRY_DIGEST_MAX_ITEMS: int = 20
+    
+    # Reminder block masks are re-read after this long (picks up other workers' writes)
+    TRUST_BLOCK_CACHE_TTL_SECONDS: int = 60
+    
+    # Location picks are flushed in batches; popularity halves every N days
+    LOCATION_USAGE_FLUSH_SECONDS: float = 10.0
+    LOCATION_USAGE_MAX_PENDING: int = 500
+    POPULARITY_HALF_LIFE_DAYS: float = Field(14.0, gt=0)
+    
+    # Log every SQL statement (through the logging pipeline, at INFO)
+    DB_ECHO: bool = False
+    
+    # Log requests that keep a pooled DB connection longer than this
+    DB_HOLD_WARN_SECONDS: float = 0.5
+    
+    # OTP storage: "database" (shared by all workers) or "memory" (single process)
+    OTP_STORE_BACKEND: str = "database"
+    OTP_MAX_ATTEMPTS: int = 5
+    OTP_PURGE_INTERVAL_SECONDS: int = 900
+    
+    # Prometheus-format /metrics. It is only served once METRICS_TOKEN is set, and
+    # scrapers must send that token as a Bearer token
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+    
+    # Request tracing: keep TRACE_SAMPLE_RATE of requests plus any that fail or run
+    # longer than TRACE_SLOW_MS; kept traces are appended to TRACE_EXPORT_PATH as OTLP/JSON
+    TRACING_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_SLOW_MS: float = 500.0
+    TRACE_MAX_SPANS: int = 256
+    TRACE_RECENT_MAX: int = 200
+    TRACE_EXPORT_PATH: Optional[str] = None
+    
+    # Logging: records are queued and written by a background thread.
+    # LOG_LEVELS overrides per logger, e.g. "app.routers.reviews=DEBUG,sqlalchemy.engine=WARNING"
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""
+    LOG_FORMAT: str = "text"  # or "json"
+    LOG_QUEUE_MAX: int = 10000
+    # Records from one call site beyond this many per window are dropped (and counted)
+    LOG_REPEAT_LIMIT: int = 20
+    LOG_REPEAT_WINDOW_SECONDS: float = 60.0
+    
     class Config:
         env_file = ".env"
 
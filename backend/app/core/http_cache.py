@@ -0,0 +1,150 @@
+"""
+Conditional GET for rarely-changing catalog endpoints.
+
+Every table has an in-process version counter that is bumped when a
+session commits a write to it (ORM flushes as well as insert/update/delete
+statements). A route's ETag is derived from the versions of the tables it
+reads, its query string and - for per-user routes - the viewer, so an
+If-None-Match hit is answered with 304 before the endpoint runs its query.
+
+Writes made outside this process (scripts, other workers) don't bump the
+counters; ETags also roll over every VERSION_EPOCH_SECONDS so such changes
+become visible within that window.
+"""
+
+import hashlib
+import itertools
+import time
+import uuid
+from typing import Dict, Iterable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.deps import get_current_user_optional
+from app.models.user import User
+
+# Upper bound on staleness from writes this process doesn't see
+VERSION_EPOCH_SECONDS = 300
+
+# Changes on every restart so ETags never match across processes
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+
+class TableVersions:
+    """Per-table write counters"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+
+    def bump(self, tables: Iterable[str]):
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self._versions)
+
+
+table_versions = TableVersions()
+
+
+def _touched(session) -> set:
+    return session.info.setdefault("touched_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    touched = _touched(session)
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            touched.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _touched(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    touched = session.info.pop("touched_tables", None)
+    if touched:
+        table_versions.bump(touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop("touched_tables", None)
+
+
+def compute_etag(request: Request, tables: Iterable[str], viewer: Optional[str] = None) -> str:
+    parts = [
+        _BOOT_ID,
+        str(int(time.time() // VERSION_EPOCH_SECONDS)),
+        request.url.path,
+        "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items())),
+        viewer or "",
+    ]
+    parts.extend(f"{t}:{table_versions.get(t)}" for t in tables)
+    digest = hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore W/ prefixes
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def conditional_get(*tables: str, max_age: int = 60, per_user: bool = False):
+    """
+    Dependency factory for cacheable GET routes.
+
+    Raises a 304 when the client's If-None-Match is current; otherwise sets
+    ETag / Cache-Control on the response and returns the headers (endpoints
+    that build their own Response should pass them through).
+    Per-user routes are marked private and keyed on the viewer.
+    """
+    def respond(request: Request, response: Response, viewer: Optional[str]) -> Dict[str, str]:
+        etag = compute_etag(request, tables, viewer)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"{'private' if per_user else 'public'}, max-age={max_age}",
+        }
+        if per_user:
+            headers["Vary"] = "Authorization"
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return headers
+
+    if per_user:
+        async def dependency(
+            request: Request,
+            response: Response,
+            current_user: Optional[User] = Depends(get_current_user_optional),
+        ) -> Dict[str, str]:
+            return respond(request, response, current_user.id if current_user else None)
+    else:
+        async def dependency(request: Request, response: Response) -> Dict[str, str]:
+            return respond(request, response, None)
+
+    return dependency
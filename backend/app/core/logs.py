@@ -0,0 +1,222 @@
+"""
+Logs - Structured, non-blocking logging
+Handlers on the event loop only copy the record onto a bounded queue; a
+QueueListener thread does the formatting (including tracebacks) and the
+write to stdout. Every record carries the request id (and trace id when the
+request is traced), so lines from one request can be grouped.
+
+- LOG_FORMAT: "text" (one line per record) or "json" (one object per line)
+- LOG_LEVEL / LOG_LEVELS: root level, plus per-logger overrides such as
+  "app.routers.reviews=DEBUG,sqlalchemy.engine=WARNING"
+- LOG_REPEAT_LIMIT per LOG_REPEAT_WINDOW_SECONDS: records beyond this from
+  one call site are dropped before they are queued, and the next record
+  that gets through reports how many were suppressed - an error storm
+  costs a dict lookup per call, not a formatted traceback
+- A full queue drops records instead of blocking the caller
+"""
+
+import atexit
+import json
+import logging
+import queue
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.tracing import current_span
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class ContextFilter(logging.Filter):
+    """Adds request_id and trace_id to every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        span = current_span()
+        record.trace_id = span.trace.trace_id if span is not None else None
+        return True
+
+
+class RepeatFilter(logging.Filter):
+    """Allows at most `limit` records per call site per window"""
+
+    def __init__(self, limit: int, window: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        # (logger, file, line, level) -> [window start, emitted, suppressed]
+        self._sites: Dict[Tuple, list] = {}
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.pathname, record.lineno, record.levelno)
+        now = time.monotonic()
+        site = self._sites.get(key)
+        if site is None or now - site[0] >= self.window:
+            carried = site[2] if site else 0
+            self._sites[key] = [now, 1, 0]
+            record.suppressed = carried
+            return True
+        if site[1] >= self.limit:
+            site[2] += 1
+            self.suppressed += 1
+            return False
+        site[1] += 1
+        record.suppressed = site[2]
+        site[2] = 0
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that never formats or blocks on the calling thread"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.queued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve %-args now (they may change after the call returns); leave
+        # exc_info for the listener thread to format
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.queued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in ("request_id", "trace_id", "suppressed"):
+            value = getattr(record, field, None)
+            if value:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s%(context)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        request_id = getattr(record, "request_id", None)
+        record.context = f" [{request_id}]" if request_id else ""
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            line += f" (+{suppressed} similar suppressed)"
+        return line
+
+
+class LogPipeline:
+    def __init__(self):
+        self.handler: Optional[NonBlockingQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+        self.repeats: Optional[RepeatFilter] = None
+
+    def setup(self):
+        """Route the root logger through the queue (safe to call more than once)"""
+        if self.listener is not None:
+            return
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_MAX)
+        self.handler = NonBlockingQueueHandler(log_queue)
+        self.repeats = RepeatFilter(settings.LOG_REPEAT_LIMIT, settings.LOG_REPEAT_WINDOW_SECONDS)
+        self.handler.addFilter(self.repeats)
+        self.handler.addFilter(ContextFilter())
+
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+        self.listener = QueueListener(log_queue, output, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.shutdown)
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(settings.LOG_LEVEL.upper())
+        for name, level in parse_levels(settings.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+    def shutdown(self):
+        """Write out everything queued and stop the listener thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.handler.queued if self.handler else 0,
+            "queue_depth": self.handler.queue.qsize() if self.handler else 0,
+            "dropped": self.handler.dropped if self.handler else 0,
+            "suppressed": self.repeats.suppressed if self.repeats else 0,
+        }
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """'a.b=DEBUG,c=warning' -> {'a.b': 'DEBUG', 'c': 'WARNING'} (bad entries ignored)"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        name, level = name.strip(), level.strip().upper()
+        if name and level in logging.getLevelNamesMapping():
+            levels[name] = level
+    return levels
+
+
+log_pipeline = LogPipeline()
+
+
+class RequestIdMiddleware:
+    """Sets the request id for log records and echoes it as X-Request-ID"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers", ()):
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex[:16]
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
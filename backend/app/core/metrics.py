@@ -0,0 +1,267 @@
+"""
+Metrics - In-process request, database and background-work metrics
+Served in the Prometheus text format from /metrics.
+
+Collection is cheap and bounded: every route gets its series (a fixed
+bucket list and a few counters) when the app starts, requests are keyed by
+route template (never the raw path), and recording a request only bumps
+integers. Subsystems that already keep counters (audit writer, password
+hasher, payment gateway, ...) are read through collectors at scrape time.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+UNMATCHED_ROUTE = "<unmatched>"
+# The method label comes from the client; anything else is counted as OTHER
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD")
+OTHER_METHOD = "OTHER"
+
+# [queries, seconds] for the request being handled; set by MetricsMiddleware
+_request_db: ContextVar[Optional[List]] = ContextVar("metrics_request_db", default=None)
+
+
+class Histogram:
+    """Cumulative-on-export histogram over fixed buckets"""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class RouteSeries:
+    """Everything recorded for one (method, route template)"""
+
+    __slots__ = ("latency", "statuses", "db_queries", "db_seconds")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statuses = [0] * len(STATUS_CLASSES)
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteSeries] = {}
+        self.status_codes: Dict[int, int] = {}
+        self.in_flight = 0
+        self.queries_per_request = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.collectors: Dict[str, Callable[[], dict]] = {}
+        self.started_at = time.time()
+
+    def register_routes(self, routes):
+        """Pre-allocate series for every HTTP route of the app"""
+        for route in routes:
+            methods = getattr(route, "methods", None)
+            if not methods:
+                continue  # WebSocket routes and mounts
+            for method in methods:
+                self.routes.setdefault((method, route.path), RouteSeries())
+        for method in HTTP_METHODS + (OTHER_METHOD,):
+            self.routes.setdefault((method, UNMATCHED_ROUTE), RouteSeries())
+
+    def add_collector(self, name: str, collect: Callable[[], dict]):
+        """Export a subsystem's stats() dict; numeric values become gauges"""
+        self.collectors[name] = collect
+
+    def observe_request(self, method: str, path: str, status: int, seconds: float, queries: int, db_seconds: float):
+        if method not in HTTP_METHODS:
+            method = OTHER_METHOD
+        series = self.routes.get((method, path))
+        if series is None:
+            # Routes added after startup, or a known method on a route that
+            # doesn't allow it (405); bounded by templates x methods
+            series = self.routes.setdefault((method, path), RouteSeries())
+        series.latency.observe(seconds)
+        series.statuses[min(max(status // 100, 1), 5) - 1] += 1
+        series.db_queries += queries
+        series.db_seconds += db_seconds
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        self.queries_per_request.observe(queries)
+
+    def observe_query(self, seconds: float):
+        self.db_queries += 1
+        self.db_seconds += seconds
+        current = _request_db.get()
+        if current is not None:
+            current[0] += 1
+            current[1] += seconds
+
+    def render(self) -> str:
+        lines: List[str] = []
+        add = lines.append
+
+        add("# HELP http_requests_in_flight Requests currently being handled")
+        add("# TYPE http_requests_in_flight gauge")
+        add(f"http_requests_in_flight {self.in_flight}")
+
+        add("# HELP http_request_duration_seconds Request latency by route")
+        add("# TYPE http_request_duration_seconds histogram")
+        active = [(key, s) for key, s in sorted(self.routes.items()) if s.latency.count]
+        for (method, path), s in active:
+            labels = f'method="{method}",route="{_escape(path)}"'
+            _render_histogram(add, "http_request_duration_seconds", labels, s.latency)
+
+        add("# HELP http_responses_total Responses by route and status class")
+        add("# TYPE http_responses_total counter")
+        for (method, path), s in active:
+            for status_class, count in zip(STATUS_CLASSES, s.statuses):
+                if count:
+                    add(f'http_responses_total{{method="{method}",route="{_escape(path)}",status="{status_class}"}} {count}')
+
+        add("# HELP http_responses_by_code_total Responses by exact status code")
+        add("# TYPE http_responses_by_code_total counter")
+        for code, count in sorted(self.status_codes.items()):
+            add(f'http_responses_by_code_total{{code="{code}"}} {count}')
+
+        add("# HELP http_request_db_queries_total Database queries issued while handling each route")
+        add("# TYPE http_request_db_queries_total counter")
+        for (method, path), s in active:
+            add(f'http_request_db_queries_total{{method="{method}",route="{_escape(path)}"}} {s.db_queries}')
+        add("# HELP http_request_db_seconds_total Time spent in database queries per route")
+        add("# TYPE http_request_db_seconds_total counter")
+        for (method, path), s in active:
+            add(f'http_request_db_seconds_total{{method="{method}",route="{_escape(path)}"}} {s.db_seconds:.6f}')
+
+        add("# HELP http_request_db_queries Database queries per request")
+        add("# TYPE http_request_db_queries histogram")
+        _render_histogram(add, "http_request_db_queries", "", self.queries_per_request)
+
+        add("# HELP db_queries_total Database queries (requests and background work)")
+        add("# TYPE db_queries_total counter")
+        add(f"db_queries_total {self.db_queries}")
+        add("# HELP db_query_seconds_total Time spent in database queries")
+        add("# TYPE db_query_seconds_total counter")
+        add(f"db_query_seconds_total {self.db_seconds:.6f}")
+
+        add("# HELP process_uptime_seconds Seconds since the metrics registry was created")
+        add("# TYPE process_uptime_seconds gauge")
+        add(f"process_uptime_seconds {time.time() - self.started_at:.1f}")
+
+        for name, collect in self.collectors.items():
+            try:
+                values = collect()
+            except Exception as e:
+                add(f"# collector {name} failed: {_escape(str(e))}")
+                continue
+            _render_collected(add, name, values)
+
+        add("")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(add, name: str, labels: str, histogram: Histogram):
+    prefix = f"{labels}," if labels else ""
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        add(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    add(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    add(f"{name}_sum{suffix} {histogram.total:.6f}")
+    add(f"{name}_count{suffix} {histogram.count}")
+
+
+def _render_collected(add, subsystem: str, values: dict):
+    """Numbers become `<subsystem>_<key>` gauges; one level of nested dicts becomes a `key` label"""
+    for key, value in values.items():
+        metric = f"{subsystem}_{key}"
+        if isinstance(value, bool):
+            add(f"{metric} {int(value)}")
+        elif isinstance(value, (int, float)):
+            add(f"{metric} {value}")
+        elif isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, (int, float)) and not isinstance(sub_value, bool):
+                    add(f'{metric}{{key="{_escape(str(sub_key))}"}} {sub_value}')
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and attributes its DB queries to the matched route"""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        status = [500]  # Reported if the app fails before responding
+        db = [0, 0.0]
+        token = _request_db.set(db)
+        registry.in_flight += 1
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.in_flight -= 1
+            _request_db.reset(token)
+            route = scope.get("route")
+            registry.observe_request(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status[0], elapsed, db[0], db[1]
+            )
+
+
+def instrument_engine(engine):
+    """Count and time every query run through an (async) engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        conn.info["metrics_query_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("metrics_query_started", None)
+        if started is not None:
+            metrics.observe_query(time.perf_counter() - started)
+
+
+def pool_stats(engine) -> dict:
+    """Connection pool usage (QueuePool-style pools; others report what they can)"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats = {}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
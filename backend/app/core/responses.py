@@ -0,0 +1,88 @@
+"""
+Fast JSON responses.
+
+FastJSONResponse renders with orjson when it is installed (falling back to
+the stdlib json module) and is the app's default response class.
+
+trusted_response() is for list endpoints whose items come straight from ORM
+rows or already-built schema objects. Items are validated once into the
+schema and dumped to JSON by pydantic-core, skipping FastAPI's second
+response_model validation and jsonable_encoder pass. Endpoints keep their
+response_model so the OpenAPI docs are unchanged.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Type
+from uuid import UUID
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Types neither orjson nor json handle on their own"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # Only reached on the stdlib fallback; orjson handles these natively
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def trusted_response(
+    items: Iterable[Any],
+    schema: Optional[Type[BaseModel]] = None,
+    status_code: int = 200,
+    headers: Optional[dict] = None,
+) -> Response:
+    """
+    Serialize a list in one pass.
+
+    With `schema`, ORM rows are read via from_attributes and schema instances
+    pass through as-is. Without it, items must already be JSON-ready dicts.
+    """
+    if schema is None:
+        body = json_dumps(list(items))
+    else:
+        adapter = _list_adapter(schema)
+        body = adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
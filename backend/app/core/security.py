@@ -1,10 +1,22 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, Tuple
+from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+_rounds_options = {}
+if settings.PASSWORD_HASH_ROUNDS:
+    # min_rounds == default_rounds: hashes with fewer rounds are flagged for rehash
+    _rounds_options = {
+        "pbkdf2_sha256__default_rounds": settings.PASSWORD_HASH_ROUNDS,
+        "pbkdf2_sha256__min_rounds": settings.PASSWORD_HASH_ROUNDS,
+    }
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto", **_rounds_options)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,6 +24,89 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+
+class PasswordHasher:
+    """
+    Runs pbkdf2 hashing on a bounded thread pool so a burst of logins
+    doesn't block the event loop (hashlib releases the GIL while hashing).
+    Requests beyond max_pending are rejected with 503 instead of queueing
+    without limit.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash") if workers > 0 else None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_pending_seen = 0
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        self.max_pending_seen = max(self.max_pending_seen, self.pending)
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            result = fn(*args)
+            return result, started, time.perf_counter()
+
+        try:
+            if self._executor is None:
+                result, started, finished = timed()
+            else:
+                loop = asyncio.get_running_loop()
+                result, started, finished = await loop.run_in_executor(self._executor, timed)
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.wait_seconds += started - submitted
+        self.busy_seconds += finished - started
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify, returning a new hash when the stored one uses outdated parameters"""
+        valid, new_hash = await self._run(pwd_context.verify_and_update, password, hashed_password)
+        if valid and new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "max_pending_seen": self.max_pending_seen,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_hash_ms": round(self.busy_seconds / self.completed * 1000, 2) if self.completed else 0,
+            "avg_queue_wait_ms": round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0,
+        }
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
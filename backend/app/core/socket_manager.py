@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict
 from fastapi import WebSocket
 
 class ConnectionManager:
@@ -19,6 +19,37 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+class UserChannelManager:
+    """Per-user WebSocket channels (a user may have several tabs open)"""
+
+    def __init__(self):
+        self.connections: Dict[str, List[WebSocket]] = {}
+
+    async def connect(self, user_id: str, websocket: WebSocket):
+        await websocket.accept()
+        self.connections.setdefault(user_id, []).append(websocket)
+
+    def disconnect(self, user_id: str, websocket: WebSocket):
+        sockets = self.connections.get(user_id, [])
+        if websocket in sockets:
+            sockets.remove(websocket)
+        if not sockets:
+            self.connections.pop(user_id, None)
+
+    def is_connected(self, user_id: str) -> bool:
+        return user_id in self.connections
+
+    async def send_to_user(self, user_id: str, message: dict):
+        for websocket in list(self.connections.get(user_id, [])):
+            try:
+                await websocket.send_json(message)
+            except Exception:
+                # Socket went away without a clean close
+                self.disconnect(user_id, websocket)
+
+user_channels = UserChannelManager()
+
+
 async def broadcast_cabin_update(cabin_id: str, status: str, **kwargs):
     payload = {
         "cabinId": cabin_id,
@@ -0,0 +1,401 @@
+"""
+Tracing - Lightweight per-request traces
+The current span lives in a contextvar, so spans opened anywhere below a
+request (middleware, SQL statements, payment gateway calls, email sends,
+PDF rendering) attach to that request's trace without passing anything
+around. Outside a request, span() is a no-op - including in tasks that
+outlive the request they were started from (they inherit its contextvar,
+but a finished trace takes no more spans).
+
+Sampling happens at both ends:
+- head: TRACE_SAMPLE_RATE of requests are always kept. An incoming W3C
+  traceparent supplies the trace id and parent, but its sampled flag is
+  ignored so callers can't flood the ring of recent traces
+- tail: every other request is recorded cheaply (at most TRACE_MAX_SPANS
+  spans) and kept only if it failed or took longer than TRACE_SLOW_MS
+
+Kept traces go to an in-memory ring (see /admin/traces) and, when
+TRACE_EXPORT_PATH is set, are appended to that file as OTLP/JSON lines
+(one ExportTraceServiceRequest per line) by a background task, so they
+can be loaded into any OTLP-compatible viewer without a collector.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.batching import BatchWriter
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "studyspace-api"
+TRACE_QUEUE_MAX = 1000
+TRACE_EXPORT_BATCH = 100
+TRACE_EXPORT_INTERVAL_SECONDS = 1.0
+
+# Span kinds as used by OTLP
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace", "name", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], kind: int, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+
+class Trace:
+    __slots__ = ("trace_id", "sampled", "spans", "dropped_spans", "root", "wall_base_ns", "perf_base_ns", "kept_by")
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self.root: Optional[Span] = None
+        self.wall_base_ns = time.time_ns()
+        self.perf_base_ns = time.perf_counter_ns()
+        self.kept_by: Optional[str] = None
+
+    def new_span(self, name: str, parent: Optional[Span], kind: int = KIND_INTERNAL, **attributes) -> Optional[Span]:
+        if self.root is not None and self.root.end_ns is not None:
+            return None  # Already finished (and possibly exported)
+        if len(self.spans) >= settings.TRACE_MAX_SPANS:
+            self.dropped_spans += 1
+            return None
+        span = Span(self, name, parent.span_id if parent else None, kind, attributes)
+        self.spans.append(span)
+        return span
+
+    def wall_ns(self, perf_ns: int) -> int:
+        return self.wall_base_ns + (perf_ns - self.perf_base_ns)
+
+    @property
+    def failed(self) -> bool:
+        return any(s.error for s in self.spans)
+
+    def summary(self) -> dict:
+        root = self.root
+        breakdown: Dict[str, float] = {}
+        for s in self.spans:
+            category = s.name.split(".", 1)[0]
+            if s is root or category == "middleware":
+                continue  # These wrap everything else
+            breakdown[category] = breakdown.get(category, 0.0) + s.duration_ms
+        return {
+            "trace_id": self.trace_id,
+            "name": root.name if root else None,
+            "status_code": root.attributes.get("http.status_code") if root else None,
+            "duration_ms": round(root.duration_ms, 2) if root else None,
+            "started_at": self.wall_base_ns // 1_000_000,
+            "span_count": len(self.spans),
+            "dropped_spans": self.dropped_spans,
+            "kept_by": self.kept_by,
+            "breakdown_ms": {k: round(v, 2) for k, v in sorted(breakdown.items(), key=lambda kv: -kv[1])},
+        }
+
+    def detail(self) -> dict:
+        data = self.summary()
+        data["spans"] = [
+            {
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "name": s.name,
+                "offset_ms": round((s.start_ns - self.perf_base_ns) / 1e6, 3),
+                "duration_ms": round(s.duration_ms, 3),
+                "attributes": s.attributes,
+                "error": s.error,
+            }
+            for s in self.spans
+        ]
+        return data
+
+    def to_otlp(self) -> dict:
+        """One OTLP/JSON ExportTraceServiceRequest holding this trace"""
+        spans = []
+        for s in self.spans:
+            span = {
+                "traceId": self.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": s.kind,
+                "startTimeUnixNano": str(self.wall_ns(s.start_ns)),
+                "endTimeUnixNano": str(self.wall_ns(s.end_ns if s.end_ns is not None else s.start_ns)),
+                "attributes": [_otlp_attribute(k, v) for k, v in s.attributes.items()],
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            }
+            if s.parent_id:
+                span["parentSpanId"] = s.parent_id
+            spans.append(span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": spans}],
+            }]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Tracer:
+    """Sampling decisions, the recent-trace ring and the file exporter"""
+
+    def __init__(self):
+        self.recent: Deque[Trace] = deque(maxlen=settings.TRACE_RECENT_MAX)
+        self._exporter = BatchWriter(self._write, TRACE_EXPORT_BATCH, TRACE_EXPORT_INTERVAL_SECONDS, TRACE_QUEUE_MAX)
+        self.started = 0
+        self.kept_head = 0
+        self.kept_tail = 0
+        self.discarded = 0
+        self.exported = 0
+        self.export_dropped = 0
+        self.export_failed = 0
+
+    # ---- traces ----
+
+    def start_trace(self, name: str, traceparent: Optional[str] = None, **attributes) -> Span:
+        trace_id, parent_id, sampled = None, None, random.random() < settings.TRACE_SAMPLE_RATE
+        match = _TRACEPARENT.match(traceparent or "")
+        if match:
+            # Join the caller's trace, but keep the sampling decision our own
+            trace_id, parent_id = match.group(1), match.group(2)
+        trace = Trace(trace_id or os.urandom(16).hex(), sampled)
+        root = Span(trace, name, parent_id, KIND_SERVER, attributes)
+        trace.spans.append(root)
+        trace.root = root
+        self.started += 1
+        return root
+
+    def finish_trace(self, trace: Trace):
+        trace.root.end()
+        if trace.sampled:
+            trace.kept_by = "head"
+        elif trace.failed:
+            trace.kept_by = "tail:error"
+        elif trace.root.duration_ms >= settings.TRACE_SLOW_MS:
+            trace.kept_by = "tail:slow"
+        else:
+            self.discarded += 1
+            return
+        if trace.kept_by == "head":
+            self.kept_head += 1
+        else:
+            self.kept_tail += 1
+        self.recent.append(trace)
+        self._export(trace)
+
+    def slowest(self, limit: int = 20, min_ms: float = 0.0) -> List[dict]:
+        traces = [t for t in self.recent if t.root.duration_ms >= min_ms]
+        traces.sort(key=lambda t: t.root.duration_ms, reverse=True)
+        return [t.summary() for t in traces[:limit]]
+
+    def find(self, trace_id: str) -> Optional[Trace]:
+        for trace in self.recent:
+            if trace.trace_id == trace_id:
+                return trace
+        return None
+
+    # ---- exporter ----
+
+    @property
+    def running(self) -> bool:
+        return self._exporter.running
+
+    async def start(self):
+        if not settings.TRACE_EXPORT_PATH:
+            return
+        await self._exporter.start()
+
+    async def stop(self):
+        """Stop the exporter and write whatever is still queued"""
+        await self._exporter.stop()
+
+    def _export(self, trace: Trace):
+        if self.running and not self._exporter.put(trace):
+            self.export_dropped += 1
+
+    async def _write(self, traces: List[Trace]):
+        if not traces:
+            return
+        lines = "".join(json.dumps(t.to_otlp(), separators=(",", ":"), default=str) + "\n" for t in traces)
+        try:
+            # File I/O stays off the event loop
+            await asyncio.to_thread(_append, settings.TRACE_EXPORT_PATH, lines)
+            self.exported += len(traces)
+        except Exception as e:
+            self.export_failed += len(traces)
+            logger.error(f"❌ Failed to export {len(traces)} traces: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "started": self.started,
+            "kept_head": self.kept_head,
+            "kept_tail": self.kept_tail,
+            "discarded": self.discarded,
+            "recent": len(self.recent),
+            "export_queue_depth": self._exporter.depth,
+            "exported": self.exported,
+            "export_dropped": self.export_dropped,
+            "export_failed": self.export_failed,
+        }
+
+
+def _append(path: str, text: str):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+tracer = Tracer()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """Time a block as a child of the current span (no-op outside a trace)"""
+    parent = _current_span.get()
+    child = parent.trace.new_span(name, parent, kind, **attributes) if parent is not None else None
+    if child is None:
+        yield None
+        return
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        child.end()
+        _current_span.reset(token)
+
+
+def traced(name: str, kind: int = KIND_INTERNAL):
+    """Decorator form of span() for sync and async functions"""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, kind):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingMiddleware:
+    """Opens the root span of every HTTP request and names it after the matched route"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        root = tracer.start_trace(f"{scope['method']} {scope['path']}", traceparent, **{"http.method": scope["method"]})
+        token = _current_span.set(root)
+
+        async def send_with_trace_id(message: Message):
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                if message["status"] >= 500:
+                    root.error = f"HTTP {message['status']}"
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-trace-id", root.trace.trace_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            route = scope.get("route")
+            root.attributes["http.route"] = route.path if route is not None else scope["path"]
+            root.name = f"{scope['method']} {root.attributes['http.route']}"
+            tracer.finish_trace(root.trace)
+
+
+def instrument_engine(engine):
+    """A db.query span for every SQL statement run inside a trace"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        parent = _current_span.get()
+        if parent is not None:
+            conn.info["trace_span"] = parent.trace.new_span(
+                "db.query", parent, KIND_CLIENT, **{"db.statement": statement[:300], "db.executemany": executemany}
+            )
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        query_span = conn.info.pop("trace_span", None)
+        if query_span is not None:
+            query_span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _query_failed(context):
+        query_span = context.connection.info.pop("trace_span", None) if context.connection is not None else None
+        if query_span is not None:
+            query_span.error = f"{type(context.original_exception).__name__}: {context.original_exception}"
+            query_span.end()
@@ -0,0 +1,78 @@
+"""
+Startup warm-up.
+
+Optional subsystems (mail, payment gateway, PDF invoices) are initialised
+lazily so importing the app stays fast. warm_up() initialises them during
+the startup event - i.e. before uvicorn reports the worker ready - so the
+first real requests don't pay for it. Steps run concurrently; a failing
+step is reported but never blocks startup.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_mail():
+    from app.services.email_service import get_mailer, html_message
+
+    get_mailer()
+    html_message(subject="warm-up", recipients=["warm-up@example.com"], body="")
+
+
+def _warm_payments():
+    from app.services.payment_service import payment_service
+
+    payment_service.client
+
+
+def _warm_invoices():
+    from app.routers.invoices import warm_up_pdf_renderer
+
+    warm_up_pdf_renderer()
+
+
+async def _warm_password_hasher():
+    from app.core.security import password_hasher
+
+    # Loads the passlib backend and starts a worker thread
+    await password_hasher.hash("warm-up")
+
+
+async def _timed(name: str, step, report: Dict[str, dict]):
+    started = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(step):
+            await step()
+        else:
+            await asyncio.to_thread(step)
+        report[name] = {"ok": True, "seconds": round(time.perf_counter() - started, 4)}
+    except Exception as e:
+        report[name] = {"ok": False, "seconds": round(time.perf_counter() - started, 4), "error": str(e)}
+        logger.warning(f"⚠️ Warm-up step '{name}' failed: {e}")
+
+
+WARMUP_STEPS = {
+    "mail": _warm_mail,
+    "payments": _warm_payments,
+    "invoices": _warm_invoices,
+    "password_hasher": _warm_password_hasher,
+}
+
+# Filled in by warm_up(); exposed for diagnostics
+warmup_report: Dict[str, dict] = {}
+
+
+async def warm_up() -> Dict[str, dict]:
+    if not settings.WARMUP_ON_STARTUP:
+        return warmup_report
+    started = time.perf_counter()
+    await asyncio.gather(*(_timed(name, step, warmup_report) for name, step in WARMUP_STEPS.items()))
+    logger.info(f"🔥 Warm-up finished in {time.perf_counter() - started:.2f}s: "
+          + ", ".join(f"{name} {r['seconds']:.2f}s" for name, r in warmup_report.items()))
+    return warmup_report
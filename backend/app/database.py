@@ -1,19 +1,31 @@
+import logging
+import time
+from typing import Optional
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from starlette.requests import HTTPConnection
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Create Async Engine
 # Handle SQLite vs Postgres specific arguments
 connect_args = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
+# No echo=True: it attaches SQLAlchemy's own stdout handler, which writes every
+# statement synchronously (and again through the queued root handler). SQL is
+# logged via the "sqlalchemy.engine" logger instead - DB_ECHO or LOG_LEVELS.
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True, # Set to False in production
+    echo=False,
     future=True,
     connect_args=connect_args
 )
+if settings.DB_ECHO:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
 # Create Session Factory
 AsyncSessionLocal = sessionmaker(
@@ -26,10 +38,83 @@ AsyncSessionLocal = sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+
+class SessionHoldStats:
+    """
+    How long request sessions keep a pooled connection checked out.
+
+    A session only takes a connection when it begins a transaction (first
+    query) and gives it back on commit / rollback / close, so the hold time
+    is the sum of its transactions - not the lifetime of the request.
+    """
+
+    def __init__(self):
+        self.sessions = 0
+        self.sessions_without_queries = 0
+        self.transactions = 0
+        self.hold_seconds = 0.0
+        self.max_hold_seconds = 0.0
+        self.slow_holds = 0
+
+    def record(self, session: AsyncSession, path: Optional[str]):
+        info = session.sync_session.info
+        held = info.pop("db_hold_seconds", 0.0)
+        transactions = info.pop("db_transactions", 0)
+        self.sessions += 1
+        if not transactions:
+            self.sessions_without_queries += 1
+            return
+        self.transactions += transactions
+        self.hold_seconds += held
+        self.max_hold_seconds = max(self.max_hold_seconds, held)
+        if held > settings.DB_HOLD_WARN_SECONDS:
+            self.slow_holds += 1
+            logger.warning(f"⚠️ DB connection held {held:.3f}s across {transactions} transaction(s) on {path}")
+
+    def stats(self) -> dict:
+        with_queries = self.sessions - self.sessions_without_queries
+        return {
+            "sessions": self.sessions,
+            "sessions_without_queries": self.sessions_without_queries,
+            "transactions": self.transactions,
+            "hold_seconds": round(self.hold_seconds, 4),
+            "avg_hold_seconds": round(self.hold_seconds / with_queries, 4) if with_queries else 0.0,
+            "max_hold_seconds": round(self.max_hold_seconds, 4),
+            "slow_holds": self.slow_holds,
+        }
+
+
+session_hold_stats = SessionHoldStats()
+
+
+@event.listens_for(Session, "after_begin")
+def _connection_acquired(session, transaction, connection):
+    session.info["db_held_since"] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _connection_released(session, transaction):
+    started = session.info.pop("db_held_since", None) if transaction.parent is None else None
+    if started is not None:
+        session.info["db_hold_seconds"] = session.info.get("db_hold_seconds", 0.0) + time.perf_counter() - started
+        session.info["db_transactions"] = session.info.get("db_transactions", 0) + 1
+
+
 # Dependency to get DB session
-async def get_db():
+async def get_db(connection: HTTPConnection):
+    """
+    Request-scoped session.
+
+    FastAPI caches dependencies per request, so the route and everything it
+    depends on (get_current_user, conditional_get, ...) share this one
+    session. It is lazy: nothing is checked out of the pool until the first
+    query, so requests rejected before touching the DB (bad token, 304)
+    never take a connection. Commit before slow non-DB awaits (emails,
+    gateway calls) to hand the connection back while waiting.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+            session_hold_stats.record(session, connection.url.path)
@@ -1,3 +1,4 @@
+import logging
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -8,6 +9,9 @@ from app.core.config import settings
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import TokenData
+from app.services.trust_blocks import trust_blocks, BLOCK_NAMES
+
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -19,33 +23,26 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: As
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    import os
     try:
-        # Debug: Log the actual token received
-        with open("debug_log.txt", "a") as f: 
-            f.write(f"Received token: '{token}' (length: {len(token)})\n")
-        
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             credentials_exception.detail = "Token payload missing sub (email)"
-            with open("debug_log.txt", "a") as f: f.write("Token missing sub\n")
+            logger.debug("Rejected token: payload missing sub")
             raise credentials_exception
         token_data = TokenData(email=email)
     except JWTError as e:
         credentials_exception.detail = f"JWT Error: {str(e)}"
-        with open("debug_log.txt", "a") as f: f.write(f"JWT Error: {str(e)} | Token: '{token[:50] if token else 'NONE'}...'\n")
+        logger.debug(f"Rejected token: {e}")
         raise credentials_exception
     
     result = await db.execute(select(User).where(User.email == token_data.email))
     user = result.scalars().first()
     if user is None:
         credentials_exception.detail = f"User not found for email: {token_data.email}"
-        with open("debug_log.txt", "a") as f: f.write(f"User not found: {token_data.email}\n")
+        logger.debug(f"Rejected token: no user for {token_data.email}")
         raise credentials_exception
     
-    # Simple log
-    # with open("debug_log.txt", "a") as f: f.write(f"Auth success for: {user.email}\n")
     return user
 
 async def get_current_active_user(current_user: Annotated[User, Depends(get_current_user)]):
@@ -56,7 +53,8 @@ async def get_current_active_user(current_user: Annotated[User, Depends(get_curr
 # OAuth2 scheme with auto_error=False to support optional auth
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
-async def get_current_user_optional(token: Annotated[str | None, Depends(oauth2_scheme_optional)], db: AsyncSession = Depends(get_db)):
+async def get_user_from_token(token: str | None, db: AsyncSession):
+    """Resolve a bearer token to a User, or None (used where Depends can't read headers, e.g. WebSockets)"""
     if not token:
         return None
     try:
@@ -72,6 +70,9 @@ async def get_current_user_optional(token: Annotated[str | None, Depends(oauth2_
     user = result.scalars().first()
     return user
 
+async def get_current_user_optional(token: Annotated[str | None, Depends(oauth2_scheme_optional)], db: AsyncSession = Depends(get_db)):
+    return await get_user_from_token(token, db)
+
 async def get_current_admin(current_user: Annotated[User, Depends(get_current_user)]):
     if current_user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
         raise HTTPException(
@@ -80,6 +81,25 @@ async def get_current_admin(current_user: Annotated[User, Depends(get_current_us
         )
     return current_user
 
+def require_unblocked(block: int):
+    """
+    Dependency factory: rejects users whose pending verification reminders
+    block this action (BLOCK_LISTINGS / BLOCK_PAYMENTS / BLOCK_BOOKINGS from
+    app.services.trust_blocks) and returns the current user otherwise.
+    """
+    async def check_blocks(
+        current_user: Annotated[User, Depends(get_current_user)],
+        db: AsyncSession = Depends(get_db)
+    ):
+        mask = await trust_blocks.get(db, current_user.id)
+        if mask & block:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Complete your pending verification to continue ({BLOCK_NAMES[block]} are blocked)",
+            )
+        return current_user
+    return check_blocks
+
 async def get_current_super_admin(current_user: Annotated[User, Depends(get_current_user)]):
     if current_user.role != UserRole.SUPER_ADMIN:
         raise HTTPException(
@@ -1,26 +1,50 @@
 
 from fastapi import FastAPI, Depends, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.database import engine, Base
+from app.database import engine, Base, session_hold_stats
 # from app.database import engine, Base # Duplicate removed
-from app.routers import auth, reading_rooms, cabins, bookings, accommodations, waitlist, ads, ad_categories, locations, admin_cities, users, reviews, inquiries, trust, payments, reset, invoices, boost, cache, subscriptions, favorites, razorpay, otp, venue_payments, messages, notifications
+from app.routers import auth, reading_rooms, cabins, bookings, accommodations, waitlist, ads, ad_categories, locations, admin_cities, users, reviews, inquiries, trust, payments, reset, invoices, boost, cache, subscriptions, favorites, razorpay, otp, venue_payments, messages, notifications, moderation, traces
 from app.models.inquiry import Inquiry  # Ensure table is created
 from app.models.trust_flag import TrustFlag  # Ensure trust tables are created
 from app.models.reminder import Reminder
 from app.models.audit_log import AuditLog
+from app.models.message import Message, Conversation
+from app.models.notification import Notification
 from app.models.invoice import Invoice  # Invoice model for PDF generation
+from app.models.payment_event import PaymentEvent  # Webhook inbox
+from app.services.audit_service import audit_writer
+from app.services.otp_store import otp_purge_job
+from app.services.inquiry_service import owner_digests
+from app.services.location_usage import location_usage
+from app.services.payment_service import payment_service
+from app.services.payment_events import payment_event_processor
+from app.core.security import password_hasher
+from app.core.warmup import warm_up
+from app.core.responses import FastJSONResponse
+from app.core.metrics import metrics, MetricsMiddleware, instrument_engine, pool_stats
+from app.core.tracing import tracer, TracingMiddleware, instrument_engine as trace_engine
+from app.core.logs import log_pipeline, RequestIdMiddleware
+from app.core.socket_manager import user_channels
+from app.services.trust_blocks import trust_blocks
 from app.middleware.security import (
     SecurityHeadersMiddleware,
     RateLimitMiddleware,
     InputValidationMiddleware,
-    setup_cors
+    setup_cors,
+    rate_limit_stats
 )
+from app.middleware.compression import CompressionMiddleware, compression_stats
 from typing import List
-import traceback
+import hmac
+import logging
 
-app = FastAPI(title="StudySpace Manager API")
+# Before anything logs: records go through a queue to a writer thread
+log_pipeline.setup()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="StudySpace Manager API", default_response_class=FastJSONResponse)
 
 # Security Middleware (Add before CORS)
 app.add_middleware(SecurityHeadersMiddleware)
@@ -30,8 +54,7 @@ app.add_middleware(InputValidationMiddleware)
 # Global Exception Handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    print(f"Global Exception: {exc}")
-    traceback.print_exc()
+    logger.exception(f"Unhandled exception on {request.method} {request.url.path}: {exc}", exc_info=exc)
     # Add CORS headers to error responses
     origin = request.headers.get("origin", "*")
     return JSONResponse(
@@ -70,6 +93,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression (outermost, so every response passes through it)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=1024,
+    prefix_levels={
+        # Large, infrequent exports: favour ratio over speed
+        "/api/trust/audit-log": {"gzip": 9, "br": 8, "zstd": 9},
+        "/payments/owner/payment-history": {"gzip": 7, "br": 6, "zstd": 6},
+        # Hot listing endpoints: favour latency
+        "/reading-rooms": {"gzip": 4, "br": 3, "zstd": 1},
+        "/accommodations": {"gzip": 4, "br": 3, "zstd": 1},
+    },
+)
+
+# Metrics (outside compression, so timings cover the whole stack)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+
+# Tracing (outermost: the root span covers every middleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+    trace_engine(engine)
+
+# Request ids for log records (outermost, so every layer's logs carry one)
+app.add_middleware(RequestIdMiddleware)
+
 # Include Routers
 app.include_router(auth.router)
 app.include_router(reading_rooms.router)
@@ -98,14 +148,79 @@ app.include_router(venue_payments.router)  # Venue Subscription Payments
 app.include_router(messages.router)  # Messaging between users and owners
 app.include_router(notifications.router)  # Notifications system
 app.include_router(cache.router)  # Cache Management (Super Admin)
+app.include_router(moderation.router)  # Batch venue verification (Super Admin)
+app.include_router(traces.router)  # Slowest recent traces (Super Admin)
 # Database Tables Creation (For simple setup)
 @app.on_event("startup")
 async def startup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    if settings.METRICS_ENABLED:
+        metrics.register_routes(app.routes)
+    await audit_writer.start()
+    await otp_purge_job.start()
+    await owner_digests.start()
+    await payment_event_processor.start()
+    await location_usage.start()
+    await tracer.start()
+    # Initialise lazy subsystems before the worker reports ready
+    await warm_up()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Flush queued audit entries before the worker exits
+    await audit_writer.stop()
+    await otp_purge_job.stop()
+    # Send inquiry digests still inside their window
+    await owner_digests.stop()
+    await payment_event_processor.stop()
+    # Write location picks still held in memory
+    await location_usage.stop()
+    # Export traces kept before shutdown
+    await tracer.stop()
+    await payment_service.aclose()
+    password_hasher.shutdown()
+
+# Subsystem counters exported on /metrics
+metrics.add_collector("studyspace_db_pool", lambda: pool_stats(engine))
+metrics.add_collector("studyspace_db_sessions", session_hold_stats.stats)
+metrics.add_collector("studyspace_audit", lambda: {
+    "queue_depth": audit_writer.queue_depth,
+    "written": audit_writer.written,
+    "failed": audit_writer.failed,
+})
+metrics.add_collector("studyspace_otp_purge", lambda: {"purged": otp_purge_job.purged})
+metrics.add_collector("studyspace_inquiry_emails", owner_digests.stats)
+metrics.add_collector("studyspace_password_hasher", password_hasher.stats)
+metrics.add_collector("studyspace_payment_gateway", payment_service.stats)
+metrics.add_collector("studyspace_payment_events", payment_event_processor.stats)
+metrics.add_collector("studyspace_location_usage", location_usage.stats)
+metrics.add_collector("studyspace_trust_blocks", trust_blocks.stats)
+metrics.add_collector("studyspace_compression", compression_stats.stats)
+metrics.add_collector("studyspace_rate_limit", rate_limit_stats.stats)
+metrics.add_collector("studyspace_tracing", tracer.stats)
+metrics.add_collector("studyspace_logging", log_pipeline.stats)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus text exposition of request, DB and background-work metrics"""
+    # Route inventory and error rates aren't public: no token configured, no exporter
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    supplied = request.headers.get("authorization", "").encode()
+    if not hmac.compare_digest(supplied, f"Bearer {settings.METRICS_TOKEN}".encode()):
+        return JSONResponse(status_code=401, content={"detail": "Invalid metrics token"})
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 from app.core.socket_manager import manager
 
+metrics.add_collector("studyspace_websockets", lambda: {
+    "cabin_connections": len(manager.active_connections),
+    "user_channel_users": len(user_channels.connections),
+    "user_channel_connections": sum(len(s) for s in user_channels.connections.values()),
+})
+
 @app.websocket("/ws/cabins")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
@@ -0,0 +1,295 @@
+"""
+Response compression middleware.
+
+Negotiates zstd / brotli / gzip from Accept-Encoding (brotli and zstd only
+when their packages are installed), leaves small bodies and already
+compressed content (PDFs, images, archives) alone, and compresses streamed
+responses chunk by chunk instead of buffering them. Levels can be tuned per
+route prefix; compression_stats keeps byte and CPU counters.
+"""
+
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bodies smaller than this are sent as-is
+DEFAULT_MINIMUM_SIZE = 1024
+
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Content that is already compressed (or not worth it)
+SKIP_CONTENT_TYPES = (
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/octet-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Supported encodings in server preference order"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+def negotiate_encoding(accept_encoding: str, supported: Tuple[str, ...]) -> Optional[str]:
+    """Pick the client's highest-q encoding, breaking ties by server preference"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Streaming compressor with a uniform compress / flush / finish interface"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far without ending the stream"""
+        if self.encoding == "gzip":
+            return self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.flush()
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+class CompressionStats:
+    def __init__(self):
+        self.compressed: Dict[str, int] = {}
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float):
+        self.compressed[encoding] = self.compressed.get(encoding, 0) + 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.cpu_seconds += cpu_seconds
+
+    def stats(self) -> dict:
+        return {
+            "responses_compressed": dict(self.compressed),
+            "responses_skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "cpu_seconds": round(self.cpu_seconds, 4),
+        }
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware (not BaseHTTPMiddleware) so streamed responses are
+    compressed as they are produced.
+
+    prefix_levels maps a path prefix to per-encoding levels, e.g.
+    {"/api/trust/audit-log": {"gzip": 9, "br": 6}}; the longest prefix wins.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        levels: Optional[Dict[str, int]] = None,
+        prefix_levels: Optional[Dict[str, Dict[str, int]]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+        # Longest prefix first so the most specific rule matches
+        self.prefix_levels = sorted((prefix_levels or {}).items(), key=lambda item: -len(item[0]))
+        self.supported = available_encodings()
+
+    def level_for(self, path: str, encoding: str) -> int:
+        for prefix, levels in self.prefix_levels:
+            if path.startswith(prefix) and encoding in levels:
+                return levels[encoding]
+        return self.levels[encoding]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.supported)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(
+            send, encoding, self.level_for(scope["path"], encoding), self.minimum_size
+        )
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+        self.pending = b""
+        self.expected_length: Optional[int] = None
+        self.swallow_rest = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def _should_skip(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return True
+        content_type = headers.get("content-type", "").lower()
+        if content_type.startswith(SKIP_CONTENT_TYPES):
+            return True
+        content_length = headers.get("content-length")
+        if content_length is not None and int(content_length) < self.minimum_size:
+            return True
+        return False
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            status = message["status"]
+            headers = Headers(raw=message["headers"])
+            if status < 200 or status in (204, 304) or self._should_skip(headers):
+                self.passthrough = True
+                compression_stats.skipped += 1
+                await self.send(message)
+            elif "content-length" in headers:
+                self.expected_length = int(headers["content-length"])
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        if self.swallow_rest:
+            # Trailing empty chunks after a body we already completed
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            self.pending += body
+            if more_body and self.expected_length is not None and len(self.pending) >= self.expected_length:
+                # Re-chunked by an inner middleware, but the whole body is here
+                more_body = False
+                self.swallow_rest = True
+            if len(self.pending) < self.minimum_size:
+                if more_body:
+                    # Keep buffering until we know whether it's worth compressing
+                    return
+                # Whole response is small; send it untouched
+                self.passthrough = True
+                compression_stats.skipped += 1
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": self.pending})
+                return
+
+            self.compressor = _Compressor(self.encoding, self.level)
+            body, self.pending = self.pending, b""
+            if not more_body:
+                data = self._compress(body, final=True)
+                self._prepare_headers(len(data))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": data})
+                self._record()
+                return
+            # Streaming: length is unknown, send chunked
+            self._prepare_headers(None)
+            await self.send(self.start_message)
+
+        data = self._compress(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+        if not more_body:
+            self._record()
+
+    def _compress(self, body: bytes, final: bool) -> bytes:
+        started = time.thread_time()
+        data = self.compressor.compress(body)
+        data += self.compressor.finish() if final else self.compressor.flush()
+        self.cpu_seconds += time.thread_time() - started
+        self.bytes_in += len(body)
+        self.bytes_out += len(data)
+        return data
+
+    def _prepare_headers(self, content_length: Optional[int]):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The encoded bytes differ from the identity representation
+            headers["ETag"] = f"W/{etag}"
+
+    def _record(self):
+        compression_stats.record(self.encoding, self.bytes_in, self.bytes_out, self.cpu_seconds)
@@ -13,13 +13,29 @@ from collections import defaultdict
 import re
 import logging
 
+from app.core.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
+class RateLimitStats:
+    """Requests turned away by RateLimitMiddleware, per limit"""
+
+    def __init__(self):
+        self.rejected = {"login": 0, "register": 0, "default": 0}
+
+    def stats(self) -> dict:
+        return {"rejected": dict(self.rejected), "rejected_total": sum(self.rejected.values())}
+
+
+rate_limit_stats = RateLimitStats()
+
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """
     Adds security headers to all responses
     """
+    @traced("middleware.SecurityHeaders")
     async def dispatch(self, request: Request, call_next: Callable):
         response = await call_next(request)
         
@@ -66,17 +82,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.requests_per_minute = requests_per_minute
         self.requests = defaultdict(list)
         
+    @traced("middleware.RateLimit")
     async def dispatch(self, request: Request, call_next: Callable):
         # Get client IP
         client_ip = request.client.host
         
         # Special rate limits for sensitive endpoints
         if request.url.path.startswith("/api/auth/login"):
-            limit = 5  # Only 5 login attempts per minute
+            limit, kind = 5, "login"  # Only 5 login attempts per minute
         elif request.url.path.startswith("/api/auth/register"):
-            limit = 3  # Only 3 registration attempts per minute
+            limit, kind = 3, "register"  # Only 3 registration attempts per minute
         else:
-            limit = self.requests_per_minute
+            limit, kind = self.requests_per_minute, "default"
         
         current_time = time.time()
         
@@ -89,6 +106,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Check rate limit
         if len(self.requests[client_ip]) >= limit:
             logger.warning(f"Rate limit exceeded for IP: {client_ip} on {request.url.path}")
+            rate_limit_stats.rejected[kind] += 1
             return JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
@@ -125,6 +143,7 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
         r"\$\{",  # Template injection
     ]
     
+    @traced("middleware.InputValidation")
     async def dispatch(self, request: Request, call_next: Callable):
         # Skip validation for certain paths
         if request.url.path.startswith("/docs") or request.url.path.startswith("/openapi"):
@@ -165,6 +184,7 @@ class IPWhitelistMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.whitelist = whitelist or ["127.0.0.1", "::1"]
     
+    @traced("middleware.IPWhitelist")
     async def dispatch(self, request: Request, call_next: Callable):
         # Only check admin routes
         if request.url.path.startswith("/api/admin") or request.url.path.startswith("/api/super-admin"):
@@ -5,6 +5,8 @@ from app.models.accommodation import Accommodation
 from app.models.booking import Booking, BookingStatus
 from app.models.review import Review
 from app.models.waitlist import WaitlistEntry
+from app.models.message import Conversation, Message
+from app.models.notification import Notification
 from app.models.favorite import Favorite
 from app.models.city import CitySettings
 from app.models.ad import Ad
@@ -20,6 +22,7 @@ from app.models.audit_log import AuditLog, AuditActionType
 # Payments & Refunds
 from app.models.refund import Refund, RefundStatus, RefundReason
 from app.models.payment_transaction import PaymentTransaction, PaymentMethod, PaymentGateway
+from app.models.payment_event import PaymentEvent, PaymentEventStatus
 
 # Boost / Promotions
 from app.models.boost_plan import BoostPlan, BoostPlanStatus, BoostApplicableTo, BoostPlacement
@@ -1,5 +1,6 @@
 import uuid
 from sqlalchemy import Column, String, Integer, Float, ForeignKey, Enum, Boolean
+from sqlalchemy.orm import validates
 from app.database import Base
 import enum
 
@@ -13,7 +14,7 @@ class AccommodationType(str, enum.Enum):
     HOSTEL = "HOSTEL"
 
 
-from app.models.reading_room import ListingStatus
+from app.models.reading_room import ListingStatus, first_image
 
 class Accommodation(Base):
     __tablename__ = "accommodations"
@@ -33,6 +34,7 @@ class Accommodation(Base):
     sharing = Column(String, nullable=False)
     amenities = Column(String, nullable=True) # Comma-separated
     images = Column(String, nullable=True) # JSON list
+    primary_image = Column(String, nullable=True) # First entry of images, synced on write
     contact_phone = Column(String, nullable=True)
     rating = Column(Float, default=0.0)
 
@@ -53,14 +55,14 @@ class Accommodation(Base):
     payment_id = Column(String, nullable=True)  # Razorpay payment ID
     payment_date = Column(String, nullable=True)  # Using String for datetime to avoid migration issues
     
+    @validates("images")
+    def _sync_primary_image(self, key, value):
+        self.primary_image = first_image(value)
+        return value
+    
     @property
     def image_url(self):
         # Fallback for frontend
-        if self.images:
-            try:
-                import json
-                imgs = json.loads(self.images)
-                return imgs[0] if imgs else None
-            except:
-                return self.images
-        return None
+        if self.primary_image:
+            return self.primary_image
+        return first_image(self.images)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Enum, DateTime, Text
+from sqlalchemy import Column, String, Enum, DateTime, Text, Index
 from app.database import Base
 import enum
 
@@ -47,8 +47,16 @@ class AuditLog(Base):
     """
     Immutable audit log for all trust & safety actions.
     Read-only after creation - no updates or deletes allowed.
+
+    Rows are bucketed by month (partition_key = 'YYYY-MM'); old months
+    are moved out whole to compressed archive files, never row by row.
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_entity_timestamp", "entity_type", "entity_id", "timestamp"),
+        Index("ix_audit_logs_actor_timestamp", "actor_id", "timestamp"),
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     
@@ -72,6 +80,9 @@ class AuditLog(Base):
     # Immutable timestamp
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     
+    # Monthly partition bucket derived from timestamp ('YYYY-MM')
+    partition_key = Column(String(7), nullable=True, index=True)
+    
     # IP and session info for security audits
     ip_address = Column(String, nullable=True)
     session_id = Column(String, nullable=True)
@@ -36,6 +36,10 @@ class Location(Base):
     
     # Popularitty tracking for sorting autocomplete results
     usage_count = Column(Integer, default=0)
+    # Forward-decayed pick score (see app/services/location_usage.py)
+    popularity_score = Column(Float, default=0.0, nullable=False, index=True)
+    # Unix time popularity_score is relative to; moved forward by periodic rebases
+    popularity_epoch = Column(Float, nullable=True)
     
     # Status
     is_active = Column(Boolean, default=True)
@@ -1,11 +1,15 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Index
 from app.database import Base
 
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Recent-first listing and `since` catch-up per user
+        Index("ix_notifications_user_date", "user_id", "date"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Enum, DateTime, Text, Integer, Index
+from app.database import Base
+import enum
+
+
+class PaymentEventStatus(str, enum.Enum):
+    RECEIVED = "RECEIVED"    # Stored, waiting for the worker
+    APPLIED = "APPLIED"      # Changes written to bookings / transactions / venues
+    IGNORED = "IGNORED"      # Event type we don't act on, or nothing to update
+    FAILED = "FAILED"        # Gave up after PAYMENT_EVENT_MAX_ATTEMPTS
+
+
+class PaymentEvent(Base):
+    """
+    Inbox of payment gateway webhook deliveries.
+    The idempotency key is unique, so redelivered events are dropped on insert.
+    """
+    __tablename__ = "payment_events"
+    __table_args__ = (
+        Index("ix_payment_events_status_received", "status", "received_at"),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    idempotency_key = Column(String, nullable=False, unique=True)  # X-Razorpay-Event-Id (or body hash)
+    event_type = Column(String, nullable=False)  # e.g. "payment.captured", "refund.processed"
+    order_id = Column(String, nullable=True, index=True)
+    payment_id = Column(String, nullable=True, index=True)
+    payload = Column(Text, nullable=False)  # Raw JSON body as delivered
+
+    status = Column(Enum(PaymentEventStatus), default=PaymentEventStatus.RECEIVED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
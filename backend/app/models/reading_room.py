@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from sqlalchemy import Column, String, Integer, Float, ForeignKey, Boolean, Enum, ARRAY, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.database import Base
 import enum
 
@@ -21,6 +21,20 @@ class ListingStatus(str, enum.Enum):
     SUSPENDED = "SUSPENDED"
 
 
+def first_image(images):
+    """First URL from an images JSON list (or a legacy raw URL string)"""
+    if not images:
+        return None
+    try:
+        import json
+        imgs = json.loads(images)
+        if isinstance(imgs, list):
+            return imgs[0] if imgs else None
+        return images
+    except:
+        return images # Fallback if stored as raw string previously
+
+
 # TrustStatus is stored as String column with values: CLEAR, FLAGGED, UNDER_REVIEW, SUSPENDED
 
 class ReadingRoom(Base):
@@ -33,6 +47,8 @@ class ReadingRoom(Base):
     description = Column(String, nullable=True)
     # Changed from single image_url to images (JSON string of list)
     images = Column(String, nullable=True) 
+    # First entry of images, kept in sync on write so lists don't parse the JSON blob
+    primary_image = Column(String, nullable=True)
     # Backward compatibility accessor if needed, or simply remove image_url and migrate
     amenities = Column(String, nullable=True) 
     contact_phone = Column(String, nullable=True)
@@ -70,17 +86,17 @@ class ReadingRoom(Base):
 
     cabins = relationship("Cabin", back_populates="reading_room")
     
+    @validates("images")
+    def _sync_primary_image(self, key, value):
+        self.primary_image = first_image(value)
+        return value
+    
     @property
     def image_url(self):
         # Fallback for frontend that expects single image_url
-        if self.images:
-            try:
-                import json
-                imgs = json.loads(self.images)
-                return imgs[0] if imgs else None
-            except:
-                return self.images # Fallback if stored as raw string previously
-        return None
+        if self.primary_image:
+            return self.primary_image
+        return first_image(self.images)
 
 class Cabin(Base):
     __tablename__ = "cabins"
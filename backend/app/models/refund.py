@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Float, ForeignKey, DateTime, Enum, Text
+from sqlalchemy import Column, String, Float, ForeignKey, DateTime, Enum, Text, Index
 from app.database import Base
 
 import enum
@@ -26,6 +26,11 @@ class RefundReason(str, enum.Enum):
 
 class Refund(Base):
     __tablename__ = "refunds"
+    __table_args__ = (
+        # Admin queue: status filter + newest-first keyset paging
+        Index("ix_refunds_status_requested", "status", "requested_at", "id"),
+        Index("ix_refunds_requested", "requested_at", "id"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     booking_id = Column(String, ForeignKey("bookings.id"), nullable=False)
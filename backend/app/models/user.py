@@ -1,5 +1,6 @@
+import re
 import uuid
-from sqlalchemy import Column, String, Enum, Float
+from sqlalchemy import Column, String, Enum, Float, Text, Index, event
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
 import enum
@@ -18,6 +19,10 @@ class VerificationStatus(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin directory: role filter + keyset paging by email
+        Index("ix_users_role_email", "role", "email"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     email = Column(String, unique=True, index=True, nullable=False)
@@ -31,3 +36,19 @@ class User(Base):
     # Location Data
     current_lat = Column(Float, nullable=True)
     current_long = Column(Float, nullable=True)
+    
+    # Lowercased "name email phone-digits" for directory search
+    # (trigram-indexed on PostgreSQL, see scripts/migrate_user_directory.py)
+    search_text = Column(Text, nullable=True)
+    
+    @classmethod
+    def build_search_text(cls, name: str = None, email: str = None, phone: str = None) -> str:
+        """Create combined search text; phones keep only digits so any formatting matches."""
+        parts = [name, email, re.sub(r"\D", "", phone) if phone else None]
+        return " ".join(p.lower().strip() for p in parts if p)
+
+
+@event.listens_for(User, "before_insert")
+@event.listens_for(User, "before_update")
+def _refresh_search_text(mapper, connection, user):
+    user.search_text = User.build_search_text(user.name, user.email, user.phone)
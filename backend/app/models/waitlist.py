@@ -12,13 +12,4 @@ class WaitlistEntry(Base):
     reading_room_id = Column(String, ForeignKey("reading_rooms.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-class Notification(Base):
-    __tablename__ = "notifications"
-
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    title = Column(String, nullable=False)
-    message = Column(String, nullable=False)
-    read = Column(Boolean, default=False)
-    type = Column(String, nullable=False) # 'info', 'success', 'warning', 'error'
-    created_at = Column(DateTime, default=datetime.utcnow)
+# Notifications live in app.models.notification
@@ -9,11 +9,13 @@ from app.models.reading_room import ListingStatus
 from app.models.booking import Booking
 from app.schemas.accommodation import AccommodationResponse, AccommodationCreate, AccommodationUpdate
 from app.models.user import User, UserRole
-from app.deps import get_current_admin, get_current_user_optional, get_current_user
+from app.deps import get_current_admin, get_current_user_optional, get_current_user, require_unblocked
+from app.services.trust_blocks import BLOCK_LISTINGS
 
 router = APIRouter(prefix="/accommodations", tags=["accommodations"])
 
-from app.utils.geo import haversine_distance, sort_by_proximity
+from app.utils.geo import haversine_distance, sort_by_proximity, bounding_box_clause
+from app.utils.visibility import visible_listing_clause
 import json
 
 @router.get("/", response_model=List[AccommodationResponse])
@@ -31,22 +33,10 @@ async def get_accommodations(
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
-    query = select(Accommodation)
-    
-    show_unverified = False
-    if include_unverified:
-         if current_user and current_user.role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
-             show_unverified = True
-    
-    if not show_unverified:
-        # Show LIVE accommodations OR accommodations owned by current user (any status)
-        if current_user:
-            query = query.where(
-                (Accommodation.status == ListingStatus.LIVE) | 
-                (Accommodation.owner_id == current_user.id)
-            )
-        else:
-            query = query.where(Accommodation.status == ListingStatus.LIVE)
+    # LIVE (or own) accommodations in active cities, filtered in SQL
+    query = select(Accommodation).where(
+        visible_listing_clause(Accommodation, current_user, include_unverified)
+    )
     
     if location:
         query = query.where(
@@ -60,6 +50,8 @@ async def get_accommodations(
         query = query.where(Accommodation.gender == gender)
     if type:
         query = query.where(Accommodation.type == type)
+    if lat is not None and long is not None:
+        query = query.where(bounding_box_clause(Accommodation, lat, long, radius))
     
     # Apply pagination
     query = query.offset(offset).limit(limit)
@@ -89,7 +81,7 @@ async def get_my_accommodations(
     result = await db.execute(query)
     return result.scalars().all()
 
-@router.post("/", response_model=AccommodationResponse)
+@router.post("/", response_model=AccommodationResponse, dependencies=[Depends(require_unblocked(BLOCK_LISTINGS))])
 async def create_accommodation(
     accommodation: AccommodationCreate,
     db: AsyncSession = Depends(get_db),
@@ -7,6 +7,7 @@ from app.database import get_db
 from app.models.ad_category import AdCategory, CategoryStatus
 from app.models.user import User, UserRole
 from app.deps import get_current_user
+from app.core.http_cache import conditional_get
 from pydantic import BaseModel
 from datetime import datetime
 import re
@@ -61,7 +62,8 @@ class AdCategoryResponse(AdCategoryBase):
 @router.get("/", response_model=List[AdCategoryResponse])
 async def get_ad_categories(
     include_inactive: bool = False,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _cache: dict = Depends(conditional_get("ad_categories", max_age=300))
 ):
     """
     Get all ad categories. By default only returns ACTIVE categories.
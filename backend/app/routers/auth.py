@@ -5,7 +5,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.schemas.user import Token, UserCreate, UserResponse, UserBase
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import password_hasher, create_access_token
 from app.deps import get_current_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -29,7 +29,7 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
 
     user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await password_hasher.hash(user_in.password),
         name=user_in.name,
         role=user_in.role or UserRole.STUDENT,
         avatar_url=user_in.avatar_url,
@@ -47,12 +47,23 @@ async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db:
     # Note: OAuth2PasswordRequestForm expects 'username' field, which we treat as email
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalars().first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if new_hash:
+        # Stored hash uses outdated rounds; upgrade it while we have the password
+        user.hashed_password = new_hash
+        await db.commit()
     access_token = create_access_token(subject=user.email)
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -1,3 +1,4 @@
+import logging
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,16 +10,19 @@ from app.models.reading_room import Cabin, CabinStatus
 from app.models.accommodation import Accommodation
 from app.schemas.booking import BookingCreate, BookingResponse
 from app.models.user import User
-from app.deps import get_current_user
+from app.deps import get_current_user, require_unblocked
+from app.services.trust_blocks import BLOCK_BOOKINGS
 from datetime import datetime, timedelta, date
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 @router.post("/hold", response_model=BookingResponse)
 async def hold_booking(
     booking: BookingCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_unblocked(BLOCK_BOOKINGS))
 ):
     """
     Step 1: Hold a seat for 10 minutes.
@@ -188,7 +192,7 @@ async def get_my_bookings(
 async def create_booking(
     booking: BookingCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_unblocked(BLOCK_BOOKINGS))
 ):
     # Logic for Cabin Booking
     if booking.cabin_id:
@@ -246,7 +250,7 @@ async def create_booking(
                     }
                 )
             except Exception as email_error:
-                print(f"Failed to send booking confirmation email: {email_error}")
+                logger.error(f"Failed to send booking confirmation email: {email_error}")
             
             # Broadcast Update
             from app.core.socket_manager import broadcast_cabin_update
@@ -295,7 +299,7 @@ async def create_booking(
                 }
             )
         except Exception as email_error:
-            print(f"Failed to send booking confirmation email: {email_error}")
+            logger.error(f"Failed to send booking confirmation email: {email_error}")
         
         return new_booking
     
@@ -336,8 +340,7 @@ async def extend_booking_test(
             "booking_id": booking_id
         }
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in extend_booking_test: {e}")
         return {"error": str(e), "type": type(e).__name__}
 
 
@@ -413,7 +416,7 @@ async def extend_booking(
                 }
             )
         except Exception as email_error:
-            print(f"Failed to send booking extension email: {email_error}")
+            logger.error(f"Failed to send booking extension email: {email_error}")
         
         return {
             "message": "Booking extended successfully",
@@ -426,8 +429,6 @@ async def extend_booking(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in extend_booking: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in extend_booking: {e}")
         raise HTTPException(status_code=500, detail=f"Extension failed: {str(e)}")
 
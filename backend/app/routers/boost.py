@@ -1,11 +1,13 @@
 """
 Boost Router - Plans created by Super Admin, Requests created by Owners
 """
+import logging
 from typing import List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import and_, or_
 from pydantic import BaseModel
 from app.database import get_db
 from app.models.boost_plan import BoostPlan, BoostPlanStatus, BoostApplicableTo, BoostPlacement
@@ -14,6 +16,10 @@ from app.models.user import User, UserRole
 from app.models.reading_room import ReadingRoom
 from app.models.accommodation import Accommodation
 from app.deps import get_current_user, get_current_admin, get_current_user_optional
+from app.utils.visibility import visible_listing_clause
+from app.core.http_cache import conditional_get
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/boost", tags=["boost"])
@@ -100,7 +106,8 @@ class BoostRequestResponse(BaseModel):
 @router.get("/plans", response_model=List[BoostPlanResponse])
 async def get_boost_plans(
     include_inactive: bool = False,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _cache: dict = Depends(conditional_get("boost_plans", max_age=300))
 ):
     """
     Get all active boost plans.
@@ -110,7 +117,7 @@ async def get_boost_plans(
     query = select(BoostPlan).where(BoostPlan.status == "active").order_by(BoostPlan.price)
     result = await db.execute(query)
     plans = result.scalars().all()
-    print(f"DEBUG: Found {len(plans)} active plans")
+    logger.debug(f"Found {len(plans)} active plans")
     
     return [
         BoostPlanResponse(
@@ -533,9 +540,17 @@ async def get_featured_listings(
     """
     now = datetime.utcnow()
     
+    # Only venues the public can currently see (LIVE, active city, not flagged)
+    visible_rooms = select(ReadingRoom.id).where(visible_listing_clause(ReadingRoom))
+    visible_accommodations = select(Accommodation.id).where(visible_listing_clause(Accommodation))
+    
     query = select(BoostRequest).where(
         BoostRequest.status == BoostRequestStatus.APPROVED,
-        BoostRequest.expiry_date > now
+        BoostRequest.expiry_date > now,
+        or_(
+            and_(BoostRequest.venue_type == VenueType.READING_ROOM, BoostRequest.venue_id.in_(visible_rooms)),
+            and_(BoostRequest.venue_type == VenueType.ACCOMMODATION, BoostRequest.venue_id.in_(visible_accommodations)),
+        )
     )
     
     if venue_type:
@@ -9,12 +9,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import List, Optional
-import json
 
 from app.database import get_db
-from app.models.audit_log import AuditLog, AuditActionType
+from app.models.audit_log import AuditActionType
 from app.models.user import User, UserRole
 from app.deps import get_current_user
+from app.services.audit_service import build_audit_row, record_audit
+from app.services.trust_blocks import trust_blocks
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/admin/cache", tags=["Cache Management"])
@@ -93,35 +94,36 @@ async def clear_cache(
     
     cleared_count = len(keys_cleared)
     
+    # Reminder block masks are a real in-process cache
+    if "trust" in scopes_to_clear:
+        trust_blocks.invalidate()
+    
     # Log to audit trail
     client_ip = request.client.host if request.client else None
     
-    audit_entry = AuditLog(
+    audit_entry = await record_audit(db, build_audit_row(
         actor_id=current_user.id,
         actor_name=current_user.name,
         actor_role="SUPER_ADMIN",
         action_type=AuditActionType.CACHE_CLEARED,
-        action_description=f"Cache cleared for scopes: {', '.join(scopes_to_clear)}",
+        description=f"Cache cleared for scopes: {', '.join(scopes_to_clear)}",
         entity_type="system",
         entity_id="cache",
         entity_name="System Cache",
-        extra_data=json.dumps({
+        metadata={
             "scopes": scopes_to_clear,
             "keys_count": cleared_count,
             "timestamp": datetime.utcnow().isoformat()
-        }),
-        timestamp=datetime.utcnow(),
+        },
         ip_address=client_ip
-    )
-    db.add(audit_entry)
-    await db.commit()
+    ))
     
     return {
         "success": True,
         "message": "Cache cleared successfully",
         "scopes_cleared": scopes_to_clear,
         "keys_cleared": cleared_count,
-        "audit_id": audit_entry.id
+        "audit_id": audit_entry["id"]
     }
 
 
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, or_
 from typing import List
 from app.database import get_db
 from app.models.favorite import Favorite
@@ -36,6 +36,64 @@ class FavoriteResponse(BaseModel):
         from_attributes = True
 
 
+class FavoriteCheckMany(BaseModel):
+    accommodation_ids: List[str] = []
+    reading_room_ids: List[str] = []
+
+
+async def _enriched_favorites(db: AsyncSession, *conditions) -> List[FavoriteResponse]:
+    """
+    Favorites with item details in one query: both venue tables are
+    LEFT JOINed and only the displayed columns are selected
+    (primary_image instead of the full images JSON).
+    """
+    query = (
+        select(
+            Favorite,
+            Accommodation.name, Accommodation.primary_image, Accommodation.price, Accommodation.city,
+            ReadingRoom.name, ReadingRoom.primary_image, ReadingRoom.price_start, ReadingRoom.city,
+        )
+        .outerjoin(Accommodation, Accommodation.id == Favorite.accommodation_id)
+        .outerjoin(ReadingRoom, ReadingRoom.id == Favorite.reading_room_id)
+        .where(*conditions)
+        .order_by(Favorite.created_at.desc())
+    )
+    result = await db.execute(query)
+    
+    response = []
+    for fav, acc_name, acc_image, acc_price, acc_city, room_name, room_image, room_price, room_city in result.all():
+        item_name, item_type, item_image, item_price, item_city = None, None, None, None, None
+        
+        if fav.accommodation_id and acc_name is not None:
+            item_name = acc_name
+            item_type = "accommodation"
+            item_image = acc_image
+            item_price = acc_price
+            item_city = acc_city
+        
+        if fav.reading_room_id and room_name is not None:
+            item_name = room_name
+            item_type = "reading_room"
+            item_image = room_image
+            item_price = room_price
+            item_city = room_city
+        
+        response.append(FavoriteResponse(
+            id=fav.id,
+            user_id=fav.user_id,
+            accommodation_id=fav.accommodation_id,
+            reading_room_id=fav.reading_room_id,
+            created_at=fav.created_at.isoformat(),
+            item_name=item_name,
+            item_type=item_type,
+            item_image=item_image,
+            item_price=item_price,
+            item_city=item_city
+        ))
+    
+    return response
+
+
 @router.post("/", response_model=FavoriteResponse)
 async def add_favorite(
     favorite: FavoriteCreate,
@@ -73,39 +131,8 @@ async def add_favorite(
     await db.commit()
     await db.refresh(new_favorite)
     
-    # Fetch item details
-    item_name, item_type, item_image, item_price, item_city = None, None, None, None, None
-    
-    if favorite.accommodation_id:
-        acc = await db.get(Accommodation, favorite.accommodation_id)
-        if acc:
-            item_name = acc.name
-            item_type = "accommodation"
-            item_image = acc.images.strip('"[]').split('","')[0] if acc.images else None
-            item_price = acc.price
-            item_city = acc.city
-    
-    if favorite.reading_room_id:
-        room = await db.get(ReadingRoom, favorite.reading_room_id)
-        if room:
-            item_name = room.name
-            item_type = "reading_room"
-            item_image = room.images.strip('"[]').split('","')[0] if room.images else None
-            item_price = room.price_start
-            item_city = room.city
-    
-    return FavoriteResponse(
-        id=new_favorite.id,
-        user_id=new_favorite.user_id,
-        accommodation_id=new_favorite.accommodation_id,
-        reading_room_id=new_favorite.reading_room_id,
-        created_at=new_favorite.created_at.isoformat(),
-        item_name=item_name,
-        item_type=item_type,
-        item_image=item_image,
-        item_price=item_price,
-        item_city=item_city
-    )
+    response = await _enriched_favorites(db, Favorite.id == new_favorite.id)
+    return response[0]
 
 
 @router.get("/", response_model=List[FavoriteResponse])
@@ -115,48 +142,7 @@ async def get_favorites(
 ):
     """Get all favorites for the current user."""
     
-    result = await db.execute(
-        select(Favorite).where(Favorite.user_id == current_user.id).order_by(Favorite.created_at.desc())
-    )
-    favorites = result.scalars().all()
-    
-    # Enrich with item details
-    response = []
-    for fav in favorites:
-        item_name, item_type, item_image, item_price, item_city = None, None, None, None, None
-        
-        if fav.accommodation_id:
-            acc = await db.get(Accommodation, fav.accommodation_id)
-            if acc:
-                item_name = acc.name
-                item_type = "accommodation"
-                item_image = acc.images.strip('"[]').split('","')[0] if acc.images else None
-                item_price = acc.price
-                item_city = acc.city
-        
-        if fav.reading_room_id:
-            room = await db.get(ReadingRoom, fav.reading_room_id)
-            if room:
-                item_name = room.name
-                item_type = "reading_room"
-                item_image = room.images.strip('"[]').split('","')[0] if room.images else None
-                item_price = room.price_start
-                item_city = room.city
-        
-        response.append(FavoriteResponse(
-            id=fav.id,
-            user_id=fav.user_id,
-            accommodation_id=fav.accommodation_id,
-            reading_room_id=fav.reading_room_id,
-            created_at=fav.created_at.isoformat(),
-            item_name=item_name,
-            item_type=item_type,
-            item_image=item_image,
-            item_price=item_price,
-            item_city=item_city
-        ))
-    
-    return response
+    return await _enriched_favorites(db, Favorite.user_id == current_user.id)
 
 
 @router.delete("/{favorite_id}")
@@ -209,3 +195,44 @@ async def check_favorite(
         "is_favorited": favorite is not None,
         "favorite_id": favorite.id if favorite else None
     }
+
+
+@router.post("/check-many")
+async def check_favorites(
+    payload: FavoriteCheckMany,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Check many items at once (one query for a whole listing grid).
+    Returns favorite ids keyed by item id; items not favorited map to null.
+    """
+    if len(payload.accommodation_ids) + len(payload.reading_room_ids) > 500:
+        raise HTTPException(status_code=400, detail="Too many items (max 500)")
+    
+    accommodations = {acc_id: None for acc_id in payload.accommodation_ids}
+    reading_rooms = {room_id: None for room_id in payload.reading_room_ids}
+    
+    conditions = []
+    if accommodations:
+        conditions.append(Favorite.accommodation_id.in_(list(accommodations)))
+    if reading_rooms:
+        conditions.append(Favorite.reading_room_id.in_(list(reading_rooms)))
+    
+    if conditions:
+        result = await db.execute(
+            select(Favorite.id, Favorite.accommodation_id, Favorite.reading_room_id).where(
+                Favorite.user_id == current_user.id,
+                or_(*conditions)
+            )
+        )
+        for fav_id, acc_id, room_id in result.all():
+            if acc_id in accommodations:
+                accommodations[acc_id] = fav_id
+            if room_id in reading_rooms:
+                reading_rooms[room_id] = fav_id
+    
+    return {
+        "accommodations": accommodations,
+        "reading_rooms": reading_rooms
+    }
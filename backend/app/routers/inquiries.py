@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +11,10 @@ from app.models.inquiry import Inquiry, InquiryStatus, InquiryType
 from app.models.accommodation import Accommodation
 from app.models.user import User
 from app.routers.auth import get_current_user
+from app.services.email_service import send_new_inquiry_notification_email, send_inquiry_response_email
+from app.services.inquiry_service import pending_inquiry_counters, owner_digests
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/inquiries", tags=["inquiries"])
 
@@ -80,28 +85,30 @@ async def create_inquiry(
     db.add(inquiry)
     await db.commit()
     await db.refresh(inquiry)
+    pending_inquiry_counters.adjust(accommodation.owner_id, 1)
     
-    # Send notification to venue owner about new inquiry
+    # Notify the venue owner; bursts are coalesced into one digest email
     try:
-        from app.services.email_service import send_new_inquiry_notification_email
-        owner_result = await db.execute(select(User).where(User.id == accommodation.owner_id))
-        owner = owner_result.scalars().first()
+        owner_result = await db.execute(select(User.email, User.name).where(User.id == accommodation.owner_id))
+        owner = owner_result.first()
         
         if owner and owner.email:
-            await send_new_inquiry_notification_email(
-                recipient_email=owner.email,
-                recipient_name=owner.name or "Venue Owner",
-                inquiry_details={
-                    "venue_name": accommodation.name,
-                    "student_name": data.student_name or current_user.name,
-                    "student_email": current_user.email,
-                    "student_phone": data.student_phone,
-                    "question": data.question,
-                    "inquiry_date": inquiry.created_at.strftime("%d %B %Y at %I:%M %p") if inquiry.created_at else ""
-                }
-            )
+            inquiry_details = {
+                "venue_name": accommodation.name,
+                "student_name": data.student_name or current_user.name,
+                "student_email": current_user.email,
+                "student_phone": data.student_phone,
+                "question": data.question,
+                "inquiry_date": inquiry.created_at.strftime("%d %B %Y at %I:%M %p") if inquiry.created_at else ""
+            }
+            if not owner_digests.add(accommodation.owner_id, owner.email, owner.name or "Venue Owner", inquiry_details):
+                await send_new_inquiry_notification_email(
+                    recipient_email=owner.email,
+                    recipient_name=owner.name or "Venue Owner",
+                    inquiry_details=inquiry_details
+                )
     except Exception as email_error:
-        print(f"Failed to send new inquiry notification email: {email_error}")
+        logger.error(f"Failed to send new inquiry notification email: {email_error}")
     
     return InquiryResponse(
         id=inquiry.id,
@@ -216,12 +223,15 @@ async def reply_to_inquiry(
     if inquiry.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Only the accommodation owner can reply")
     
+    was_pending = inquiry.status == InquiryStatus.PENDING
     inquiry.reply = data.reply
     inquiry.status = InquiryStatus.REPLIED
     inquiry.replied_at = datetime.utcnow()
     
     await db.commit()
     await db.refresh(inquiry)
+    if was_pending:
+        pending_inquiry_counters.adjust(inquiry.owner_id, -1)
     
     # Get accommodation name and student info
     acc_result = await db.execute(select(Accommodation.name).where(Accommodation.id == inquiry.accommodation_id))
@@ -229,7 +239,6 @@ async def reply_to_inquiry(
     
     # Get student email for notification
     try:
-        from app.services.email_service import send_inquiry_response_email
         student_result = await db.execute(select(User).where(User.id == inquiry.student_id))
         student = student_result.scalars().first()
         
@@ -246,7 +255,7 @@ async def reply_to_inquiry(
                 }
             )
     except Exception as email_error:
-        print(f"Failed to send inquiry response email: {email_error}")
+        logger.error(f"Failed to send inquiry response email: {email_error}")
     
     return InquiryResponse(
         id=inquiry.id,
@@ -273,11 +282,5 @@ async def get_pending_count(
     current_user: User = Depends(get_current_user)
 ):
     """Get count of pending inquiries for the current owner."""
-    result = await db.execute(
-        select(Inquiry).where(
-            Inquiry.owner_id == current_user.id,
-            Inquiry.status == InquiryStatus.PENDING
-        )
-    )
-    count = len(result.scalars().all())
+    count = await pending_inquiry_counters.get(db, current_user.id)
     return {"count": count}
@@ -4,6 +4,7 @@ Handles:
 - GET /bookings/{booking_id}/invoice - Download PDF invoice for a booking
 """
 
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,10 +20,27 @@ from app.models.invoice import Invoice, generate_invoice_number
 from app.models.reading_room import ReadingRoom, Cabin
 from app.models.accommodation import Accommodation
 from app.models.payment_transaction import PaymentTransaction
+from app.core.tracing import traced
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Invoices"])
 
 
+def warm_up_pdf_renderer():
+    """Import reportlab and load its fonts/styles so the first invoice download isn't slow"""
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
+        
+        doc = SimpleDocTemplate(BytesIO(), pagesize=A4)
+        doc.build([Paragraph("warm-up", getSampleStyleSheet()['Normal']), Table([["warm-up"]])])
+    except ImportError as e:
+        logger.warning(f"reportlab not available: {e}, invoices will use the fpdf fallback")
+
+
+@traced("pdf.render")
 def generate_pdf_invoice(invoice_data: dict) -> BytesIO:
     """
     Generate a professional PDF invoice using reportlab.
@@ -171,7 +189,7 @@ def generate_pdf_invoice(invoice_data: dict) -> BytesIO:
         
     except ImportError as e:
         # Fallback: Use fpdf if reportlab not available
-        print(f"reportlab not available: {e}, using fpdf fallback")
+        logger.warning(f"reportlab not available: {e}, using fpdf fallback")
         try:
             from fpdf import FPDF
             
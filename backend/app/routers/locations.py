@@ -10,6 +10,8 @@ from app.database import get_db
 from app.models.location import Location
 from app.models.user import User, UserRole
 from app.deps import get_current_user
+from app.core.http_cache import conditional_get
+from app.services.location_usage import location_usage
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -71,7 +73,7 @@ async def autocomplete_locations(
     """
     Fast autocomplete for location search.
     Works after 2 characters - searches city, state, and locality.
-    Returns most popular matches first.
+    Returns most popular matches first (by recent, decayed picks).
     """
     search_term = q.lower().strip()
     
@@ -85,7 +87,7 @@ async def autocomplete_locations(
                 Location.search_text.ilike(f"%{search_term}%")
             )
         )
-        .order_by(Location.usage_count.desc(), Location.city)
+        .order_by(Location.popularity_score.desc(), Location.usage_count.desc(), Location.city)
         .limit(limit)
     )
     
@@ -106,7 +108,8 @@ async def autocomplete_locations(
 
 @router.get("/states", response_model=List[str])
 async def get_states(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _cache: dict = Depends(conditional_get("locations", max_age=600))
 ):
     """Get list of all unique states with active locations."""
     query = (
@@ -123,7 +126,8 @@ async def get_states(
 @router.get("/cities", response_model=List[str])
 async def get_cities(
     state: str = Query(..., description="State to filter cities"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _cache: dict = Depends(conditional_get("locations", max_age=600))
 ):
     """Get list of cities for a given state."""
     query = (
@@ -303,23 +307,14 @@ async def create_location(
 
 
 @router.put("/{location_id}/increment-usage")
-async def increment_usage(
-    location_id: str,
-    db: AsyncSession = Depends(get_db)
-):
-    """Increment usage count when a location is selected. Called by frontend."""
-    result = await db.execute(
-        select(Location).where(Location.id == location_id)
-    )
-    location = result.scalars().first()
-    
-    if not location:
-        raise HTTPException(status_code=404, detail="Location not found")
-    
-    location.usage_count = (location.usage_count or 0) + 1
-    await db.commit()
-    
-    return {"message": "Usage count incremented", "count": location.usage_count}
+async def increment_usage(location_id: str):
+    """
+    Record a pick when a location is selected. Called by frontend.
+    Picks are buffered and flushed in batches, so this never touches the
+    database; picks for unknown ids simply match no row.
+    """
+    location_usage.record(location_id)
+    return {"message": "Usage recorded", "pending": location_usage.pending(location_id)}
 
 
 class LocationUpdate(BaseModel):
@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func, desc
@@ -9,8 +10,11 @@ from app.database import get_db
 from app.deps import get_current_user
 from app.models.user import User
 from app.models.message import Message as MessageModel, Conversation as ConversationModel
+from app.services.notification_service import unread_counters, push_event
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/messages", tags=["messages"])
 
 
@@ -115,6 +119,16 @@ async def send_message(
     await db.commit()
     await db.refresh(message)
     
+    unread_counters.adjust(message_data.receiver_id, "messages", 1)
+    await push_event(db, message_data.receiver_id, "message", {
+        "id": message.id,
+        "conversation_id": message.conversation_id,
+        "sender_id": current_user.id,
+        "sender_name": current_user.name,
+        "content": message.content,
+        "timestamp": message.timestamp.isoformat()
+    })
+    
     # Create notification for receiver (optional - don't fail if notification fails)
     try:
         from app.routers.notifications import create_notification
@@ -127,7 +141,7 @@ async def send_message(
             message_id=message.id
         )
     except Exception as e:
-        print(f"Failed to create notification: {e}")
+        logger.error(f"Failed to create notification: {e}")
         # Continue anyway - notification is not critical
     
     return MessageResponse(
@@ -317,8 +331,11 @@ async def mark_message_read(
     if message.receiver_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    message.read = True
-    await db.commit()
+    if not message.read:
+        message.read = True
+        await db.commit()
+        unread_counters.adjust(current_user.id, "messages", -1)
+        await push_event(db, current_user.id, "unread")
     
     return {"status": "success"}
 
@@ -348,6 +365,10 @@ async def mark_conversation_read(
     
     await db.commit()
     
+    if messages:
+        unread_counters.adjust(current_user.id, "messages", -len(messages))
+        await push_event(db, current_user.id, "unread")
+    
     return {"status": "success", "marked_read": len(messages)}
 
 
@@ -356,20 +377,11 @@ async def get_unread_count(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get total unread message count"""
+    """Get total unread message count (maintained counter, no COUNT per poll)"""
     
-    result = await db.execute(
-        select(func.count(MessageModel.id))
-        .where(
-            and_(
-                MessageModel.receiver_id == current_user.id,
-                MessageModel.read == False
-            )
-        )
-    )
-    count = result.scalar()
+    counts = await unread_counters.get(db, current_user.id)
     
-    return {"count": count or 0}
+    return {"count": counts["messages"]}
 
 
 @router.post("/conversations/start")
@@ -0,0 +1,224 @@
+"""
+Moderation Router - Batch review of venues awaiting verification
+Handles:
+- GET /moderation/queue - Pending listings with owner, plan and open flags in one query
+- POST /moderation/decisions - Verify/reject many venues in one transaction (Super Admin)
+"""
+
+import json
+import uuid
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel, Field
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.deps import get_current_super_admin
+from app.models.user import User
+from app.models.reading_room import ReadingRoom, ListingStatus
+from app.models.accommodation import Accommodation
+from app.models.subscription_plan import SubscriptionPlan
+from app.models.trust_flag import TrustFlag, TrustFlagStatus
+from app.models.audit_log import AuditLog, AuditActionType
+from app.services.audit_service import build_audit_row
+from app.utils.pagination import encode_cursor, decode_cursor
+
+router = APIRouter(prefix="/moderation", tags=["moderation"])
+
+VENUE_MODELS = {
+    "reading_room": ReadingRoom,
+    "accommodation": Accommodation,
+}
+
+OPEN_FLAG_STATUSES = [TrustFlagStatus.ACTIVE, TrustFlagStatus.OWNER_RESUBMITTED, TrustFlagStatus.ESCALATED]
+
+DECISIONS = {
+    "verify": (ListingStatus.LIVE, True, AuditActionType.VENUE_APPROVED),
+    "reject": (ListingStatus.REJECTED, False, AuditActionType.VENUE_REJECTED),
+}
+
+
+class ModerationDecision(BaseModel):
+    venue_type: Literal["reading_room", "accommodation"]
+    venue_id: str
+    action: Literal["verify", "reject"]
+    reason: Optional[str] = None  # Recorded in the audit trail
+
+
+class ModerationBatch(BaseModel):
+    decisions: List[ModerationDecision] = Field(..., min_length=1, max_length=200)
+
+
+def _queue_query(venue_type: str):
+    """Pending venues of one type joined to their owner and plan, plus open trust flags"""
+    Model = VENUE_MODELS[venue_type]
+    open_flags = (
+        select(func.count(TrustFlag.id))
+        .where(
+            TrustFlag.entity_type == venue_type,
+            TrustFlag.entity_id == Model.id,
+            TrustFlag.status.in_(OPEN_FLAG_STATUSES)
+        )
+        .correlate(Model)
+        .scalar_subquery()
+        .label("open_flags")
+    )
+    return (
+        select(
+            Model,
+            User.name.label("owner_name"),
+            User.email.label("owner_email"),
+            User.phone.label("owner_phone"),
+            User.verification_status.label("owner_verification"),
+            SubscriptionPlan.name.label("plan_name"),
+            SubscriptionPlan.price.label("plan_price"),
+            SubscriptionPlan.duration_days.label("plan_duration_days"),
+            open_flags
+        )
+        .outerjoin(User, User.id == Model.owner_id)
+        .outerjoin(SubscriptionPlan, SubscriptionPlan.id == Model.subscription_plan_id)
+        .where(Model.status == ListingStatus.VERIFICATION_PENDING)
+        .order_by(Model.id)
+    )
+
+
+def _images(value: Optional[str]) -> list:
+    """Images JSON list (or a legacy raw URL string) as a list"""
+    if not value:
+        return []
+    try:
+        images = json.loads(value)
+        return images if isinstance(images, list) else [value]
+    except ValueError:
+        return [value]
+
+
+def _queue_item(venue_type: str, row) -> dict:
+    venue = row[0]
+    return {
+        "venue_type": venue_type,
+        "id": venue.id,
+        "name": venue.name,
+        "description": getattr(venue, "description", None),
+        "address": venue.address,
+        "locality": venue.locality,
+        "city": venue.city,
+        "state": venue.state,
+        "pincode": venue.pincode,
+        "contact_phone": venue.contact_phone,
+        "images": _images(venue.images),
+        "amenities": venue.amenities,
+        "price": venue.price_start if venue_type == "reading_room" else venue.price,
+        "trust_status": getattr(venue, "trust_status", None),
+        "payment_id": venue.payment_id,
+        "payment_date": str(venue.payment_date) if venue.payment_date else None,
+        "open_flags": row.open_flags or 0,
+        "owner": {
+            "id": venue.owner_id,
+            "name": row.owner_name,
+            "email": row.owner_email,
+            "phone": row.owner_phone,
+            "verification_status": row.owner_verification.value if row.owner_verification else None,
+        },
+        "subscription_plan": {
+            "id": venue.subscription_plan_id,
+            "name": row.plan_name,
+            "price": row.plan_price,
+            "duration_days": row.plan_duration_days,
+        } if venue.subscription_plan_id else None,
+    }
+
+
+@router.get("/queue")
+async def get_moderation_queue(
+    venue_type: Literal["reading_room", "accommodation"] = Query(..., description="Queue to review"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin)
+):
+    """
+    Venues waiting for verification with everything the reviewer needs:
+    listing details, owner contact and verification, the paid plan and the
+    number of open trust flags. One query per page.
+    """
+    Model = VENUE_MODELS[venue_type]
+    query = _queue_query(venue_type)
+    after = decode_cursor(cursor, 1)
+    if after:
+        query = query.where(Model.id > after[0])
+    result = await db.execute(query.limit(limit))
+    rows = result.all()
+
+    items = [_queue_item(venue_type, row) for row in rows]
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(items[-1]["id"]) if len(items) == limit else None,
+    }
+
+
+@router.post("/decisions")
+async def apply_moderation_decisions(
+    batch: ModerationBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin)
+):
+    """
+    Verify or reject many venues at once.
+    Only venues still VERIFICATION_PENDING are changed (one UPDATE per
+    venue type and action); the rest are returned in `skipped`. Status
+    changes and their audit entries (one bulk INSERT) commit together, so
+    listing caches are invalidated once for the whole batch.
+    """
+    batch_id = str(uuid.uuid4())
+    # Last decision wins if a venue is listed twice
+    latest = {(d.venue_type, d.venue_id): d for d in batch.decisions}
+    groups = {}
+    for decision in latest.values():
+        groups.setdefault((decision.venue_type, decision.action), {})[decision.venue_id] = decision
+
+    applied, audit_rows = [], []
+    for (venue_type, action), decisions in groups.items():
+        Model = VENUE_MODELS[venue_type]
+        new_status, is_verified, audit_action = DECISIONS[action]
+        # The status condition makes concurrent reviews safe: a venue is only
+        # decided once, whoever gets there first
+        result = await db.execute(
+            update(Model)
+            .where(Model.id.in_(list(decisions)), Model.status == ListingStatus.VERIFICATION_PENDING)
+            .values(status=new_status, is_verified=is_verified)
+            .returning(Model.id, Model.name, Model.owner_id)
+            .execution_options(synchronize_session=False)
+        )
+        for venue_id, name, owner_id in result.all():
+            reason = decisions[venue_id].reason
+            applied.append({"venue_type": venue_type, "venue_id": venue_id, "action": action, "status": new_status.value})
+            audit_rows.append(build_audit_row(
+                actor_id=current_user.id,
+                actor_name=current_user.name,
+                actor_role="SUPER_ADMIN",
+                action_type=audit_action,
+                description=f"Venue {'approved' if action == 'verify' else 'rejected'}: {name}" + (f" ({reason})" if reason else ""),
+                entity_type=venue_type,
+                entity_id=venue_id,
+                entity_name=name,
+                metadata={"batch_id": batch_id, "owner_id": owner_id, "reason": reason}
+            ))
+
+    if audit_rows:
+        await db.execute(insert(AuditLog), audit_rows)
+    await db.commit()
+
+    applied_keys = {(a["venue_type"], a["venue_id"]) for a in applied}
+    skipped = [
+        {"venue_type": d.venue_type, "venue_id": d.venue_id, "action": d.action}
+        for d in latest.values() if (d.venue_type, d.venue_id) not in applied_keys
+    ]
+    return {
+        "batch_id": batch_id,
+        "applied": applied,
+        "skipped": skipped,
+        "message": f"{len(applied)} venue(s) updated, {len(skipped)} skipped"
+    }
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from typing import List
+from sqlalchemy import select, and_, or_, update
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
-from app.database import get_db
-from app.deps import get_current_user
+from app.database import get_db, AsyncSessionLocal
+from app.deps import get_current_user, get_user_from_token
 from app.models.user import User
+from app.core.socket_manager import user_channels
+from app.services.notification_service import unread_counters, push_event, serialize_notification
+from app.core.responses import trusted_response
+from app.utils.pagination import encode_cursor, decode_cursor
 from pydantic import BaseModel
 
 
@@ -53,37 +57,78 @@ async def create_notification(
     db.add(notification)
     await db.commit()
     await db.refresh(notification)
+    
+    # Push to the user's open channels instead of waiting for a poll
+    unread_counters.adjust(user_id, "notifications", 1)
+    await push_event(db, user_id, "notification", serialize_notification(notification))
     return notification
 
 
-@router.get("/", response_model=List[Notification])
-async def get_notifications(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+async def _notifications_since(
+    db: AsyncSession,
+    user_id: str,
+    since: Optional[datetime],
+    limit: int,
+    unread_only: bool = False,
+    after: Optional[tuple] = None
 ):
-    """Get all notifications for current user"""
+    """
+    Without `since` / `after`: the newest `limit` notifications, newest first.
+    Catching up (newer than `since`, or after the (date, id) cursor of the
+    last one delivered): the oldest `limit`, oldest first, so the client can
+    page forward without skipping any. Returns (notifications, next_cursor);
+    next_cursor is set only when a catch-up page was full and more remain.
+    """
     from app.models.notification import Notification as NotificationModel
     
+    query = select(NotificationModel).where(NotificationModel.user_id == user_id)
+    if unread_only:
+        query = query.where(NotificationModel.read == False)
+    if not since and not after:
+        result = await db.execute(query.order_by(NotificationModel.date.desc()).limit(limit))
+        return result.scalars().all(), None
+    
+    if after:
+        after_date, after_id = after
+        query = query.where(or_(
+            NotificationModel.date > after_date,
+            and_(NotificationModel.date == after_date, NotificationModel.id > after_id)
+        ))
+    else:
+        query = query.where(NotificationModel.date > since)
     result = await db.execute(
-        select(NotificationModel)
-        .where(NotificationModel.user_id == current_user.id)
-        .order_by(NotificationModel.date.desc())
+        query.order_by(NotificationModel.date, NotificationModel.id).limit(limit + 1)
     )
     notifications = result.scalars().all()
+    if len(notifications) <= limit:
+        return notifications, None
+    notifications = notifications[:limit]
+    return notifications, encode_cursor(notifications[-1].date, notifications[-1].id)
+
+
+@router.get("/", response_model=List[Notification])
+async def get_notifications(
+    since: Optional[datetime] = Query(None, description="Only notifications newer than this (date of the newest one already seen)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous catch-up page"),
+    limit: int = Query(50, ge=1, le=200),
+    unread_only: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get recent notifications for current user (newest first).
+    With `since` or `cursor` the missed ones are returned oldest first; when
+    more remain, the X-Next-Cursor header continues from the last one.
+    """
+    notifications, next_cursor = await _notifications_since(
+        db, current_user.id, since, limit, unread_only, after=decode_cursor(cursor, 2)
+    )
     
-    return [
-        Notification(
-            id=n.id,
-            user_id=n.user_id,
-            title=n.title,
-            message=n.message,
-            read=n.read,
-            date=n.date.isoformat() if n.date else "",
-            notification_type=n.type,
-            message_id=n.message_id
-        )
-        for n in notifications
-    ]
+    # Same JSON-ready dicts the WebSocket pushes; no per-row model validation
+    return trusted_response(
+        (serialize_notification(n) for n in notifications),
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None
+    )
 
 
 @router.put("/{notification_id}/read")
@@ -105,8 +150,83 @@ async def mark_notification_read(
     )
     notification = result.scalar_one_or_none()
     
-    if notification:
+    if notification and not notification.read:
         notification.read = True
         await db.commit()
+        unread_counters.adjust(current_user.id, "notifications", -1)
+        await push_event(db, current_user.id, "unread")
     
     return {"status": "success"}
+
+
+@router.put("/read-all")
+async def mark_all_notifications_read(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Mark every unread notification as read in one UPDATE"""
+    from app.models.notification import Notification as NotificationModel
+    
+    result = await db.execute(
+        update(NotificationModel)
+        .where(and_(NotificationModel.user_id == current_user.id, NotificationModel.read == False))
+        .values(read=True)
+    )
+    await db.commit()
+    unread_counters.invalidate(current_user.id)
+    await push_event(db, current_user.id, "unread")
+    
+    return {"status": "success", "marked_read": result.rowcount}
+
+
+@router.get("/unread-count")
+async def get_unread_counts(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Unread notification and message counts (served from maintained counters)"""
+    return await unread_counters.get(db, current_user.id)
+
+
+@router.websocket("/ws")
+async def notifications_socket(
+    websocket: WebSocket,
+    token: str = Query(...),
+    since: Optional[datetime] = None
+):
+    """
+    Per-user event channel.
+    On connect the server sends a "hello" event with unread counts and the
+    notifications newer than `since` (oldest first, at most 200; if more
+    remain, `next_cursor` continues them via GET /notifications?cursor=);
+    afterwards "notification", "message" and "unread" events are pushed as
+    they happen.
+    """
+    user = None
+    try:
+        # Short-lived session: don't hold a pooled connection for the socket's lifetime
+        async with AsyncSessionLocal() as db:
+            user = await get_user_from_token(token, db)
+            if not user:
+                await websocket.close(code=4401)
+                return
+            await user_channels.connect(user.id, websocket)
+            missed, next_cursor = await _notifications_since(db, user.id, since, 200) if since else ([], None)
+            await websocket.send_json({
+                "type": "hello",
+                "payload": {
+                    "notifications": [serialize_notification(n) for n in missed],
+                    "next_cursor": next_cursor,
+                },
+                "unread": await unread_counters.get(db, user.id),
+            })
+        
+        while True:
+            # Clients may send pings; nothing else is expected
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Any exit (drop during the hello, receive errors) must unregister the socket
+        if user is not None:
+            user_channels.disconnect(user.id, websocket)
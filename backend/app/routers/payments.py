@@ -4,25 +4,35 @@ Handles:
 - GET /user/payment-modes - Get supported methods + last used payment
 - GET /user/refunds - Get user's refund requests
 - POST /refund/request - Create new refund request
-- GET /admin/refunds - List all refund requests (Super Admin)
+- GET /admin/refunds - Refunds queue with filters and keyset paging (Super Admin)
+- GET /admin/refunds/export - Refunds queue as streamed CSV (Super Admin)
+- POST /admin/refunds/bulk - Approve/reject many refunds at once (Super Admin)
 - PATCH /admin/refunds/{id} - Update refund status (Super Admin)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from pydantic import BaseModel
+from sqlalchemy import select, desc, update, func, or_, and_
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
+import csv
+import io
 
-from app.database import get_db
+from app.database import get_db, AsyncSessionLocal
 from app.deps import get_current_user
 from app.models.user import User, UserRole
-from app.models.booking import Booking
+from app.models.booking import Booking, BookingStatus
 from app.models.refund import Refund, RefundStatus, RefundReason
 from app.models.payment_transaction import PaymentTransaction, PaymentMethod, PaymentGateway
-from app.models.reading_room import ReadingRoom, Cabin
+from app.models.reading_room import ReadingRoom, Cabin, CabinStatus
 from app.models.accommodation import Accommodation
+from app.core.responses import FastJSONResponse
+from app.utils.pagination import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/payments", tags=["Payments & Refunds"])
 
@@ -68,6 +78,107 @@ class RefundUpdateIn(BaseModel):
     status: str  # RefundStatus enum value
     admin_notes: Optional[str] = None
 
+class RefundBulkUpdateIn(BaseModel):
+    refund_ids: List[str] = Field(..., min_length=1, max_length=500)
+    status: str  # APPROVED or REJECTED
+    admin_notes: Optional[str] = None
+
+
+# ============================================
+# HELPERS
+# ============================================
+
+def _require_super_admin(user: User, detail: str):
+    if user.role != UserRole.SUPER_ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+async def _apply_refund_approval(db: AsyncSession, booking_ids: List[str]) -> List[str]:
+    """
+    Side effects of approving refunds: cancel the bookings and free the
+    cabins their students still occupy (accommodations keep no occupancy
+    state). Doesn't commit, so it is part of the caller's transaction.
+    Returns the ids of the released cabins.
+    """
+    if not booking_ids:
+        return []
+    result = await db.execute(
+        update(Booking)
+        .where(Booking.id.in_(booking_ids), Booking.status != BookingStatus.CANCELLED)
+        .values(status=BookingStatus.CANCELLED)
+        .returning(Booking.cabin_id, Booking.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    occupied_by = [(cabin_id, user_id) for cabin_id, user_id in result.all() if cabin_id]
+    if not occupied_by:
+        return []
+    # Only release a cabin still held by the refunded student
+    result = await db.execute(
+        update(Cabin)
+        .where(
+            Cabin.status == CabinStatus.OCCUPIED,
+            or_(*[
+                and_(Cabin.id == cabin_id, Cabin.current_occupant_id == user_id)
+                for cabin_id, user_id in occupied_by
+            ])
+        )
+        .values(status=CabinStatus.AVAILABLE, current_occupant_id=None)
+        .returning(Cabin.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
+
+
+async def _broadcast_released_cabins(cabin_ids: List[str]):
+    from app.core.socket_manager import broadcast_cabin_update
+    for cabin_id in cabin_ids:
+        await broadcast_cabin_update(cabin_id=cabin_id, status=CabinStatus.AVAILABLE)
+
+
+def _refund_queue_query(
+    status_filter: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+):
+    """
+    Refunds with requester and venue name in one query, newest first.
+    Venue is the cabin's reading room or the accommodation of the booking.
+    """
+    venue_name = func.coalesce(ReadingRoom.name, Accommodation.name, "Unknown Venue").label("venue_name")
+    query = (
+        select(Refund, User.email.label("user_email"), User.name.label("user_name"), venue_name)
+        .outerjoin(User, User.id == Refund.user_id)
+        .outerjoin(Booking, Booking.id == Refund.booking_id)
+        .outerjoin(Cabin, Cabin.id == Booking.cabin_id)
+        .outerjoin(ReadingRoom, ReadingRoom.id == Cabin.reading_room_id)
+        .outerjoin(Accommodation, Accommodation.id == Booking.accommodation_id)
+        .order_by(Refund.requested_at.desc(), Refund.id.desc())
+    )
+    if status_filter:
+        try:
+            query = query.where(Refund.status == RefundStatus(status_filter))
+        except ValueError:
+            pass  # Ignore invalid status filter
+    if from_date:
+        query = query.where(Refund.requested_at >= from_date)
+    if to_date:
+        query = query.where(Refund.requested_at <= to_date)
+    return query
+
+
+def _refund_fields(refund: Refund, venue_name: str) -> dict:
+    return dict(
+        id=refund.id,
+        booking_id=refund.booking_id,
+        venue_name=venue_name,
+        amount=refund.amount,
+        reason=refund.reason.value if refund.reason else "OTHER",
+        reason_text=refund.reason_text,
+        status=refund.status.value if refund.status else "REQUESTED",
+        requested_at=refund.requested_at.isoformat() if refund.requested_at else "",
+        processed_at=refund.processed_at.isoformat() if refund.processed_at else None
+    )
+
 
 # ============================================
 # USER ENDPOINTS
@@ -105,7 +216,7 @@ async def get_payment_modes(
             )
     except Exception as e:
         # Log the error but continue - supported methods can still be returned
-        print(f"Warning: Could not fetch last payment: {e}")
+        logger.warning(f"Could not fetch last payment: {e}")
     
     return PaymentModesResponse(
         supported_methods=supported_methods,
@@ -202,9 +313,6 @@ async def get_owner_payment_history(
     Get all payment transactions for bookings at the owner's venues.
     Includes initial payments and extensions.
     """
-    from app.models.reading_room import ReadingRoom
-    from app.models.cabin import Cabin
-    
     # Get owner's reading rooms
     rooms_result = await db.execute(
         select(ReadingRoom).where(ReadingRoom.owner_id == current_user.id)
@@ -246,17 +354,18 @@ async def get_owner_payment_history(
     )
     payments = payments_result.scalars().all()
     
+    # Load all payers in one query
+    user_ids = {p.user_id for p in payments if p.user_id}
+    users_result = await db.execute(select(User).where(User.id.in_(user_ids))) if user_ids else None
+    user_map = {u.id: u for u in users_result.scalars().all()} if users_result else {}
+    room_map = {r.id: r for r in owner_rooms}
+    
     payment_list = []
     for payment in payments:
         booking = booking_map.get(payment.booking_id)
         cabin = cabin_map.get(booking.cabin_id) if booking else None
-        room = next((r for r in owner_rooms if cabin and r.id == cabin.reading_room_id), None) if cabin else None
-        
-        # Get user info
-        user_result = await db.execute(
-            select(User).where(User.id == payment.user_id)
-        )
-        user = user_result.scalar_one_or_none()
+        room = room_map.get(cabin.reading_room_id) if cabin else None
+        user = user_map.get(payment.user_id)
         
         # Determine payment type
         payment_type = "INITIAL"
@@ -281,11 +390,12 @@ async def get_owner_payment_history(
             "method": payment.method.value if payment.method else "UNKNOWN"
         })
     
-    return {
+    # Already JSON-ready; skip jsonable_encoder
+    return FastJSONResponse({
         "payments": payment_list,
         "total_count": len(payment_list),
         "total_amount": sum(p["amount"] for p in payment_list)
-    }
+    })
 
 
 @router.get("/user/refunds", response_model=List[RefundOut])
@@ -297,56 +407,9 @@ async def get_my_refunds(
     Get all refund requests for the current user.
     """
     result = await db.execute(
-        select(Refund)
-        .where(Refund.user_id == current_user.id)
-        .order_by(desc(Refund.requested_at))
+        _refund_queue_query().where(Refund.user_id == current_user.id)
     )
-    refunds = result.scalars().all()
-    
-    refund_list = []
-    for refund in refunds:
-        # Get venue name from booking
-        venue_name = "Unknown Venue"
-        booking_result = await db.execute(
-            select(Booking).where(Booking.id == refund.booking_id)
-        )
-        booking = booking_result.scalar_one_or_none()
-        
-        if booking:
-            if booking.cabin_id:
-                # Get cabin and reading room
-                cabin_result = await db.execute(
-                    select(Cabin).where(Cabin.id == booking.cabin_id)
-                )
-                cabin = cabin_result.scalar_one_or_none()
-                if cabin:
-                    room_result = await db.execute(
-                        select(ReadingRoom).where(ReadingRoom.id == cabin.reading_room_id)
-                    )
-                    room = room_result.scalar_one_or_none()
-                    if room:
-                        venue_name = room.name
-            elif booking.accommodation_id:
-                acc_result = await db.execute(
-                    select(Accommodation).where(Accommodation.id == booking.accommodation_id)
-                )
-                acc = acc_result.scalar_one_or_none()
-                if acc:
-                    venue_name = acc.name
-        
-        refund_list.append(RefundOut(
-            id=refund.id,
-            booking_id=refund.booking_id,
-            venue_name=venue_name,
-            amount=refund.amount,
-            reason=refund.reason.value if refund.reason else "OTHER",
-            reason_text=refund.reason_text,
-            status=refund.status.value if refund.status else "REQUESTED",
-            requested_at=refund.requested_at.isoformat() if refund.requested_at else "",
-            processed_at=refund.processed_at.isoformat() if refund.processed_at else None
-        ))
-    
-    return refund_list
+    return [RefundOut(**_refund_fields(row.Refund, row.venue_name)) for row in result.all()]
 
 
 @router.post("/refund/request", response_model=RefundOut)
@@ -448,86 +511,176 @@ async def request_refund(
 
 @router.get("/admin/refunds", response_model=List[RefundAdminOut])
 async def get_all_refunds(
+    response: Response,
     status_filter: Optional[str] = None,
+    from_date: Optional[datetime] = Query(None, description="Requested on or after"),
+    to_date: Optional[datetime] = Query(None, description="Requested on or before"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page (keyset pagination)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all refund requests (Super Admin only).
-    Optional filter by status.
+    Get refund requests, newest first (Super Admin only).
+    Optional filters by status and requested date range.
+    One joined query per page; when more rows exist the cursor for the
+    next page is returned in the X-Next-Cursor header.
     """
-    if current_user.role != UserRole.SUPER_ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only Super Admin can access this endpoint"
+    _require_super_admin(current_user, "Only Super Admin can access this endpoint")
+    
+    query = _refund_queue_query(status_filter, from_date, to_date)
+    after = decode_cursor(cursor, 2)
+    if after:
+        after_ts, after_id = after
+        query = query.where(or_(
+            Refund.requested_at < after_ts,
+            and_(Refund.requested_at == after_ts, Refund.id < after_id)
+        ))
+    result = await db.execute(query.limit(limit))
+    rows = result.all()
+    
+    if len(rows) == limit:
+        last = rows[-1].Refund
+        response.headers["X-Next-Cursor"] = encode_cursor(last.requested_at, last.id)
+    
+    return [
+        RefundAdminOut(
+            **_refund_fields(row.Refund, row.venue_name),
+            user_id=row.Refund.user_id,
+            user_email=row.user_email or "",
+            user_name=row.user_name or "Unknown",
+            admin_notes=row.Refund.admin_notes,
+            reviewed_by=row.Refund.reviewed_by
         )
+        for row in rows
+    ]
+
+
+REFUND_CSV_COLUMNS = [
+    "refund_id", "requested_at", "status", "amount", "reason", "reason_text",
+    "booking_id", "venue_name", "user_id", "user_email", "user_name",
+    "reviewed_by", "reviewed_at", "processed_at", "gateway_ref", "admin_notes"
+]
+
+
+@router.get("/admin/refunds/export")
+async def export_refunds_csv(
+    status_filter: Optional[str] = None,
+    from_date: Optional[datetime] = Query(None, description="Requested on or after"),
+    to_date: Optional[datetime] = Query(None, description="Requested on or before"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download the refunds queue as CSV for finance reconciliation (Super Admin only).
+    Same filters as the list; rows are streamed from the database in
+    chunks, so large exports never sit in memory.
+    """
+    _require_super_admin(current_user, "Only Super Admin can access this endpoint")
+    query = _refund_queue_query(status_filter, from_date, to_date)
+    
+    async def rows_as_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(REFUND_CSV_COLUMNS)
+        # Own session: the response body is produced after the endpoint returns
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query.execution_options(yield_per=500))
+            async for row in result:
+                refund = row.Refund
+                writer.writerow([
+                    refund.id,
+                    refund.requested_at.isoformat() if refund.requested_at else "",
+                    refund.status.value if refund.status else "",
+                    f"{refund.amount:.2f}",
+                    refund.reason.value if refund.reason else "",
+                    refund.reason_text or "",
+                    refund.booking_id,
+                    row.venue_name,
+                    refund.user_id,
+                    row.user_email or "",
+                    row.user_name or "",
+                    refund.reviewed_by or "",
+                    refund.reviewed_at.isoformat() if refund.reviewed_at else "",
+                    refund.processed_at.isoformat() if refund.processed_at else "",
+                    refund.gateway_ref or "",
+                    refund.admin_notes or ""
+                ])
+                if buffer.tell() >= 64 * 1024:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+        yield buffer.getvalue()
+    
+    filename = f"refunds_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
+    return StreamingResponse(
+        rows_as_csv(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
+
+
+@router.post("/admin/refunds/bulk")
+async def bulk_update_refunds(
+    data: RefundBulkUpdateIn,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Approve or reject many refund requests at once (Super Admin only).
+    Only REQUESTED / UNDER_REVIEW refunds are changed; others are returned
+    in `skipped`. Approving also cancels the refunded bookings and frees
+    their cabins. Everything happens in one transaction.
+    """
+    _require_super_admin(current_user, "Only Super Admin can update refund status")
     
-    query = select(Refund).order_by(desc(Refund.requested_at))
-    
-    if status_filter:
-        try:
-            status_enum = RefundStatus(status_filter)
-            query = query.where(Refund.status == status_enum)
-        except ValueError:
-            pass  # Ignore invalid status filter
+    try:
+        new_status = RefundStatus(data.status)
+    except ValueError:
+        new_status = None
+    if new_status not in (RefundStatus.APPROVED, RefundStatus.REJECTED):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bulk status must be APPROVED or REJECTED"
+        )
     
-    result = await db.execute(query)
-    refunds = result.scalars().all()
+    refund_ids = list(dict.fromkeys(data.refund_ids))
+    values = {
+        "status": new_status,
+        "reviewed_by": current_user.id,
+        "reviewed_at": datetime.utcnow()
+    }
+    if data.admin_notes:
+        values["admin_notes"] = data.admin_notes
     
-    refund_list = []
-    for refund in refunds:
-        # Get user info
-        user_result = await db.execute(
-            select(User).where(User.id == refund.user_id)
-        )
-        user = user_result.scalar_one_or_none()
-        
-        # Get venue name
-        venue_name = "Unknown Venue"
-        booking_result = await db.execute(
-            select(Booking).where(Booking.id == refund.booking_id)
+    # The status condition makes concurrent reviews safe: a refund is only
+    # decided once, whoever gets there first
+    result = await db.execute(
+        update(Refund)
+        .where(
+            Refund.id.in_(refund_ids),
+            Refund.status.in_([RefundStatus.REQUESTED, RefundStatus.UNDER_REVIEW])
         )
-        booking = booking_result.scalar_one_or_none()
-        
-        if booking:
-            if booking.cabin_id:
-                cabin_result = await db.execute(
-                    select(Cabin).where(Cabin.id == booking.cabin_id)
-                )
-                cabin = cabin_result.scalar_one_or_none()
-                if cabin:
-                    room_result = await db.execute(
-                        select(ReadingRoom).where(ReadingRoom.id == cabin.reading_room_id)
-                    )
-                    room = room_result.scalar_one_or_none()
-                    if room:
-                        venue_name = room.name
-            elif booking.accommodation_id:
-                acc_result = await db.execute(
-                    select(Accommodation).where(Accommodation.id == booking.accommodation_id)
-                )
-                acc = acc_result.scalar_one_or_none()
-                if acc:
-                    venue_name = acc.name
-        
-        refund_list.append(RefundAdminOut(
-            id=refund.id,
-            booking_id=refund.booking_id,
-            venue_name=venue_name,
-            amount=refund.amount,
-            reason=refund.reason.value if refund.reason else "OTHER",
-            reason_text=refund.reason_text,
-            status=refund.status.value if refund.status else "REQUESTED",
-            requested_at=refund.requested_at.isoformat() if refund.requested_at else "",
-            processed_at=refund.processed_at.isoformat() if refund.processed_at else None,
-            user_id=refund.user_id,
-            user_email=user.email if user else "",
-            user_name=user.name if user else "Unknown",
-            admin_notes=refund.admin_notes,
-            reviewed_by=refund.reviewed_by
-        ))
+        .values(**values)
+        .returning(Refund.id, Refund.booking_id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = result.all()
+    
+    released = []
+    if new_status == RefundStatus.APPROVED:
+        released = await _apply_refund_approval(db, [row.booking_id for row in updated])
+    await db.commit()
+    await _broadcast_released_cabins(released)
     
-    return refund_list
+    updated_ids = {row.id for row in updated}
+    return {
+        "status": new_status.value,
+        "updated": [refund_id for refund_id in refund_ids if refund_id in updated_ids],
+        "skipped": [refund_id for refund_id in refund_ids if refund_id not in updated_ids],
+        "message": f"{len(updated_ids)} refund(s) updated to {new_status.value}"
+    }
 
 
 @router.patch("/admin/refunds/{refund_id}")
@@ -543,6 +696,7 @@ async def update_refund_status(
     - REQUESTED -> UNDER_REVIEW, APPROVED, REJECTED
     - UNDER_REVIEW -> APPROVED, REJECTED
     - APPROVED -> PROCESSED, FAILED
+    Approving cancels the booking and frees its cabin, as in the bulk update.
     """
     if current_user.role != UserRole.SUPER_ADMIN:
         raise HTTPException(
@@ -570,6 +724,10 @@ async def update_refund_status(
             detail=f"Invalid status: {data.status}"
         )
     
+    released = []
+    if new_status == RefundStatus.APPROVED and refund.status in (RefundStatus.REQUESTED, RefundStatus.UNDER_REVIEW):
+        released = await _apply_refund_approval(db, [refund.booking_id])
+    
     # Update refund
     refund.status = new_status
     refund.reviewed_by = current_user.id
@@ -584,6 +742,7 @@ async def update_refund_status(
     
     await db.commit()
     await db.refresh(refund)
+    await _broadcast_released_cabins(released)
     
     return {
         "id": refund.id,
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from pydantic import BaseModel
@@ -9,7 +10,18 @@ from app.database import get_db
 from app.models.booking import Booking, PaymentStatus
 from app.models.user import User
 from app.services.payment_service import payment_service
-from app.deps import get_current_user
+from app.services.payment_events import (
+    payment_event_processor,
+    store_event,
+    verify_webhook_signature,
+    mark_booking_paid,
+    booking_email_details,
+)
+from app.services.email_service import send_booking_confirmation_email
+from app.deps import get_current_user, require_unblocked
+from app.services.trust_blocks import BLOCK_PAYMENTS
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/payments", tags=["Razorpay Payments"])
 
@@ -42,7 +54,7 @@ class RefundRequest(BaseModel):
 @router.post("/create-order", response_model=CreateOrderResponse)
 async def create_payment_order(
     request: CreateOrderRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_unblocked(BLOCK_PAYMENTS)),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -64,7 +76,7 @@ async def create_payment_order(
         raise HTTPException(status_code=400, detail="Booking already paid")
     
     # Create Razorpay order
-    order = payment_service.create_order(
+    order = await payment_service.create_order(
         amount=request.amount,
         receipt=f"booking_{booking.id}",
         notes={
@@ -93,7 +105,9 @@ async def verify_payment(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Verify Razorpay payment signature and update booking
+    Verify Razorpay payment signature and update booking.
+    The signature proves the payment, so there is no gateway round trip; if
+    the webhook has already applied it this is just a status lookup.
     """
     # Verify signature
     is_valid = payment_service.verify_payment_signature(
@@ -105,10 +119,6 @@ async def verify_payment(
     if not is_valid:
         raise HTTPException(status_code=400, detail="Invalid payment signature")
     
-    # Fetch payment details from Razorpay
-    payment = payment_service.fetch_payment(request.razorpay_payment_id)
-    
-    # Update booking
     result = await db.execute(
         select(Booking).where(
             Booking.id == request.booking_id,
@@ -120,69 +130,65 @@ async def verify_payment(
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    # Update payment status
-    booking.payment_status = PaymentStatus.PAID
-    booking.transaction_id = request.razorpay_payment_id
-    
-    await db.commit()
-    await db.refresh(booking)
-    
-    # Send booking confirmation email
-    try:
-        from app.services.email_service import send_booking_confirmation_email
-        from app.models.reading_room import Cabin, ReadingRoom
-        from app.models.accommodation import Accommodation
-        
-        venue_name = "Venue"
-        venue_address = ""
-        cabin_number = None
-        booking_type = "booking"
+    # Whoever flips the booking to PAID (this request or the webhook worker) sends
+    # the email. The order id ties the signature to this booking's own order.
+    if await mark_booking_paid(db, booking.id, request.razorpay_payment_id, order_id=request.razorpay_order_id):
+        booking_details = await booking_email_details(db, booking, request.razorpay_payment_id)
         
-        if booking.cabin_id:
-            cabin_result = await db.execute(select(Cabin).where(Cabin.id == booking.cabin_id))
-            cabin = cabin_result.scalar_one_or_none()
-            if cabin:
-                cabin_number = cabin.number
-                room_result = await db.execute(select(ReadingRoom).where(ReadingRoom.id == cabin.reading_room_id))
-                room = room_result.scalar_one_or_none()
-                if room:
-                    venue_name = room.name
-                    venue_address = room.address or ""
-            booking_type = "cabin"
-        elif booking.accommodation_id:
-            acc_result = await db.execute(select(Accommodation).where(Accommodation.id == booking.accommodation_id))
-            accommodation = acc_result.scalar_one_or_none()
-            if accommodation:
-                venue_name = accommodation.name
-                venue_address = accommodation.address or ""
-            booking_type = "accommodation"
+        # Committing returns the connection to the pool before the email send
+        await db.commit()
         
-        await send_booking_confirmation_email(
-            recipient_email=current_user.email,
-            recipient_name=current_user.name,
-            booking_details={
-                "venue_name": venue_name,
-                "booking_type": booking_type,
-                "start_date": booking.start_date.strftime("%d %B %Y") if booking.start_date else "N/A",
-                "end_date": booking.end_date.strftime("%d %B %Y") if booking.end_date else "N/A",
-                "amount": f"{booking.amount:,.2f}",
-                "transaction_id": request.razorpay_payment_id,
-                "venue_address": venue_address,
-                "cabin_number": cabin_number
-            }
-        )
-    except Exception as email_error:
-        print(f"Failed to send booking confirmation email: {email_error}")
+        try:
+            await send_booking_confirmation_email(
+                recipient_email=current_user.email,
+                recipient_name=current_user.name,
+                booking_details=booking_details
+            )
+        except Exception as email_error:
+            logger.error(f"Failed to send booking confirmation email: {email_error}")
+    else:
+        # Not applied here: fine if the webhook already recorded this payment,
+        # otherwise the booking isn't awaiting this order (refunded, other order, ...)
+        await db.refresh(booking)
+        if booking.payment_status != PaymentStatus.PAID or booking.transaction_id != request.razorpay_payment_id:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Payment not applied: booking is {booking.payment_status.value} and not awaiting this order"
+            )
     
     return {
         "success": True,
         "message": "Payment verified successfully",
         "booking_id": booking.id,
         "payment_id": request.razorpay_payment_id,
-        "amount": payment["amount"] / 100  # Convert paise to rupees
+        "amount": booking.amount
     }
 
 
+@router.post("/webhook")
+async def payment_webhook(
+    http_request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Razorpay webhook receiver.
+    Verifies the signature, stores the event in the inbox (once per event id)
+    and returns straight away; the payment event worker applies it.
+    """
+    body = await http_request.body()
+    if not verify_webhook_signature(body, http_request.headers.get("x-razorpay-signature", "")):
+        raise HTTPException(status_code=400, detail="Invalid webhook signature")
+    
+    try:
+        stored = await store_event(db, body, http_request.headers.get("x-razorpay-event-id"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid webhook payload")
+    
+    if stored:
+        payment_event_processor.wake()
+    return {"status": "accepted" if stored else "duplicate"}
+
+
 @router.post("/refund")
 async def refund_payment(
     request: RefundRequest,
@@ -205,7 +211,7 @@ async def refund_payment(
         raise HTTPException(status_code=400, detail="Booking is not paid")
     
     # Process refund
-    refund = payment_service.refund_payment(
+    refund = await payment_service.refund_payment(
         payment_id=booking.transaction_id,
         amount=request.amount,
         notes={"reason": request.reason or "User requested refund"}
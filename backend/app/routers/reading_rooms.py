@@ -1,5 +1,5 @@
 from typing import List, Annotated
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.database import get_db
@@ -8,13 +8,24 @@ from app.models.city import CitySettings
 from app.models.booking import Booking
 from app.schemas.reading_room import ReadingRoomCreate, ReadingRoomResponse, CabinCreate, ReadingRoomUpdate
 from app.models.user import User, UserRole
-from app.deps import get_current_user, get_current_admin, get_current_user_optional
+from app.deps import get_current_user, get_current_admin, get_current_user_optional, require_unblocked
+from app.services.trust_blocks import BLOCK_LISTINGS
+from app.services import seat_map_import
+from app.services.seat_map_import import (
+    IMPORT_BATCH_SIZE,
+    SeatMapImportError,
+    detect_format,
+    iter_seat_map_records,
+)
 from pydantic import BaseModel
 import json
 
 router = APIRouter(prefix="/reading-rooms", tags=["reading-rooms"])
 
-from app.utils.geo import haversine_distance, sort_by_proximity
+from app.utils.geo import haversine_distance, sort_by_proximity, bounding_box_clause
+from app.utils.visibility import visible_listing_clause
+from app.core.responses import trusted_response
+from app.core.http_cache import conditional_get
 from typing import Optional
 
 
@@ -25,55 +36,21 @@ async def get_reading_rooms(
     radius: Optional[float] = 5.0, # Default 5km radius
     include_unverified: bool = False,
     db: AsyncSession = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    cache_headers: dict = Depends(conditional_get("reading_rooms", "city_settings", max_age=30, per_user=True))
 ):
-    query = select(ReadingRoom).order_by(ReadingRoom.is_sponsored.desc(), ReadingRoom.name)
-    
-    show_unverified = False
-    if include_unverified:
-         if current_user and current_user.role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
-             show_unverified = True
-    
-
-    if not show_unverified:
-        # Show LIVE rooms OR rooms owned by current user
-        if current_user:
-             query = query.where((ReadingRoom.status == ListingStatus.LIVE) | (ReadingRoom.owner_id == current_user.id))
-        else:
-             query = query.where(ReadingRoom.status == ListingStatus.LIVE)
+    # Status, paused-city and trust rules are applied in SQL
+    # (FLAGGED / SUSPENDED venues stay visible to their owner and super admins)
+    query = (
+        select(ReadingRoom)
+        .where(visible_listing_clause(ReadingRoom, current_user, include_unverified))
+        .order_by(ReadingRoom.is_sponsored.desc(), ReadingRoom.name)
+    )
+    if lat is not None and long is not None:
+        query = query.where(bounding_box_clause(ReadingRoom, lat, long, radius))
 
     result = await db.execute(query)
-    all_rooms = result.scalars().all()
-    
-    # Filter by City Status
-    settings_res = await db.execute(select(CitySettings))
-    city_map = {s.city_name.lower(): s.is_active for s in settings_res.scalars().all()}
-    
-    rooms = []
-    for r in all_rooms:
-        c_name = (r.city or "").strip().lower()
-        if city_map.get(c_name, True):
-            rooms.append(r)
-    
-    # Filter by Trust Status - hide FLAGGED and SUSPENDED venues from public listings
-    # Owners and admins can still see their own flagged venues
-    trust_filtered_rooms = []
-    for room in rooms:
-        trust_status = getattr(room, 'trust_status', 'CLEAR') or 'CLEAR'
-        
-        # Super Admins can see all
-        if current_user and current_user.role == UserRole.SUPER_ADMIN:
-            trust_filtered_rooms.append(room)
-        # Owner can see their own venue regardless of trust status
-        elif current_user and room.owner_id == current_user.id:
-            trust_filtered_rooms.append(room)
-        # Public users only see CLEAR or UNDER_REVIEW venues
-        elif trust_status in ['CLEAR', 'UNDER_REVIEW']:
-            trust_filtered_rooms.append(room)
-        # FLAGGED and SUSPENDED venues are hidden from public
-        # (they can still see UNDER_REVIEW as it means owner is working on it)
-    
-    rooms = trust_filtered_rooms
+    rooms = result.scalars().all()
 
     if lat is not None and long is not None:
         nearby_rooms = []
@@ -83,9 +60,10 @@ async def get_reading_rooms(
                 if dist <= radius:
                     setattr(room, '_distance', dist)
                     nearby_rooms.append(room)
-        return sort_by_proximity(lat, long, nearby_rooms)
+        rooms = sort_by_proximity(lat, long, nearby_rooms)
 
-    return rooms
+    # Rows map 1:1 onto the schema; serialize once instead of re-validating
+    return trusted_response(rooms, ReadingRoomResponse, headers=cache_headers)
 
 from app.schemas.user import UserResponse
 
@@ -138,7 +116,7 @@ async def get_my_students(
     
     return students
 
-@router.post("/", response_model=ReadingRoomResponse)
+@router.post("/", response_model=ReadingRoomResponse, dependencies=[Depends(require_unblocked(BLOCK_LISTINGS))])
 async def create_reading_room(
     room: ReadingRoomCreate, 
     db: AsyncSession = Depends(get_db), 
@@ -202,6 +180,45 @@ async def create_cabins_batch(
     await db.commit()
     return {"message": f"{len(cabins)} cabins created successfully"}
 
+@router.post("/{room_id}/cabins/import")
+async def import_seat_map(
+    room_id: str,
+    file: UploadFile = File(...),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Import a full seat map (CSV, JSON array or JSON Lines).
+    Columns: floor, zone, row_label, number, price, amenities.
+    All seats are inserted in one transaction; any invalid row rejects the import.
+    """
+    result = await db.execute(select(ReadingRoom).where(ReadingRoom.id == room_id))
+    room = result.scalars().first()
+    if not room:
+        raise HTTPException(status_code=404, detail="Reading room not found")
+
+    if room.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    fmt = detect_format(file.filename, file.content_type)
+    try:
+        summary = await seat_map_import.import_seat_map(
+            db, room_id, iter_seat_map_records(file.file, fmt), batch_size=batch_size
+        )
+    except SeatMapImportError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail={"message": f"Seat map rejected: {e.total_errors} invalid rows", "errors": e.errors}
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Could not read seat map: {str(e)}")
+
+    await db.commit()
+    return {"message": f"{summary['inserted']} cabins imported successfully", **summary}
+
 from app.schemas.reading_room import CabinResponse
 
 @router.post("/{room_id}/cabins", response_model=CabinResponse)
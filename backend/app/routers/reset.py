@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.database import get_db
+from app.services.trust_blocks import trust_blocks
 from datetime import datetime
 import logging
 
@@ -63,6 +64,7 @@ async def reset_database(db: AsyncSession = Depends(get_db)):
                 logger.warning(f"Reset warning for {table_name}: {str(e)}")
         
         await db.commit()
+        trust_blocks.invalidate()
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -11,6 +12,8 @@ from app.schemas.review import ReviewCreate, ReviewResponse
 from app.deps import get_current_user
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
 
 # Review eligibility delay in hours
@@ -123,7 +126,7 @@ async def check_review_status(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    print(f"Checking review status for user {current_user.id}, RR: {reading_room_id}, Acc: {accommodation_id}")
+    logger.debug(f"Checking review status for user {current_user.id}, RR: {reading_room_id}, Acc: {accommodation_id}")
     stmt = select(Review).where(
         Review.user_id == current_user.id,
         Review.reading_room_id == reading_room_id,
@@ -131,7 +134,7 @@ async def check_review_status(
     )
     result = await db.execute(stmt)
     existing = result.scalars().first()
-    print(f"Review status result: {existing}")
+    logger.debug(f"Review status result: {existing}")
     
     if existing:
         return {
@@ -151,7 +154,7 @@ async def create_review(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    print(f"Received review: {review.model_dump()}")
+    logger.debug(f"Received review: {review.model_dump()}")
     
     # ========================================
     # 48-HOUR ELIGIBILITY CHECK (CRITICAL)
@@ -191,7 +194,7 @@ async def create_review(
         await db.refresh(new_review)
         return new_review
     except Exception as e:
-        print(f"Error creating review: {e}")
+        logger.error(f"Error creating review: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/", response_model=List[ReviewResponse])
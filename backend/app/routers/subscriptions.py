@@ -11,6 +11,7 @@ from app.database import get_db
 from app.models.subscription_plan import SubscriptionPlan
 from app.models.user import User, UserRole
 from app.deps import get_current_user, get_current_admin, get_current_user_optional
+from app.core.http_cache import conditional_get
 
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
@@ -63,7 +64,8 @@ class SubscriptionPlanResponse(BaseModel):
 @router.get("/plans", response_model=List[SubscriptionPlanResponse])
 async def get_subscription_plans(
     include_inactive: bool = False,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _cache: dict = Depends(conditional_get("subscription_plans", max_age=300))
 ):
     """
     Get all subscription plans.
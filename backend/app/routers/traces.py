@@ -0,0 +1,43 @@
+"""
+Traces Router - Recently kept request traces (Super Admin)
+Handles:
+- GET /admin/traces/slowest - Slowest traces in the in-memory ring
+- GET /admin/traces/{trace_id} - Every span of one trace
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.tracing import tracer
+from app.deps import get_current_super_admin
+from app.models.user import User
+
+router = APIRouter(prefix="/admin/traces", tags=["Tracing"])
+
+
+@router.get("/slowest")
+async def get_slowest_traces(
+    limit: int = Query(20, ge=1, le=200),
+    min_ms: float = Query(0.0, ge=0, description="Only traces at least this slow"),
+    current_user: User = Depends(get_current_super_admin)
+):
+    """
+    Slowest of the traces this worker kept recently (head-sampled, failed
+    or slower than TRACE_SLOW_MS), with time per span category - db,
+    gateway, email, pdf - so it's clear where a slow request spent it.
+    """
+    return {
+        "traces": tracer.slowest(limit, min_ms),
+        "stats": tracer.stats(),
+    }
+
+
+@router.get("/{trace_id}")
+async def get_trace(
+    trace_id: str,
+    current_user: User = Depends(get_current_super_admin)
+):
+    """Full span list of a kept trace (ids come from /slowest or the X-Trace-Id header)"""
+    trace = tracer.find(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (not kept, or rotated out of memory)")
+    return trace.detail()
@@ -13,6 +13,7 @@ NO UI-ONLY ACTIONS - Every button click persists.
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, and_, or_, text
 from datetime import datetime
 from typing import List, Optional
 import json
@@ -24,6 +25,11 @@ from app.models.audit_log import AuditLog, AuditActionType
 from app.models.reading_room import ReadingRoom
 from app.models.accommodation import Accommodation
 from app.models.user import User
+from app.deps import get_current_super_admin
+from app.services.audit_service import build_audit_row, record_audit, list_partitions
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.core.responses import trusted_response
+from app.services.trust_blocks import trust_blocks, describe
 
 # Trust status values (stored as strings in DB)
 TRUST_STATUS_CLEAR = "CLEAR"
@@ -77,22 +83,23 @@ async def log_audit(
     entity_name: str = None,
     metadata: dict = None
 ):
-    """Create an immutable audit log entry."""
-    entry = AuditLog(
+    """
+    Create an immutable audit log entry.
+    The row is handed to the background audit writer and inserted in a batch,
+    so callers don't wait on the INSERT.
+    """
+    row = build_audit_row(
         actor_id=actor_id,
         actor_name=actor_name,
         actor_role=actor_role,
         action_type=action_type,
-        action_description=description,
+        description=description,
         entity_type=entity_type,
         entity_id=entity_id,
         entity_name=entity_name,
-        extra_data=json.dumps(metadata) if metadata else None,
-        timestamp=datetime.utcnow()
+        metadata=metadata
     )
-    db.add(entry)
-    await db.commit()
-    return entry
+    return await record_audit(db, row)
 
 
 async def update_venue_trust_status(db: AsyncSession, entity_type: str, entity_id: str, trust_status: str):
@@ -137,7 +144,7 @@ async def get_all_flags(
     flags = result.scalars().all()
     
     # Convert to dict for JSON response
-    return [
+    return trusted_response(
         {
             "id": f.id,
             "entity_type": f.entity_type,
@@ -158,7 +165,7 @@ async def get_all_flags(
             "resubmitted_at": f.resubmitted_at.isoformat() if f.resubmitted_at else None
         }
         for f in flags
-    ]
+    )
 
 
 @router.post("/flags")
@@ -541,6 +548,7 @@ async def send_reminder(
     db.add(reminder)
     await db.commit()
     await db.refresh(reminder)
+    await trust_blocks.refresh(db, data.user_id)
     
     # Log audit
     await log_audit(
@@ -579,6 +587,7 @@ async def complete_reminder(
     
     await db.commit()
     await db.refresh(reminder)
+    await trust_blocks.refresh(db, user_id)
     
     # Log audit
     await log_audit(
@@ -627,25 +636,8 @@ async def check_user_blocks(
     user_id: str = Query(..., description="User ID"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Check if user has any active blocks from reminders."""
-    result = await db.execute(
-        select(Reminder).where(
-            Reminder.user_id == user_id,
-            Reminder.status == ReminderStatus.PENDING
-        )
-    )
-    pending_reminders = result.scalars().all()
-    
-    blocks = {
-        "has_blocks": len(pending_reminders) > 0,
-        "blocks_listings": any(r.blocks_listings for r in pending_reminders),
-        "blocks_payments": any(r.blocks_payments for r in pending_reminders),
-        "blocks_bookings": any(r.blocks_bookings for r in pending_reminders),
-        "pending_reminders": len(pending_reminders),
-        "reminder_types": [str(r.reminder_type.value) for r in pending_reminders if r.reminder_type]
-    }
-    
-    return blocks
+    """Check if user has any active blocks from reminders (served from the block mask cache)."""
+    return describe(await trust_blocks.get(db, user_id))
 
 
 # ================== AUDIT LOG ENDPOINTS ==================
@@ -657,43 +649,71 @@ async def get_audit_log(
     actor_id: Optional[str] = None,
     action_type: Optional[str] = None,
     entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
     limit: int = Query(100, le=500),
     offset: int = Query(0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination)"),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get audit log entries with filters.
     Read-only - no updates or deletes allowed.
+
+    Pass `cursor` instead of `offset` to page without scanning skipped rows.
+    `count=estimate` uses planner statistics on PostgreSQL when no filters
+    are applied; `count=none` skips the total entirely.
     """
-    query = select(AuditLog)
-    
+    filters = []
     if start_date:
-        query = query.where(AuditLog.timestamp >= datetime.fromisoformat(start_date))
+        filters.append(AuditLog.timestamp >= datetime.fromisoformat(start_date))
     if end_date:
-        query = query.where(AuditLog.timestamp <= datetime.fromisoformat(end_date))
+        filters.append(AuditLog.timestamp <= datetime.fromisoformat(end_date))
     if actor_id:
-        query = query.where(AuditLog.actor_id == actor_id)
-    if action_type:
-        query = query.where(AuditLog.action_type == action_type)
-    if entity_type:
-        query = query.where(AuditLog.entity_type == entity_type)
-    
-    # Count total
-    count_query = select(AuditLog)
+        filters.append(AuditLog.actor_id == actor_id)
     if action_type:
-        count_query = count_query.where(AuditLog.action_type == action_type)
+        filters.append(AuditLog.action_type == action_type)
     if entity_type:
-        count_query = count_query.where(AuditLog.entity_type == entity_type)
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
-    
-    # Get entries with pagination
-    query = query.order_by(AuditLog.timestamp.desc()).offset(offset).limit(limit)
+        filters.append(AuditLog.entity_type == entity_type)
+    if entity_id:
+        filters.append(AuditLog.entity_id == entity_id)
+    
+    # Count total (same filters as the page query)
+    total = None
+    total_is_estimate = False
+    if count == "estimate" and not filters and db.bind.dialect.name == "postgresql":
+        estimate_result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'audit_logs'")
+        )
+        total = max(estimate_result.scalar() or 0, 0)
+        total_is_estimate = True
+    elif count != "none":
+        count_result = await db.execute(select(func.count()).select_from(AuditLog).where(*filters))
+        total = count_result.scalar()
+    
+    # Get entries with pagination, newest first with id as tie-breaker
+    query = select(AuditLog).where(*filters)
+    after = decode_cursor(cursor, 2)
+    if after:
+        after_ts, after_id = after
+        query = query.where(or_(
+            AuditLog.timestamp < after_ts,
+            and_(AuditLog.timestamp == after_ts, AuditLog.id < after_id)
+        ))
+    else:
+        query = query.offset(offset)
+    query = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit)
     result = await db.execute(query)
     entries = result.scalars().all()
     
+    next_cursor = None
+    if len(entries) == limit:
+        next_cursor = encode_cursor(entries[-1].timestamp, entries[-1].id)
+    
     return {
         "total": total,
+        "total_is_estimate": total_is_estimate,
+        "next_cursor": next_cursor,
         "entries": [
             {
                 "id": e.id,
@@ -715,10 +735,20 @@ async def get_audit_log(
     }
 
 
+@router.get("/audit-log/partitions")
+async def get_audit_log_partitions(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin)
+):
+    """Row counts per monthly audit partition (candidates for archiving)."""
+    return await list_partitions(db)
+
+
 @router.get("/audit-log/entity/{entity_type}/{entity_id}")
 async def get_entity_audit_log(
     entity_type: str,
     entity_id: str,
+    limit: int = Query(200, le=500),
     db: AsyncSession = Depends(get_db)
 ):
     """Get audit log for a specific entity (for owner view)."""
@@ -726,7 +756,7 @@ async def get_entity_audit_log(
         select(AuditLog).where(
             AuditLog.entity_type == entity_type,
             AuditLog.entity_id == entity_id
-        ).order_by(AuditLog.timestamp.desc())
+        ).order_by(AuditLog.timestamp.desc()).limit(limit)
     )
     entries = result.scalars().all()
     
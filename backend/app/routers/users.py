@@ -1,11 +1,14 @@
+import re
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func
 from app.database import get_db
-from app.models.user import User, UserRole
-from app.schemas.user import UserResponse, AdminUserUpdate
+from app.models.user import User, UserRole, VerificationStatus
+from app.schemas.user import UserResponse, AdminUserUpdate, UserDirectoryPage
 from app.deps import get_current_super_admin, get_current_user
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -24,6 +27,60 @@ async def get_all_users(
     users = result.scalars().all()
     return users
 
+def _search_pattern(q: str) -> str:
+    """LIKE pattern for users.search_text; phone-like input is reduced to digits"""
+    term = q.lower().strip()
+    if re.fullmatch(r"[\d\s()+-]+", term):
+        term = re.sub(r"\D", "", term)
+    term = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{term}%"
+
+@router.get("/directory", response_model=UserDirectoryPage)
+async def get_user_directory(
+    q: Optional[str] = Query(None, min_length=2, description="Search name, email or phone"),
+    role: Optional[UserRole] = None,
+    verification_status: Optional[VerificationStatus] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination)"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin)
+):
+    """
+    Paginated user directory for the Super Admin console.
+    Substring search runs against the normalized search_text column
+    (trigram-indexed on PostgreSQL); pages are ordered by email and
+    fetched by keyset. role_counts comes from one GROUP BY over the same
+    search filters, so role tabs can show their totals.
+    """
+    filters = []
+    if q:
+        filters.append(User.search_text.like(_search_pattern(q), escape="\\"))
+    if verification_status:
+        filters.append(User.verification_status == verification_status)
+    
+    counts_result = await db.execute(
+        select(User.role, func.count(User.id)).where(*filters).group_by(User.role)
+    )
+    role_counts = {r.value: 0 for r in UserRole}
+    for row_role, count in counts_result.all():
+        role_counts[row_role.value] = count
+    
+    query = select(User).where(*filters)
+    if role:
+        query = query.where(User.role == role)
+    after = decode_cursor(cursor, 1)
+    if after:
+        query = query.where(User.email > after[0])
+    result = await db.execute(query.order_by(User.email).limit(limit))
+    users = result.scalars().all()
+    
+    return UserDirectoryPage(
+        users=users,
+        next_cursor=encode_cursor(users[-1].email) if len(users) == limit else None,
+        total=role_counts[role.value] if role else sum(role_counts.values()),
+        role_counts=role_counts
+    )
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user_by_id(
     user_id: str,
@@ -14,7 +14,8 @@ from app.models.accommodation import Accommodation
 from app.models.subscription_plan import SubscriptionPlan
 from app.models.user import User
 from app.services.payment_service import payment_service
-from app.deps import get_current_user
+from app.deps import get_current_user, require_unblocked
+from app.services.trust_blocks import BLOCK_PAYMENTS
 
 router = APIRouter(prefix="/payments/venue", tags=["Venue Payments"])
 
@@ -46,7 +47,7 @@ class VerifyVenuePaymentRequest(BaseModel):
 @router.post("/create-order", response_model=CreateVenueOrderResponse)
 async def create_venue_payment_order(
     request: CreateVenueOrderRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_unblocked(BLOCK_PAYMENTS)),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -94,7 +95,7 @@ async def create_venue_payment_order(
         )
     
     # Create Razorpay order
-    order = payment_service.create_order(
+    order = await payment_service.create_order(
         amount=request.amount,
         receipt=f"venue_{request.venue_type}_{request.venue_id}",
         notes={
@@ -139,6 +140,18 @@ async def verify_venue_payment(
     if not is_valid:
         raise HTTPException(status_code=400, detail="Invalid payment signature")
     
+    # The signature only proves the order was paid; the order's notes (set by
+    # create-order) say which venue and plan it was for, and its amount what was paid
+    order = await payment_service.fetch_order(request.razorpay_order_id)
+    notes = order.get("notes") or {}
+    if (
+        notes.get("venue_id") != request.venue_id
+        or notes.get("venue_type") != request.venue_type
+        or notes.get("subscription_plan_id") != request.subscription_plan_id
+        or notes.get("owner_id") != current_user.id
+    ):
+        raise HTTPException(status_code=400, detail="Payment order does not match this venue and plan")
+    
     # Verify subscription plan
     plan_result = await db.execute(
         select(SubscriptionPlan).where(SubscriptionPlan.id == request.subscription_plan_id)
@@ -197,20 +210,14 @@ async def verify_venue_payment(
             detail=f"Cannot complete payment. Incomplete venue details: {', '.join(errors)}"
         )
     
-    # Update venue status to VERIFICATION_PENDING
-    venue.status = ListingStatus.VERIFICATION_PENDING
-    venue.subscription_plan_id = request.subscription_plan_id
-    venue.payment_id = request.razorpay_payment_id
-    venue.payment_date = datetime.utcnow()
-    
-    await db.commit()
-    
-    # Fetch payment details
-    try:
-        payment_info = payment_service.fetch_payment(request.razorpay_payment_id)
-    except Exception as e:
-        print(f"Could not fetch payment info: {e}")
-        payment_info = {"amount": 0, "method": "card"}
+    # Update venue status to VERIFICATION_PENDING (unless the payment webhook already did)
+    if venue.payment_id != request.razorpay_payment_id:
+        venue.status = ListingStatus.VERIFICATION_PENDING
+        venue.subscription_plan_id = request.subscription_plan_id
+        venue.payment_id = request.razorpay_payment_id
+        venue.payment_date = datetime.utcnow()
+        
+        await db.commit()
     
     return {
         "message": "Payment verified successfully. Venue submitted for admin approval.",
@@ -221,7 +228,7 @@ async def verify_venue_payment(
             "name": plan.name,
             "duration_days": plan.duration_days
         },
-        "amount": payment_info.get("amount", 0) / 100  # Convert paise to rupees
+        "amount": (order.get("amount_paid") or order.get("amount") or 0) / 100  # paise -> rupees
     }
 
 
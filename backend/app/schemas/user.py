@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Dict, List, Optional
 from app.models.user import UserRole, VerificationStatus
 
 class UserBase(BaseModel):
@@ -35,6 +35,13 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+class UserDirectoryPage(BaseModel):
+    """One page of the admin user directory"""
+    users: List[UserResponse]
+    next_cursor: Optional[str] = None
+    total: int  # matches across the selected role(s)
+    role_counts: Dict[str, int]  # matches per role, ignoring the role filter
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -0,0 +1,201 @@
+"""
+Audit Service - Append-only audit trail storage
+Entries are queued in memory and written in batches by a background task,
+so request handlers never wait on an audit INSERT. Old monthly partitions
+are archived to gzip JSON Lines files and removed from the live table.
+"""
+
+import gzip
+import json
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from sqlalchemy import insert, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.batching import BatchWriter
+from app.database import AsyncSessionLocal
+from app.models.audit_log import AuditLog, AuditActionType
+
+logger = logging.getLogger(__name__)
+
+# Max entries written per INSERT
+AUDIT_BATCH_SIZE = 200
+# How long the writer waits to fill a batch before flushing
+AUDIT_FLUSH_INTERVAL_SECONDS = 1.0
+# Entries held in memory before log calls fall back to a direct write
+AUDIT_QUEUE_MAX = 10000
+
+AUDIT_ARCHIVE_DIR = Path(__file__).parent.parent.parent / "archive" / "audit_logs"
+
+
+def partition_key_for(ts: datetime) -> str:
+    """Monthly partition bucket for a timestamp, e.g. '2026-10'"""
+    return ts.strftime("%Y-%m")
+
+
+def build_audit_row(
+    actor_id: str,
+    actor_name: Optional[str],
+    actor_role: str,
+    action_type: AuditActionType,
+    description: Optional[str],
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    entity_name: Optional[str] = None,
+    metadata: Optional[dict] = None,
+    ip_address: Optional[str] = None,
+    session_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build a fully populated audit row (id and timestamp fixed at call time)"""
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "actor_id": actor_id,
+        "actor_name": actor_name,
+        "actor_role": actor_role,
+        "action_type": action_type,
+        "action_description": description,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "entity_name": entity_name,
+        "extra_data": json.dumps(metadata) if metadata else None,
+        "timestamp": now,
+        "partition_key": partition_key_for(now),
+        "ip_address": ip_address,
+        "session_id": session_id,
+    }
+
+
+class AuditWriter:
+    """Background batch writer for audit rows"""
+
+    def __init__(self, batch_size: int = AUDIT_BATCH_SIZE, flush_interval: float = AUDIT_FLUSH_INTERVAL_SECONDS):
+        self._batches = BatchWriter(self._write, batch_size, flush_interval, AUDIT_QUEUE_MAX)
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._batches.running
+
+    @property
+    def queue_depth(self) -> int:
+        return self._batches.depth
+
+    async def start(self):
+        await self._batches.start()
+
+    async def stop(self):
+        """Stop the writer and flush everything still queued"""
+        await self._batches.stop()
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Queue a row for writing. Returns False if the writer can't take it."""
+        return self._batches.put(row)
+
+    async def _write(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(insert(AuditLog), rows)
+                await session.commit()
+            self.written += len(rows)
+        except Exception as e:
+            self.failed += len(rows)
+            logger.error(f"❌ Failed to write {len(rows)} audit entries: {e}")
+
+
+audit_writer = AuditWriter()
+
+
+async def record_audit(db: AsyncSession, row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Append an audit row. Goes through the background writer when it is
+    running; otherwise (scripts, full queue) it is inserted on `db` directly.
+    """
+    if not audit_writer.enqueue(row):
+        await db.execute(insert(AuditLog), [row])
+        await db.commit()
+    return row
+
+
+# ================== PARTITION MAINTENANCE ==================
+
+async def list_partitions(db: AsyncSession) -> List[Dict[str, Any]]:
+    """Row counts and time range per monthly partition"""
+    result = await db.execute(
+        select(
+            AuditLog.partition_key,
+            func.count(),
+            func.min(AuditLog.timestamp),
+            func.max(AuditLog.timestamp),
+        )
+        .group_by(AuditLog.partition_key)
+        .order_by(AuditLog.partition_key)
+    )
+    return [
+        {
+            "partition": key,
+            "rows": count,
+            "first": first.isoformat() if first else None,
+            "last": last.isoformat() if last else None,
+        }
+        for key, count, first, last in result.all()
+    ]
+
+
+async def archive_partition(
+    db: AsyncSession,
+    partition: str,
+    archive_dir: Path = AUDIT_ARCHIVE_DIR,
+    chunk_size: int = 1000
+) -> Dict[str, Any]:
+    """
+    Move one monthly partition to `<archive_dir>/audit_logs_<partition>.jsonl.gz`.
+
+    Rows are streamed to the file in chunks and only deleted from the live
+    table once the archive file is completely written.
+    """
+    if partition >= partition_key_for(datetime.utcnow()):
+        raise ValueError("Only closed (past) months can be archived")
+
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"audit_logs_{partition}.jsonl.gz"
+    if path.exists():
+        # Late rows for an already archived month go to a second file
+        path = archive_dir / f"audit_logs_{partition}.{int(datetime.utcnow().timestamp())}.jsonl.gz"
+    tmp_path = path.with_suffix(".gz.tmp")
+
+    columns = [c.name for c in AuditLog.__table__.columns]
+    rows = 0
+    stream = await db.stream(
+        select(AuditLog.__table__)
+        .where(AuditLog.partition_key == partition)
+        .order_by(AuditLog.timestamp, AuditLog.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as out:
+        async for chunk in stream.partitions(chunk_size):
+            for record in chunk:
+                entry = dict(zip(columns, record))
+                entry["timestamp"] = entry["timestamp"].isoformat() if entry["timestamp"] else None
+                if entry["action_type"] is not None:
+                    entry["action_type"] = entry["action_type"].value
+                out.write(json.dumps(entry) + "\n")
+                rows += 1
+
+    if rows == 0:
+        tmp_path.unlink(missing_ok=True)
+        return {"partition": partition, "rows": 0, "path": None}
+
+    tmp_path.replace(path)
+    await db.execute(delete(AuditLog).where(AuditLog.partition_key == partition))
+    await db.commit()
+    return {"partition": partition, "rows": rows, "path": str(path)}
@@ -1,25 +1,51 @@
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+import logging
 from pydantic import EmailStr
 from typing import List, Optional
 import os
 from pathlib import Path
 from app.core.config import settings
+from app.core.tracing import span, KIND_CLIENT
 
-# Email configuration
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.mail_username or os.getenv("mail_username", ""),
-    MAIL_PASSWORD=settings.mail_password or os.getenv("mail_password", ""),
-    MAIL_FROM=settings.mail_from or os.getenv("mail_from", "noreply@studyspace.com"),
-    MAIL_PORT=settings.mail_port or int(os.getenv("mail_port", "587")),
-    MAIL_SERVER=settings.mail_server or os.getenv("mail_server", "smtp.gmail.com"),
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True,
-    TEMPLATE_FOLDER=Path(__file__).parent.parent / 'templates' / 'email'
-)
+logger = logging.getLogger(__name__)
 
-fm = FastMail(conf)
+# fastapi_mail is slow to import (~0.3s), so the client is built on first
+# use - or at startup by app.core.warmup before the worker takes traffic
+_mailer = None
+
+
+def get_mailer():
+    """Shared FastMail client, created on first call"""
+    global _mailer
+    if _mailer is None:
+        from fastapi_mail import FastMail, ConnectionConfig
+        
+        conf = ConnectionConfig(
+            MAIL_USERNAME=settings.mail_username or os.getenv("mail_username", ""),
+            MAIL_PASSWORD=settings.mail_password or os.getenv("mail_password", ""),
+            MAIL_FROM=settings.mail_from or os.getenv("mail_from", "noreply@studyspace.com"),
+            MAIL_PORT=settings.mail_port or int(os.getenv("mail_port", "587")),
+            MAIL_SERVER=settings.mail_server or os.getenv("mail_server", "smtp.gmail.com"),
+            MAIL_STARTTLS=True,
+            MAIL_SSL_TLS=False,
+            USE_CREDENTIALS=True,
+            VALIDATE_CERTS=True,
+            TEMPLATE_FOLDER=Path(__file__).parent.parent / 'templates' / 'email'
+        )
+        _mailer = FastMail(conf)
+    return _mailer
+
+
+def html_message(**fields):
+    """MessageSchema with an HTML body"""
+    from fastapi_mail import MessageSchema, MessageType
+    
+    return MessageSchema(subtype=MessageType.html, **fields)
+
+
+async def send_message(message, template_name: Optional[str] = None):
+    """Send through the shared client, timed as an email.send span"""
+    with span("email.send", KIND_CLIENT, template=template_name or "inline"):
+        await get_mailer().send_message(message, template_name=template_name)
 
 
 async def send_booking_confirmation_email(
@@ -44,20 +70,19 @@ async def send_booking_confirmation_email(
             - cabin_number: Cabin/room number (optional)
     """
     try:
-        message = MessageSchema(
+        message = html_message(
             subject="Booking Confirmation - StudySpace",
             recipients=[recipient_email],
             template_body={
                 "recipient_name": recipient_name,
                 **booking_details
-            },
-            subtype=MessageType.html
+            }
         )
         
-        await fm.send_message(message, template_name="booking_confirmation.html")
+        await send_message(message, template_name="booking_confirmation.html")
         return True
     except Exception as e:
-        print(f"Failed to send booking confirmation email: {e}")
+        logger.error(f"Failed to send booking confirmation email: {e}")
         return False
 
 
@@ -81,20 +106,19 @@ async def send_booking_extension_email(
             - days_extended: Number of days extended
     """
     try:
-        message = MessageSchema(
+        message = html_message(
             subject="Booking Extended - StudySpace",
             recipients=[recipient_email],
             template_body={
                 "recipient_name": recipient_name,
                 **extension_details
-            },
-            subtype=MessageType.html
+            }
         )
         
-        await fm.send_message(message, template_name="booking_extension.html")
+        await send_message(message, template_name="booking_extension.html")
         return True
     except Exception as e:
-        print(f"Failed to send booking extension email: {e}")
+        logger.error(f"Failed to send booking extension email: {e}")
         return False
 
 
@@ -117,20 +141,19 @@ async def send_inquiry_response_email(
             - venue_phone: Contact phone number
     """
     try:
-        message = MessageSchema(
+        message = html_message(
             subject="Your Inquiry Has Been Answered - StudySpace",
             recipients=[recipient_email],
             template_body={
                 "recipient_name": recipient_name,
                 **inquiry_details
-            },
-            subtype=MessageType.html
+            }
         )
         
-        await fm.send_message(message, template_name="inquiry_response.html")
+        await send_message(message, template_name="inquiry_response.html")
         return True
     except Exception as e:
-        print(f"Failed to send inquiry response email: {e}")
+        logger.error(f"Failed to send inquiry response email: {e}")
         return False
 
 
@@ -154,20 +177,52 @@ async def send_new_inquiry_notification_email(
             - inquiry_date: Date of inquiry
     """
     try:
-        message = MessageSchema(
+        message = html_message(
             subject="New Inquiry for Your Venue - StudySpace",
             recipients=[recipient_email],
             template_body={
                 "recipient_name": recipient_name,
                 **inquiry_details
-            },
-            subtype=MessageType.html
+            }
+        )
+        
+        await send_message(message, template_name="new_inquiry_notification.html")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to send new inquiry notification email: {e}")
+        return False
+
+
+async def send_inquiry_digest_email(
+    recipient_email: EmailStr,
+    recipient_name: str,
+    inquiries: List[dict],
+    pending_count: int
+):
+    """
+    Send one email to a venue owner covering several new inquiries
+    
+    Args:
+        recipient_email: Venue owner's email
+        recipient_name: Venue owner's name
+        inquiries: List of inquiry_details dicts (see send_new_inquiry_notification_email)
+        pending_count: Inquiries still awaiting a reply
+    """
+    try:
+        message = html_message(
+            subject=f"{len(inquiries)} New Inquiries for Your Venues - StudySpace",
+            recipients=[recipient_email],
+            template_body={
+                "recipient_name": recipient_name,
+                "inquiries": inquiries,
+                "pending_count": pending_count
+            }
         )
         
-        await fm.send_message(message, template_name="new_inquiry_notification.html")
+        await send_message(message, template_name="inquiry_digest.html")
         return True
     except Exception as e:
-        print(f"Failed to send new inquiry notification email: {e}")
+        logger.error(f"Failed to send inquiry digest email: {e}")
         return False
 
 
@@ -263,17 +318,16 @@ async def send_otp_email(
         </html>
         """
         
-        message = MessageSchema(
+        message = html_message(
             subject=subject_map.get(otp_type, "Your OTP - StudySpace"),
             recipients=[recipient_email],
-            body=html_content,
-            subtype=MessageType.html
+            body=html_content
         )
         
-        await fm.send_message(message)
+        await send_message(message)
         return True
     except Exception as e:
-        print(f"Failed to send OTP email: {e}")
+        logger.error(f"Failed to send OTP email: {e}")
         return False
 
 
@@ -0,0 +1,153 @@
+"""
+Inquiry Service - Pending counters and owner notification digests
+Keeps per-owner pending-inquiry counts in memory so the inbox badge poll
+doesn't count rows every time, and coalesces new-inquiry emails per owner:
+the first inquiry opens a short window, later ones join it, and the owner
+gets a single email (or a digest) when the window closes.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.inquiry import Inquiry, InquiryStatus
+from app.services.email_service import send_new_inquiry_notification_email, send_inquiry_digest_email
+
+# Counts are re-read after this long, which also heals drift from writes
+# handled by other worker processes
+COUNTER_TTL_SECONDS = 300
+
+
+class PendingInquiryCounters:
+    """In-process pending-inquiry counts per owner, loaded lazily from the database"""
+
+    def __init__(self, ttl: float = COUNTER_TTL_SECONDS):
+        self.ttl = ttl
+        self._counts: Dict[str, int] = {}
+        self._loaded_at: Dict[str, float] = {}
+
+    async def get(self, db: AsyncSession, owner_id: str) -> int:
+        loaded = self._loaded_at.get(owner_id)
+        if loaded is None or time.monotonic() - loaded >= self.ttl:
+            result = await db.execute(
+                select(func.count(Inquiry.id)).where(
+                    and_(Inquiry.owner_id == owner_id, Inquiry.status == InquiryStatus.PENDING)
+                )
+            )
+            self._counts[owner_id] = result.scalar() or 0
+            self._loaded_at[owner_id] = time.monotonic()
+        return self._counts[owner_id]
+
+    def peek(self, owner_id: str) -> Optional[int]:
+        """Cached count without touching the database (None if not loaded)"""
+        return self._counts.get(owner_id) if owner_id in self._loaded_at else None
+
+    def adjust(self, owner_id: str, delta: int):
+        """Apply a change; owners not loaded yet pick it up on their first read"""
+        if owner_id in self._counts:
+            self._counts[owner_id] = max(self._counts[owner_id] + delta, 0)
+
+    def invalidate(self, owner_id: str):
+        self._loaded_at.pop(owner_id, None)
+
+
+pending_inquiry_counters = PendingInquiryCounters()
+
+
+class OwnerDigests:
+    """
+    Per-owner batching of new-inquiry emails.
+
+    Emails go out from background tasks, so creating an inquiry never waits
+    on SMTP. A window is flushed early once it holds max_items inquiries;
+    stop() flushes whatever is still waiting.
+    """
+
+    def __init__(
+        self,
+        window: float = settings.INQUIRY_DIGEST_WINDOW_SECONDS,
+        max_items: int = settings.INQUIRY_DIGEST_MAX_ITEMS,
+    ):
+        self.window = window
+        self.max_items = max_items
+        self.running = False
+        self._pending: Dict[str, dict] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._sending: set = set()
+        self.emails_sent = 0
+        self.inquiries_notified = 0
+
+    async def start(self):
+        self.running = True
+
+    async def stop(self):
+        self.running = False
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        owners = list(self._pending)
+        await asyncio.gather(*(self._send(owner_id) for owner_id in owners), *self._sending)
+
+    def add(self, owner_id: str, owner_email: str, owner_name: str, inquiry_details: dict) -> bool:
+        """Queue a notification. Returns False when not running (caller should send directly)."""
+        if not self.running:
+            return False
+        entry = self._pending.setdefault(owner_id, {"email": owner_email, "name": owner_name, "inquiries": []})
+        entry["inquiries"].append(inquiry_details)
+        if len(entry["inquiries"]) >= self.max_items:
+            timer = self._timers.pop(owner_id, None)
+            if timer:
+                timer.cancel()
+            self._spawn(self._send(owner_id))
+        elif owner_id not in self._timers:
+            self._timers[owner_id] = asyncio.create_task(self._flush_later(owner_id))
+        return True
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _flush_later(self, owner_id: str):
+        await asyncio.sleep(self.window)
+        self._timers.pop(owner_id, None)
+        await self._send(owner_id)
+
+    async def _send(self, owner_id: str):
+        entry = self._pending.pop(owner_id, None)
+        if not entry:
+            return
+        inquiries: List[dict] = entry["inquiries"]
+        if len(inquiries) == 1:
+            sent = await send_new_inquiry_notification_email(
+                recipient_email=entry["email"],
+                recipient_name=entry["name"],
+                inquiry_details=inquiries[0]
+            )
+        else:
+            pending = pending_inquiry_counters.peek(owner_id)
+            sent = await send_inquiry_digest_email(
+                recipient_email=entry["email"],
+                recipient_name=entry["name"],
+                inquiries=inquiries,
+                pending_count=max(pending or 0, len(inquiries))
+            )
+        if sent:
+            self.emails_sent += 1
+            self.inquiries_notified += len(inquiries)
+
+    def stats(self) -> dict:
+        return {
+            "owners_waiting": len(self._pending),
+            "inquiries_waiting": sum(len(e["inquiries"]) for e in self._pending.values()),
+            "emails_sent": self.emails_sent,
+            "inquiries_notified": self.inquiries_notified,
+            "sends_in_flight": len(self._sending),
+        }
+
+
+owner_digests = OwnerDigests()
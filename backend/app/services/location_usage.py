@@ -0,0 +1,216 @@
+"""
+Location Usage - Batched pick counters and decayed popularity for locations
+Picks are counted in memory and flushed as atomic increments, so a click
+costs no database write and concurrent picks can't lose updates.
+
+Popularity uses forward decay: a pick at time t adds
+2 ** ((t - epoch) / half_life) to `popularity_score`, where the epoch is
+stored per row in `popularity_epoch`. Rows sharing an epoch are scaled by
+the same factor as time passes, so sorting by the stored value ranks
+locations by exponentially decayed demand without rewriting them on
+every pick. The epoch moves forward every REBASE_HALF_LIVES half-lives;
+the first flush in a new period rescales all rows to it (rebase), so one
+pick never weighs more than 2 ** REBASE_HALF_LIVES whatever the half-life.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import update, select, bindparam, func, case, or_
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.models.location import Location
+
+logger = logging.getLogger(__name__)
+
+# Epochs are this origin plus whole rebase periods; rows without an epoch
+# predate rebasing and are relative to the origin itself
+POPULARITY_ORIGIN = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+REBASE_HALF_LIVES = 32
+
+
+def _half_life_seconds() -> float:
+    return settings.POPULARITY_HALF_LIFE_DAYS * 86400
+
+
+def popularity_epoch(at: Optional[float] = None) -> float:
+    """Start of the rebase period containing unix time `at` (the same on every worker)"""
+    at = time.time() if at is None else at
+    period = REBASE_HALF_LIVES * _half_life_seconds()
+    return POPULARITY_ORIGIN + ((at - POPULARITY_ORIGIN) // period) * period
+
+
+def decay_factor(from_epoch: float, to_epoch: float) -> float:
+    """Multiplier that re-expresses a score kept relative to from_epoch relative to to_epoch"""
+    # Capped for epochs ahead of to_epoch (only after the half-life is shortened)
+    return 2.0 ** min((from_epoch - to_epoch) / _half_life_seconds(), REBASE_HALF_LIVES)
+
+
+def popularity_weight(at: Optional[float] = None, epoch: Optional[float] = None) -> float:
+    """Score contributed by one pick at unix time `at` (default now), relative to its epoch"""
+    at = time.time() if at is None else at
+    epoch = popularity_epoch(at) if epoch is None else epoch
+    return 2.0 ** ((at - epoch) / _half_life_seconds())
+
+
+async def rebase_popularity(db, epoch: float) -> int:
+    """
+    Rescale every location's score to `epoch`. Each UPDATE only matches rows
+    still on an older epoch, so workers racing to rebase can't apply it twice.
+    Returns the number of rows moved.
+    """
+    table = Location.__table__
+    row_epoch = func.coalesce(table.c.popularity_epoch, POPULARITY_ORIGIN)
+    result = await db.execute(select(row_epoch).where(row_epoch != epoch).distinct())
+    moved = 0
+    for old_epoch in result.scalars().all():
+        result = await db.execute(
+            update(table)
+            .where(row_epoch == old_epoch)
+            .values(
+                popularity_score=table.c.popularity_score * decay_factor(old_epoch, epoch),
+                popularity_epoch=epoch,
+            )
+        )
+        moved += result.rowcount or 0
+    return moved
+
+
+class LocationUsageCounters:
+    """
+    Accumulates picks per location and flushes them every `interval`
+    seconds (or as soon as `max_pending` locations are waiting) as one
+    executemany UPDATE. stop() flushes what is left.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.LOCATION_USAGE_FLUSH_SECONDS,
+        max_pending: int = settings.LOCATION_USAGE_MAX_PENDING,
+    ):
+        self.interval = interval
+        self.max_pending = max_pending
+        # location id -> (picks, weight relative to _pending_epoch)
+        self._pending: Dict[str, Tuple[int, float]] = {}
+        self._pending_epoch = popularity_epoch()
+        self._rebased_epoch: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self.recorded = 0
+        self.flushes = 0
+        self.locations_flushed = 0
+
+    def record(self, location_id: str):
+        now = time.time()
+        self._add(location_id, 1, popularity_weight(now), popularity_epoch(now))
+        self.recorded += 1
+        if len(self._pending) >= self.max_pending:
+            self._wake.set()
+
+    def _add(self, location_id: str, picks: int, weight: float, epoch: float):
+        if epoch != self._pending_epoch:
+            # A rebase period started (or a retried batch is older): move what's
+            # waiting to the later epoch
+            target = max(epoch, self._pending_epoch)
+            if target != self._pending_epoch:
+                factor = decay_factor(self._pending_epoch, target)
+                self._pending = {k: (c, w * factor) for k, (c, w) in self._pending.items()}
+                self._pending_epoch = target
+            weight *= decay_factor(epoch, target)
+        count, pending_weight = self._pending.get(location_id, (0, 0.0))
+        self._pending[location_id] = (count + picks, pending_weight + weight)
+
+    def pending(self, location_id: str) -> int:
+        return self._pending.get(location_id, (0, 0.0))[0]
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Location usage flush failed: {e}")
+
+    async def flush(self) -> int:
+        """Write pending picks; returns the number of locations updated"""
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            batch_epoch = self._pending_epoch
+            if not batch:
+                return 0
+            epoch = popularity_epoch()
+            factor = decay_factor(batch_epoch, epoch)
+            table = Location.__table__
+            # Rows on another epoch (a worker whose clock is behind at a period
+            # boundary) keep their score; their picks are still counted.
+            # New rows have no epoch and a zero score, so they take this one.
+            current = or_(table.c.popularity_epoch == None, table.c.popularity_epoch == epoch)
+            # Core executemany: one prepared UPDATE, one round trip per batch
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("location_id"))
+                .values(
+                    usage_count=func.coalesce(table.c.usage_count, 0) + bindparam("picks"),
+                    popularity_score=case(
+                        (current, func.coalesce(table.c.popularity_score, 0.0) + bindparam("weight")),
+                        else_=table.c.popularity_score,
+                    ),
+                    popularity_epoch=case((current, epoch), else_=table.c.popularity_epoch),
+                )
+            )
+            params = [
+                {"location_id": location_id, "picks": count, "weight": weight * factor}
+                for location_id, (count, weight) in batch.items()
+            ]
+            try:
+                async with AsyncSessionLocal() as db:
+                    if self._rebased_epoch != epoch:
+                        moved = await rebase_popularity(db, epoch)
+                        if moved:
+                            logger.info(f"📍 Rebased popularity of {moved} locations")
+                    conn = await db.connection()
+                    await conn.execute(stmt, params)
+                    await db.commit()
+                self._rebased_epoch = epoch
+            except Exception:
+                # Put the picks back so the next flush retries them
+                for location_id, (count, weight) in batch.items():
+                    self._add(location_id, count, weight, batch_epoch)
+                raise
+            self.flushes += 1
+            self.locations_flushed += len(batch)
+            return len(batch)
+
+    def stats(self) -> dict:
+        return {
+            "recorded": self.recorded,
+            "locations_waiting": len(self._pending),
+            "flushes": self.flushes,
+            "locations_flushed": self.locations_flushed,
+        }
+
+
+location_usage = LocationUsageCounters()
@@ -0,0 +1,92 @@
+"""
+Notification Service - Unread counters and real-time push
+Keeps per-user unread counts for notifications and messages in memory and
+pushes new events to the user's WebSocket channel, so clients don't have to
+poll full histories.
+"""
+
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.socket_manager import user_channels
+
+# Counters are re-read from the database after this long, which also heals
+# drift from writes handled by other worker processes
+COUNTER_TTL_SECONDS = 300
+
+
+class UnreadCounters:
+    """In-process unread counts per user, loaded lazily from the database"""
+
+    def __init__(self, ttl: float = COUNTER_TTL_SECONDS):
+        self.ttl = ttl
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._loaded_at: Dict[str, float] = {}
+
+    def _fresh(self, user_id: str) -> bool:
+        loaded = self._loaded_at.get(user_id)
+        return loaded is not None and time.monotonic() - loaded < self.ttl
+
+    async def get(self, db: AsyncSession, user_id: str) -> Dict[str, int]:
+        if not self._fresh(user_id):
+            await self._load(db, user_id)
+        return dict(self._counts[user_id])
+
+    async def _load(self, db: AsyncSession, user_id: str):
+        from app.models.notification import Notification
+        from app.models.message import Message
+
+        notif_result = await db.execute(
+            select(func.count(Notification.id)).where(
+                and_(Notification.user_id == user_id, Notification.read == False)
+            )
+        )
+        msg_result = await db.execute(
+            select(func.count(Message.id)).where(
+                and_(Message.receiver_id == user_id, Message.read == False)
+            )
+        )
+        self._counts[user_id] = {
+            "notifications": notif_result.scalar() or 0,
+            "messages": msg_result.scalar() or 0,
+        }
+        self._loaded_at[user_id] = time.monotonic()
+
+    def adjust(self, user_id: str, kind: str, delta: int):
+        """Apply a change; users not loaded yet pick it up on their first read"""
+        counts = self._counts.get(user_id)
+        if counts is not None:
+            counts[kind] = max(counts[kind] + delta, 0)
+
+    def invalidate(self, user_id: str):
+        self._loaded_at.pop(user_id, None)
+
+
+unread_counters = UnreadCounters()
+
+
+async def push_event(db: AsyncSession, user_id: str, event_type: str, payload: Optional[dict] = None):
+    """Send an event with fresh unread counts to the user's open channels"""
+    if not user_channels.is_connected(user_id):
+        return
+    await user_channels.send_to_user(user_id, {
+        "type": event_type,
+        "payload": payload or {},
+        "unread": await unread_counters.get(db, user_id),
+    })
+
+
+def serialize_notification(n) -> dict:
+    return {
+        "id": n.id,
+        "user_id": n.user_id,
+        "title": n.title,
+        "message": n.message,
+        "read": n.read,
+        "date": n.date.isoformat() if n.date else "",
+        "notification_type": n.type,
+        "message_id": n.message_id,
+    }
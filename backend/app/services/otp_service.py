@@ -3,18 +3,19 @@ OTP Service - Handles OTP generation, storage, verification
 Supports both Email and SMS delivery
 """
 
+import logging
 import random
 import string
-from datetime import datetime, timedelta, timezone
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_
 
-from app.models.otp import OTP, PasswordReset
 from app.models.user import User
+from app.services.otp_store import otp_store, OTPCheck
 from app.services.email_service import send_otp_email, send_password_reset_email
 
+logger = logging.getLogger(__name__)
+
 
 def generate_otp(length: int = 6) -> str:
     """Generate a random numeric OTP"""
@@ -38,8 +39,8 @@ async def send_otp_sms(phone: str, otp_code: str, otp_type: str = "verification"
     
     For now, this returns True and logs to console (demo mode)
     """
-    print(f"📱 SMS OTP: {otp_code} to {phone} (Type: {otp_type})")
-    print(f"⚠️  SMS service not configured. Configure Twilio/MSG91 in production.")
+    logger.info(f"📱 SMS OTP to {phone} (Type: {otp_type})")
+    logger.warning(f"⚠️  SMS service not configured. Configure Twilio/MSG91 in production.")
     
     # In production, integrate with SMS provider:
     # try:
@@ -52,7 +53,7 @@ async def send_otp_sms(phone: str, otp_code: str, otp_type: str = "verification"
     #     # )
     #     return True
     # except Exception as e:
-    #     print(f"Failed to send SMS: {e}")
+    #     logger.error(f"Failed to send SMS: {e}")
     #     return False
     
     return True  # Demo mode - always succeeds
@@ -71,34 +72,9 @@ async def create_otp(
     Returns:
         tuple: (otp_code, expires_in_seconds)
     """
-    # Invalidate any existing OTPs for this email/type
-    result = await db.execute(
-        select(OTP).where(
-            and_(
-                OTP.user_email == email,
-                OTP.otp_type == otp_type,
-                OTP.is_verified == False
-            )
-        )
-    )
-    existing_otps = result.scalars().all()
-    for otp in existing_otps:
-        otp.is_verified = True  # Mark as used
-    
-    # Generate new OTP
+    # Generate new OTP; replaces any earlier code for this email/type
     otp_code = generate_otp()
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=expires_in_minutes)
-    
-    # Store in database
-    new_otp = OTP(
-        user_email=email,
-        user_phone=phone,
-        otp_code=otp_code,
-        otp_type=otp_type,
-        expires_at=expires_at
-    )
-    db.add(new_otp)
-    await db.commit()
+    await otp_store.issue(db, email, otp_type, otp_code, expires_in_minutes * 60, phone=phone)
     
     # Get user name if exists
     user_result = await db.execute(select(User).where(User.email == email))
@@ -108,7 +84,7 @@ async def create_otp(
     # Send OTP via email only
     email_sent = await send_otp_email(email, user_name, otp_code, otp_type)
     
-    print(f"✅ OTP created: {otp_code} for {email} (Email sent: {email_sent})")
+    logger.info(f"✅ OTP created for {email} (Email sent: {email_sent})")
     
     return otp_code, expires_in_minutes * 60
 
@@ -125,36 +101,19 @@ async def verify_otp(
     Returns:
         tuple: (success: bool, message: str)
     """
-    result = await db.execute(
-        select(OTP).where(
-            and_(
-                OTP.user_email == email,
-                OTP.otp_type == otp_type,
-                OTP.is_verified == False
-            )
-        ).order_by(OTP.created_at.desc())
-    )
-    otp = result.scalars().first()
+    check = await otp_store.check(db, email, otp_type, otp_code)
     
-    if not otp:
+    if check.status == OTPCheck.NOT_FOUND:
         return False, "No OTP found. Please request a new one."
     
-    # Increment attempts
-    otp.attempts += 1
-    await db.commit()
-    
-    if otp.attempts > 5:
+    if check.status == OTPCheck.TOO_MANY_ATTEMPTS:
         return False, "Too many attempts. Please request a new OTP."
     
-    if otp.is_expired():
+    if check.status == OTPCheck.EXPIRED:
         return False, "OTP has expired. Please request a new one."
     
-    if otp.otp_code != otp_code:
-        return False, f"Invalid OTP. {5 - otp.attempts} attempts remaining."
-    
-    # Mark as verified
-    otp.is_verified = True
-    await db.commit()
+    if check.status == OTPCheck.INVALID:
+        return False, f"Invalid OTP. {check.attempts_left} attempts remaining."
     
     return True, "OTP verified successfully"
 
@@ -186,7 +145,7 @@ async def create_password_reset(
         expires_in_minutes=10
     )
     
-    print(f"🔐 Password reset OTP: {otp_code} for {email}")
+    logger.info(f"🔐 Password reset OTP issued for {email}")
     
     return True, "Password reset code sent to your email.", expires_in
 
@@ -203,27 +162,21 @@ async def reset_password_with_otp(
     Returns:
         tuple: (success: bool, message: str)
     """
-    from app.core.security import get_password_hash
-    
-    # Find OTP - accept both verified and unverified for password reset
-    # (it might be verified from the OTP modal already)
-    result = await db.execute(
-        select(OTP).where(
-            and_(
-                OTP.user_email == email,
-                OTP.otp_code == otp_code,
-                OTP.otp_type == 'password_reset'
-            )
-        ).order_by(OTP.created_at.desc())
-    )
-    otp = result.scalars().first()
+    from app.core.security import password_hasher
     
-    if not otp:
-        return False, "Invalid or expired reset code."
+    # Accept both verified and unverified codes for password reset
+    # (it might be verified from the OTP modal already); redeeming uses it up
+    check = await otp_store.redeem(db, email, 'password_reset', otp_code)
     
-    if otp.is_expired():
+    if check.status == OTPCheck.EXPIRED:
         return False, "Reset code has expired. Please request a new one."
     
+    if check.status == OTPCheck.TOO_MANY_ATTEMPTS:
+        return False, "Too many attempts. Please request a new reset code."
+    
+    if not check.ok:
+        return False, "Invalid or expired reset code."
+    
     # Get user
     user_result = await db.execute(select(User).where(User.email == email))
     user = user_result.scalars().first()
@@ -232,11 +185,10 @@ async def reset_password_with_otp(
         return False, "User not found."
     
     # Update password
-    user.hashed_password = get_password_hash(new_password)
-    otp.is_verified = True  # Mark as used
+    user.hashed_password = await password_hasher.hash(new_password)
     
     await db.commit()
     
-    print(f"✅ Password reset successful for {email}")
+    logger.info(f"✅ Password reset successful for {email}")
     
     return True, "Password reset successful. You can now log in with your new password."
@@ -0,0 +1,266 @@
+"""
+OTP Store - Where one-time codes live between sending and checking
+Codes are stored as HMACs (never in plain text), expire on their own and
+every guess is counted atomically, so concurrent requests can't get more
+than OTP_MAX_ATTEMPTS tries at a code.
+
+Backends:
+- DatabaseOTPStore: the `otps` table; each check is one conditional UPDATE.
+  Shared by all workers and survives restarts. Expired rows are purged by
+  the background purge job.
+- MemoryOTPStore: a dict with TTLs for single-process deployments and tests.
+"""
+
+import asyncio
+import enum
+import hashlib
+import hmac
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import update, delete, select, and_, or_, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.models.otp import OTP
+
+logger = logging.getLogger(__name__)
+
+
+class OTPCheck(str, enum.Enum):
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    EXPIRED = "expired"
+    TOO_MANY_ATTEMPTS = "too_many_attempts"
+    INVALID = "invalid"
+
+
+@dataclass
+class OTPCheckResult:
+    status: OTPCheck
+    attempts_left: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OTPCheck.OK
+
+
+def hash_code(email: str, otp_type: str, code: str) -> str:
+    """Keyed hash of a code; bound to the email and purpose so hashes can't be replayed"""
+    message = f"{email.lower()}:{otp_type}:{code}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+class OTPStore(ABC):
+    """
+    Interface for OTP backends.
+
+    check() is for verification: it marks the code verified on success.
+    redeem() is for the final step that uses the code (e.g. password reset):
+    it accepts verified or unverified codes and invalidates them.
+    Both count the attempt before comparing, except that redeeming the code
+    check() already verified is not counted (it may have used the last try).
+    """
+
+    max_attempts = settings.OTP_MAX_ATTEMPTS
+
+    @abstractmethod
+    async def issue(self, db: AsyncSession, email: str, otp_type: str, code: str, ttl_seconds: int, phone: Optional[str] = None):
+        """Store a new code, replacing any earlier one for this email and purpose"""
+
+    @abstractmethod
+    async def check(self, db: AsyncSession, email: str, otp_type: str, code: str) -> OTPCheckResult:
+        """Verify a code and mark it verified"""
+
+    @abstractmethod
+    async def redeem(self, db: AsyncSession, email: str, otp_type: str, code: str) -> OTPCheckResult:
+        """Accept a verified or unverified code and invalidate it"""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """Drop expired codes; returns how many were removed"""
+
+
+class MemoryOTPStore(OTPStore):
+    @dataclass
+    class _Entry:
+        code_hash: str
+        expires_at: float
+        attempts: int = 0
+        verified: bool = False
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], "MemoryOTPStore._Entry"] = {}
+
+    async def issue(self, db, email, otp_type, code, ttl_seconds, phone=None):
+        self._entries[(email.lower(), otp_type)] = self._Entry(
+            code_hash=hash_code(email, otp_type, code),
+            expires_at=time.monotonic() + ttl_seconds,
+        )
+
+    def _attempt(self, email: str, otp_type: str, code: str, allow_verified: bool) -> OTPCheckResult:
+        # No awaits in here: runs atomically on the event loop
+        key = (email.lower(), otp_type)
+        entry = self._entries.get(key)
+        if entry is None or (entry.verified and not allow_verified):
+            return OTPCheckResult(OTPCheck.NOT_FOUND)
+        if time.monotonic() >= entry.expires_at:
+            del self._entries[key]
+            return OTPCheckResult(OTPCheck.EXPIRED)
+        if allow_verified and entry.verified and hmac.compare_digest(entry.code_hash, hash_code(email, otp_type, code)):
+            # Redeeming the code that was already verified isn't a guess: don't count or cap it
+            return OTPCheckResult(OTPCheck.OK, self.max_attempts - entry.attempts)
+        if entry.attempts >= self.max_attempts:
+            return OTPCheckResult(OTPCheck.TOO_MANY_ATTEMPTS)
+        entry.attempts += 1
+        if not hmac.compare_digest(entry.code_hash, hash_code(email, otp_type, code)):
+            return OTPCheckResult(OTPCheck.INVALID, self.max_attempts - entry.attempts)
+        return OTPCheckResult(OTPCheck.OK, self.max_attempts - entry.attempts)
+
+    async def check(self, db, email, otp_type, code):
+        result = self._attempt(email, otp_type, code, allow_verified=False)
+        if result.ok:
+            self._entries[(email.lower(), otp_type)].verified = True
+        return result
+
+    async def redeem(self, db, email, otp_type, code):
+        result = self._attempt(email, otp_type, code, allow_verified=True)
+        if result.ok:
+            del self._entries[(email.lower(), otp_type)]
+        return result
+
+    async def purge_expired(self) -> int:
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+
+class DatabaseOTPStore(OTPStore):
+    async def issue(self, db, email, otp_type, code, ttl_seconds, phone=None):
+        await db.execute(delete(OTP).where(and_(OTP.user_email == email, OTP.otp_type == otp_type)))
+        db.add(OTP(
+            user_email=email,
+            user_phone=phone,
+            otp_code=hash_code(email, otp_type, code),
+            otp_type=otp_type,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds),
+        ))
+        await db.commit()
+
+    async def _attempt(self, db: AsyncSession, email: str, otp_type: str, code: str, redeem: bool) -> OTPCheckResult:
+        now = datetime.now(timezone.utc)
+        matches = OTP.otp_code == hash_code(email, otp_type, code)
+        conditions = [
+            OTP.user_email == email,
+            OTP.otp_type == otp_type,
+            OTP.expires_at > now,
+        ]
+        if redeem:
+            # Redeeming the code that was already verified isn't a guess: don't count or cap it
+            confirmed = and_(OTP.is_verified == True, matches)
+            conditions.append(or_(OTP.attempts < self.max_attempts, confirmed))
+            values = {
+                "attempts": case((confirmed, OTP.attempts), else_=OTP.attempts + 1),
+                # A matching redeem expires the code immediately (single use)
+                "expires_at": case((matches, now), else_=OTP.expires_at),
+            }
+        else:
+            conditions += [OTP.attempts < self.max_attempts, OTP.is_verified == False]
+            values = {"attempts": OTP.attempts + 1, "is_verified": matches}
+
+        # Counting and comparing happen in the same statement, under the row lock
+        stmt = (
+            update(OTP).where(*conditions).values(**values)
+            .returning(OTP.id, OTP.attempts, matches)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await db.execute(stmt)).first()
+        await db.commit()
+
+        if row is not None:
+            attempts_left = self.max_attempts - row[1]
+            return OTPCheckResult(OTPCheck.OK if row[2] else OTPCheck.INVALID, attempts_left)
+        return await self._failure_reason(db, email, otp_type, now, redeem)
+
+    async def _failure_reason(self, db, email, otp_type, now, redeem) -> OTPCheckResult:
+        """Work out why nothing matched (only used to pick an error message)"""
+        query = select(OTP.expires_at, OTP.attempts, OTP.is_verified).where(
+            and_(OTP.user_email == email, OTP.otp_type == otp_type)
+        )
+        existing = (await db.execute(query)).first()
+        if existing is None or (existing.is_verified and not redeem):
+            return OTPCheckResult(OTPCheck.NOT_FOUND)
+        expires_at = existing.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at <= now:
+            return OTPCheckResult(OTPCheck.EXPIRED)
+        return OTPCheckResult(OTPCheck.TOO_MANY_ATTEMPTS)
+
+    async def check(self, db, email, otp_type, code):
+        return await self._attempt(db, email, otp_type, code, redeem=False)
+
+    async def redeem(self, db, email, otp_type, code):
+        return await self._attempt(db, email, otp_type, code, redeem=True)
+
+    async def purge_expired(self) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(OTP).where(OTP.expires_at <= datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return result.rowcount or 0
+
+
+def _make_store() -> OTPStore:
+    if settings.OTP_STORE_BACKEND == "memory":
+        return MemoryOTPStore()
+    return DatabaseOTPStore()
+
+
+otp_store = _make_store()
+
+
+class OTPPurgeJob:
+    """Periodically removes expired codes (started with the app)"""
+
+    def __init__(self, store: OTPStore, interval: float = settings.OTP_PURGE_INTERVAL_SECONDS):
+        self.store = store
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.purged = 0
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                removed = await self.store.purge_expired()
+                self.purged += removed
+                if removed:
+                    logger.info(f"🧹 Purged {removed} expired OTPs")
+            except Exception as e:
+                logger.error(f"❌ OTP purge failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+otp_purge_job = OTPPurgeJob(otp_store)
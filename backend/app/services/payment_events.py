@@ -0,0 +1,405 @@
+"""
+Payment Events - Webhook inbox and background applier
+Gateway webhooks are verified, stored once per idempotency key in the
+payment_events table and acknowledged immediately. A background worker
+applies stored events in batches to bookings, payment transactions and
+venue subscriptions, so checkout never waits on the gateway and
+redelivered events are no-ops.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.models.accommodation import Accommodation
+from app.models.booking import Booking, PaymentStatus
+from app.models.payment_event import PaymentEvent, PaymentEventStatus
+from app.models.payment_transaction import PaymentTransaction, PaymentMethod, PaymentGateway, PaymentType
+from app.models.reading_room import ReadingRoom, Cabin, ListingStatus
+from app.models.user import User
+from app.services.email_service import send_booking_confirmation_email
+
+logger = logging.getLogger(__name__)
+
+PAID_EVENTS = {"payment.captured", "order.paid"}
+REFUND_EVENTS = {"refund.processed"}
+
+GATEWAY_METHODS = {
+    "card": PaymentMethod.CARD,
+    "upi": PaymentMethod.UPI,
+    "netbanking": PaymentMethod.NET_BANKING,
+    "wallet": PaymentMethod.WALLET,
+}
+
+
+def verify_webhook_signature(body: bytes, signature: str) -> bool:
+    """X-Razorpay-Signature is an HMAC-SHA256 of the raw body with the webhook secret"""
+    if not settings.RAZORPAY_WEBHOOK_SECRET or not signature:
+        return False
+    expected = hmac.new(settings.RAZORPAY_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def _entity(body: dict, name: str) -> dict:
+    return ((body.get("payload") or {}).get(name) or {}).get("entity") or {}
+
+
+def _notes(body: dict) -> dict:
+    """Order notes are copied onto the payment; fall back to the order entity"""
+    return _entity(body, "payment").get("notes") or _entity(body, "order").get("notes") or {}
+
+
+# Keys stored recently by this process; repeats are answered without a query
+_recent_keys: "OrderedDict[str, None]" = OrderedDict()
+RECENT_KEYS_LIMIT = 10000
+
+
+async def store_event(db: AsyncSession, body: bytes, event_id: Optional[str]) -> bool:
+    """Insert a webhook delivery into the inbox. Returns False for duplicates."""
+    key = event_id or hashlib.sha256(body).hexdigest()
+    if key in _recent_keys:
+        return False
+
+    data = json.loads(body)
+    payment = _entity(data, "payment")
+    values = {
+        "idempotency_key": key,
+        "event_type": data.get("event", "unknown"),
+        "order_id": payment.get("order_id") or _entity(data, "order").get("id"),
+        "payment_id": payment.get("id"),
+        "payload": body.decode(),
+    }
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    # Column defaults (id, status, received_at) apply to Core inserts too
+    stmt = insert(PaymentEvent).values(**values).on_conflict_do_nothing(index_elements=["idempotency_key"])
+    result = await db.execute(stmt)
+    await db.commit()
+
+    _recent_keys[key] = None
+    if len(_recent_keys) > RECENT_KEYS_LIMIT:
+        _recent_keys.popitem(last=False)
+    return result.rowcount == 1
+
+
+async def mark_booking_paid(db: AsyncSession, booking_id: str, payment_id: str, order_id: Optional[str] = None) -> bool:
+    """
+    Flip a pending booking to PAID. The conditional UPDATE makes this safe
+    to race between the verify endpoint and the webhook worker: exactly one
+    of them gets True (and sends the confirmation email).
+    With `order_id`, only the booking that order was created for (create-order
+    stores it in transaction_id) is changed.
+    """
+    conditions = [Booking.id == booking_id, Booking.payment_status == PaymentStatus.PENDING]
+    if order_id is not None:
+        conditions.append(Booking.transaction_id == order_id)
+    result = await db.execute(
+        update(Booking)
+        .where(*conditions)
+        .values(payment_status=PaymentStatus.PAID, transaction_id=payment_id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def booking_email_details(db: AsyncSession, booking: Booking, payment_id: str) -> dict:
+    """Venue details for the booking confirmation email"""
+    venue_name = "Venue"
+    venue_address = ""
+    cabin_number = None
+    booking_type = "booking"
+
+    if booking.cabin_id:
+        cabin_result = await db.execute(
+            select(Cabin.number, ReadingRoom.name, ReadingRoom.address)
+            .outerjoin(ReadingRoom, ReadingRoom.id == Cabin.reading_room_id)
+            .where(Cabin.id == booking.cabin_id)
+        )
+        cabin_row = cabin_result.first()
+        if cabin_row:
+            cabin_number = cabin_row.number
+            if cabin_row.name:
+                venue_name = cabin_row.name
+                venue_address = cabin_row.address or ""
+        booking_type = "cabin"
+    elif booking.accommodation_id:
+        acc_result = await db.execute(
+            select(Accommodation.name, Accommodation.address).where(Accommodation.id == booking.accommodation_id)
+        )
+        acc_row = acc_result.first()
+        if acc_row:
+            venue_name = acc_row.name
+            venue_address = acc_row.address or ""
+        booking_type = "accommodation"
+
+    return {
+        "venue_name": venue_name,
+        "booking_type": booking_type,
+        "start_date": booking.start_date.strftime("%d %B %Y") if booking.start_date else "N/A",
+        "end_date": booking.end_date.strftime("%d %B %Y") if booking.end_date else "N/A",
+        "amount": f"{booking.amount:,.2f}",
+        "transaction_id": payment_id,
+        "venue_address": venue_address,
+        "cabin_number": cabin_number
+    }
+
+
+class PaymentEventProcessor:
+    """
+    Applies stored payment events in batches.
+
+    Wakes up when the webhook endpoint stores an event (and every
+    poll_interval to catch events from other workers or earlier failures).
+    Each batch is one transaction; if it fails, its events are retried one
+    by one so a single bad event can't hold the others back. Events that
+    keep failing are marked FAILED after max_attempts.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.PAYMENT_EVENT_BATCH_SIZE,
+        poll_interval: float = settings.PAYMENT_EVENT_POLL_SECONDS,
+        max_attempts: int = settings.PAYMENT_EVENT_MAX_ATTEMPTS,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.applied = 0
+        self.ignored = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self):
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                while await self.process_pending() == self.batch_size:
+                    pass
+            except Exception as e:
+                logger.exception(f"❌ Payment event worker error: {e}")
+
+    async def process_pending(self) -> int:
+        """Apply up to batch_size stored events; returns how many were picked up"""
+        async with AsyncSessionLocal() as db:
+            query = (
+                select(PaymentEvent.id)
+                .where(PaymentEvent.status == PaymentEventStatus.RECEIVED)
+                .order_by(PaymentEvent.received_at)
+                .limit(self.batch_size)
+            )
+            event_ids = list((await db.execute(query)).scalars().all())
+        if not event_ids:
+            return 0
+
+        try:
+            await self._apply_batch(event_ids)
+        except Exception as e:
+            logger.warning(f"⚠️ Payment event batch failed ({e}); retrying events individually")
+            for event_id in event_ids:
+                try:
+                    await self._apply_batch([event_id])
+                except Exception as event_error:
+                    await self._record_failure(event_id, str(event_error))
+        return len(event_ids)
+
+    async def _apply_batch(self, event_ids: List[str]):
+        paid_now: List[Tuple[str, str]] = []
+        async with AsyncSessionLocal() as db:
+            query = select(PaymentEvent).where(
+                PaymentEvent.id.in_(event_ids), PaymentEvent.status == PaymentEventStatus.RECEIVED
+            ).order_by(PaymentEvent.received_at)
+            if db.bind.dialect.name == "postgresql":
+                # Another worker process may be on the same rows
+                query = query.with_for_update(skip_locked=True)
+            events = (await db.execute(query)).scalars().all()
+            if not events:
+                return
+            bodies = [json.loads(event.payload) for event in events]
+
+            # Everything the batch touches, loaded up front
+            booking_ids = {_notes(b).get("booking_id") for b in bodies} - {None}
+            payment_ids = {_entity(b, "payment").get("id") for b in bodies} - {None}
+            bookings: Dict[str, Any] = {}
+            if booking_ids or payment_ids:
+                rows = await db.execute(
+                    select(Booking.id, Booking.user_id, Booking.transaction_id).where(
+                        Booking.id.in_(booking_ids) | Booking.transaction_id.in_(payment_ids)
+                    )
+                )
+                for row in rows:
+                    bookings[row.id] = row
+                    if row.transaction_id:
+                        bookings[f"txn:{row.transaction_id}"] = row
+            gateway_ids = payment_ids | ({_entity(b, "refund").get("id") for b in bodies} - {None})
+            recorded: Set[str] = set()
+            if gateway_ids:
+                recorded = set((await db.execute(
+                    select(PaymentTransaction.gateway_transaction_id)
+                    .where(PaymentTransaction.gateway_transaction_id.in_(gateway_ids))
+                )).scalars().all())
+
+            for event, body in zip(events, bodies):
+                event.attempts += 1
+                outcome = await self._apply_event(db, body, bookings, recorded, paid_now)
+                event.status = outcome
+                event.processed_at = datetime.utcnow()
+                if outcome == PaymentEventStatus.APPLIED:
+                    self.applied += 1
+                else:
+                    self.ignored += 1
+            await db.commit()
+        self.batches += 1
+
+        if paid_now:
+            await self._send_confirmations(paid_now)
+
+    async def _apply_event(self, db, body: dict, bookings: dict, recorded: Set[str], paid_now: list) -> PaymentEventStatus:
+        event_type = body.get("event")
+        payment = _entity(body, "payment")
+        notes = _notes(body)
+        payment_id = payment.get("id")
+        booking = bookings.get(notes.get("booking_id")) or bookings.get(f"txn:{payment_id}")
+        applied = False
+
+        if event_type in PAID_EVENTS and payment_id:
+            if booking is not None:
+                if await mark_booking_paid(db, booking.id, payment_id):
+                    paid_now.append((booking.id, payment_id))
+                if payment_id not in recorded:
+                    db.add(PaymentTransaction(
+                        booking_id=booking.id,
+                        user_id=booking.user_id,
+                        payment_type=PaymentType.INITIAL,
+                        method=GATEWAY_METHODS.get(payment.get("method"), PaymentMethod.CARD),
+                        gateway=PaymentGateway.RAZORPAY,
+                        amount=payment.get("amount", 0) / 100,
+                        gateway_transaction_id=payment_id,
+                    ))
+                    recorded.add(payment_id)
+                applied = True
+            if notes.get("venue_id") and notes.get("subscription_plan_id"):
+                applied = await self._apply_venue_payment(db, notes, payment_id) or applied
+
+        elif event_type in REFUND_EVENTS:
+            refund = _entity(body, "refund")
+            if booking is not None and refund.get("id") and refund["id"] not in recorded:
+                db.add(PaymentTransaction(
+                    booking_id=booking.id,
+                    user_id=booking.user_id,
+                    payment_type=PaymentType.REFUND,
+                    method=GATEWAY_METHODS.get(payment.get("method"), PaymentMethod.CARD),
+                    gateway=PaymentGateway.RAZORPAY,
+                    amount=-refund.get("amount", 0) / 100,
+                    gateway_transaction_id=refund["id"],
+                    description="Refund via payment gateway",
+                ))
+                recorded.add(refund["id"])
+                if payment.get("amount") and payment.get("amount_refunded", 0) >= payment["amount"]:
+                    await db.execute(
+                        update(Booking).where(Booking.id == booking.id)
+                        .values(payment_status=PaymentStatus.REFUNDED)
+                        .execution_options(synchronize_session=False)
+                    )
+                applied = True
+
+        return PaymentEventStatus.APPLIED if applied else PaymentEventStatus.IGNORED
+
+    async def _apply_venue_payment(self, db, notes: dict, payment_id: str) -> bool:
+        """Submit a paid venue listing for approval (same change as /venue-payments/verify)"""
+        model = ReadingRoom if notes.get("venue_type") == "reading_room" else Accommodation
+        # Accommodation.payment_date is a string column
+        paid_at = datetime.utcnow() if model is ReadingRoom else datetime.utcnow().isoformat()
+        result = await db.execute(
+            update(model)
+            .where(
+                model.id == notes["venue_id"],
+                model.status.in_([ListingStatus.DRAFT, ListingStatus.REJECTED])
+            )
+            .values(
+                status=ListingStatus.VERIFICATION_PENDING,
+                subscription_plan_id=notes["subscription_plan_id"],
+                payment_id=payment_id,
+                payment_date=paid_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def _send_confirmations(self, paid: List[Tuple[str, str]]):
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(Booking, User.email, User.name)
+                .join(User, User.id == Booking.user_id)
+                .where(Booking.id.in_([booking_id for booking_id, _ in paid]))
+            )).all()
+            payment_ids = dict(paid)
+            emails = [
+                (email, name, await booking_email_details(db, booking, payment_ids[booking.id]))
+                for booking, email, name in rows if email
+            ]
+        # Connection is back in the pool before the SMTP round trips
+        for email, name, details in emails:
+            await send_booking_confirmation_email(recipient_email=email, recipient_name=name, booking_details=details)
+
+    async def _record_failure(self, event_id: str, error: str):
+        async with AsyncSessionLocal() as db:
+            event = await db.get(PaymentEvent, event_id)
+            if event is None:
+                return
+            event.attempts += 1
+            event.last_error = error[:1000]
+            if event.attempts >= self.max_attempts:
+                event.status = PaymentEventStatus.FAILED
+                self.failed += 1
+                logger.error(f"❌ Payment event {event.idempotency_key} ({event.event_type}) failed: {error}")
+            await db.commit()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "applied": self.applied,
+            "ignored": self.ignored,
+            "failed": self.failed,
+        }
+
+
+payment_event_processor = PaymentEventProcessor()
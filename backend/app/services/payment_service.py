@@ -1,145 +1,351 @@
-import razorpay
+import logging
+import asyncio
 import hmac
 import hashlib
+import random
+import time
 from typing import Dict, Any, Optional
 from fastapi import HTTPException
+import httpx
 import os
 
+from app.core.config import settings
+from app.core.tracing import span, KIND_CLIENT
+
+logger = logging.getLogger(__name__)
+
+# Failures that mean the gateway is unhealthy (as opposed to a bad request)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """
+    Stops calling the gateway after `threshold` consecutive failures.
+
+    While open, calls fail fast with a 503 instead of piling up behind a
+    dead gateway; after `reset_seconds` one trial call is let through
+    (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """Raise 503 while open; returns True if this call is the half-open trial"""
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        retry_after = max(int(self.reset_seconds - (time.monotonic() - self.opened_at)), 1)
+        raise HTTPException(
+            status_code=503,
+            detail="Payment gateway temporarily unavailable. Please try again shortly.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    def end_trial(self):
+        """Release the trial slot even if the call produced no verdict (e.g. it was cancelled)"""
+        self.trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.threshold:
+            if self.opened_at is None:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+
+
+class GatewayError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = True):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
 class PaymentService:
+    """
+    Async Razorpay client.
+
+    Talks to the Razorpay REST API through one pooled httpx.AsyncClient
+    (keep-alive, bounded connections, timeouts), so gateway round trips
+    never block the event loop. Safe calls are retried with exponential
+    backoff and a circuit breaker sheds load when the gateway is down.
+    RAZORPAY_API_BASE can point at scripts/fake_payment_gateway.py for
+    tests and load benchmarks.
+    """
+
     def __init__(self):
         self.razorpay_key_id = os.getenv("RAZORPAY_KEY_ID", "")
         self.razorpay_key_secret = os.getenv("RAZORPAY_KEY_SECRET", "")
-        
+        self.api_base = settings.RAZORPAY_API_BASE.rstrip("/")
+        self.max_retries = settings.PAYMENT_GATEWAY_MAX_RETRIES
+        self.breaker = CircuitBreaker(
+            settings.PAYMENT_GATEWAY_BREAKER_THRESHOLD,
+            settings.PAYMENT_GATEWAY_BREAKER_RESET_SECONDS
+        )
+        self.transport: Optional[httpx.AsyncBaseTransport] = None  # override for in-process tests
+        self._client: Optional[httpx.AsyncClient] = None
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
         if not self.razorpay_key_id or not self.razorpay_key_secret:
-            print("WARNING: Razorpay credentials not configured. Payment gateway will not work.")
-            self.client = None
-        else:
-            self.client = razorpay.Client(auth=(self.razorpay_key_id, self.razorpay_key_secret))
-    
-    def create_order(self, amount: float, currency: str = "INR", receipt: str = None, notes: Dict = None) -> Dict[str, Any]:
+            logger.warning("Razorpay credentials not configured. Payment gateway will not work.")
+
+    @property
+    def client(self) -> Optional[httpx.AsyncClient]:
+        """Pooled HTTP client, created on first use"""
+        if self._client is None and self.razorpay_key_id and self.razorpay_key_secret:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base,
+                auth=(self.razorpay_key_id, self.razorpay_key_secret),
+                timeout=httpx.Timeout(settings.PAYMENT_GATEWAY_TIMEOUT_SECONDS, connect=3.0),
+                limits=httpx.Limits(
+                    max_connections=settings.PAYMENT_GATEWAY_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.PAYMENT_GATEWAY_MAX_CONNECTIONS,
+                    keepalive_expiry=60
+                ),
+                transport=self.transport
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, path: str, json: Dict = None, idempotent: bool = True) -> Dict[str, Any]:
+        """
+        Call the gateway with retries.
+
+        Non-idempotent calls (capture, refund) are only retried when the
+        request never reached the gateway (connection failures), so a
+        payment can't be refunded twice.
+        """
+        client = self.client
+        if client is None:
+            raise HTTPException(status_code=500, detail="Payment gateway not configured")
+
+        attempt = 0
+        while True:
+            trial = self.breaker.before_call()
+            self.calls += 1
+            try:
+                with span("gateway.request", KIND_CLIENT, **{"http.method": method, "http.path": path, "attempt": attempt}) as call:
+                    response = await client.request(method, path, json=json)
+                    if call is not None:
+                        call.set(**{"http.status_code": response.status_code})
+                if response.status_code in RETRYABLE_STATUS:
+                    raise GatewayError(f"gateway returned {response.status_code}", response.status_code)
+                self.breaker.record_success()
+                if response.status_code >= 400:
+                    # The gateway rejected the request; retrying won't help
+                    raise GatewayError(_error_description(response), response.status_code, retryable=False)
+                return response.json()
+            except GatewayError as e:
+                if not e.retryable:
+                    raise
+                error, sent = e, True
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                error, sent = e, False
+            except httpx.HTTPError as e:
+                error, sent = e, True
+            finally:
+                # CancelledError (client disconnect, request timeout) skips the
+                # handlers above; without this the breaker would stay half-open
+                # with its trial slot taken and reject every later call
+                if trial:
+                    self.breaker.end_trial()
+
+            self.breaker.record_failure()
+            if attempt >= self.max_retries or (sent and not idempotent):
+                self.failures += 1
+                raise error
+            attempt += 1
+            self.retries += 1
+            # Exponential backoff with jitter
+            await asyncio.sleep(0.2 * (2 ** (attempt - 1)) * (0.5 + random.random()))
+
+    async def create_order(self, amount: float, currency: str = "INR", receipt: str = None, notes: Dict = None) -> Dict[str, Any]:
         """
         Create a Razorpay order
-        
+
         Args:
             amount: Amount in rupees (will be converted to paise)
             currency: Currency code (default: INR)
             receipt: Receipt/booking ID
             notes: Additional notes/metadata
-        
+
         Returns:
             Order details including order_id
         """
-        if not self.client:
-            raise HTTPException(status_code=500, detail="Payment gateway not configured")
-        
         try:
             # Convert rupees to paise (Razorpay uses smallest currency unit)
             amount_in_paise = int(amount * 100)
-            
+
             order_data = {
                 "amount": amount_in_paise,
                 "currency": currency,
                 "receipt": receipt or f"receipt_{int(amount)}",
                 "notes": notes or {}
             }
-            
-            order = self.client.order.create(data=order_data)
-            return order
-        
+
+            # A duplicate order from a retry is never paid and simply expires
+            return await self._request("POST", "/orders", json=order_data)
+
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create payment order: {str(e)}")
-    
+
     def verify_payment_signature(self, razorpay_order_id: str, razorpay_payment_id: str, razorpay_signature: str) -> bool:
         """
         Verify Razorpay payment signature
-        
+
         Args:
             razorpay_order_id: Order ID from Razorpay
             razorpay_payment_id: Payment ID from Razorpay
             razorpay_signature: Signature from Razorpay
-        
+
         Returns:
             True if signature is valid, False otherwise
         """
         try:
             # Create signature string
             message = f"{razorpay_order_id}|{razorpay_payment_id}"
-            
+
             # Generate signature
             generated_signature = hmac.new(
                 self.razorpay_key_secret.encode(),
                 message.encode(),
                 hashlib.sha256
             ).hexdigest()
-            
+
             return hmac.compare_digest(generated_signature, razorpay_signature)
-        
+
         except Exception as e:
-            print(f"Error verifying signature: {str(e)}")
+            logger.error(f"Error verifying signature: {str(e)}")
             return False
-    
-    def fetch_payment(self, payment_id: str) -> Dict[str, Any]:
+
+    async def fetch_order(self, order_id: str) -> Dict[str, Any]:
+        """
+        Fetch order details (amount, status, notes) from Razorpay
+
+        Args:
+            order_id: Razorpay order ID
+
+        Returns:
+            Order details
+        """
+        try:
+            return await self._request("GET", f"/orders/{order_id}")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to fetch order: {str(e)}")
+
+    async def fetch_payment(self, payment_id: str) -> Dict[str, Any]:
         """
         Fetch payment details from Razorpay
-        
+
         Args:
             payment_id: Razorpay payment ID
-        
+
         Returns:
             Payment details
         """
-        if not self.client:
-            raise HTTPException(status_code=500, detail="Payment gateway not configured")
-        
         try:
-            return self.client.payment.fetch(payment_id)
+            return await self._request("GET", f"/payments/{payment_id}")
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to fetch payment: {str(e)}")
-    
-    def capture_payment(self, payment_id: str, amount: float) -> Dict[str, Any]:
+
+    async def capture_payment(self, payment_id: str, amount: float) -> Dict[str, Any]:
         """
         Capture a payment (for authorized payments)
-        
+
         Args:
             payment_id: Razorpay payment ID
             amount: Amount to capture in rupees
-        
+
         Returns:
             Captured payment details
         """
-        if not self.client:
-            raise HTTPException(status_code=500, detail="Payment gateway not configured")
-        
         try:
             amount_in_paise = int(amount * 100)
-            return self.client.payment.capture(payment_id, amount_in_paise)
+            return await self._request(
+                "POST", f"/payments/{payment_id}/capture",
+                json={"amount": amount_in_paise}, idempotent=False
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to capture payment: {str(e)}")
-    
-    def refund_payment(self, payment_id: str, amount: float = None, notes: Dict = None) -> Dict[str, Any]:
+
+    async def refund_payment(self, payment_id: str, amount: float = None, notes: Dict = None) -> Dict[str, Any]:
         """
         Refund a payment
-        
+
         Args:
             payment_id: Razorpay payment ID
             amount: Amount to refund in rupees (None for full refund)
             notes: Additional notes
-        
+
         Returns:
             Refund details
         """
-        if not self.client:
-            raise HTTPException(status_code=500, detail="Payment gateway not configured")
-        
         try:
             refund_data = {"notes": notes or {}}
-            
+
             if amount:
                 refund_data["amount"] = int(amount * 100)
-            
-            return self.client.payment.refund(payment_id, refund_data)
+
+            return await self._request(
+                "POST", f"/payments/{payment_id}/refund", json=refund_data, idempotent=False
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to process refund: {str(e)}")
 
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "breaker_state": self.breaker.state,
+            "breaker_opened": self.breaker.times_opened,
+        }
+
+
+def _error_description(response: httpx.Response) -> str:
+    try:
+        return response.json()["error"]["description"]
+    except Exception:
+        return f"gateway returned {response.status_code}"
+
+
 # Create singleton instance
 payment_service = PaymentService()
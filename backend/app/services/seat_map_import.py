@@ -0,0 +1,220 @@
+"""
+Seat Map Import Service - Bulk cabin creation from CSV / JSON seat maps
+Rows are validated as they are read and inserted in executemany batches
+inside a single transaction, so a 1,000-seat hall is one request.
+"""
+
+import codecs
+import csv
+import json
+import logging
+import time
+from typing import Iterator, Optional, List, Dict, Any, Tuple
+
+from pydantic import BaseModel, ValidationError, field_validator
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.reading_room import Cabin, CabinStatus
+
+logger = logging.getLogger(__name__)
+
+# Rows sent to the database per executemany call
+IMPORT_BATCH_SIZE = 500
+# Stop collecting validation errors after this many (the import is rejected anyway)
+MAX_REPORTED_ERRORS = 50
+
+SEAT_MAP_COLUMNS = ["floor", "zone", "row_label", "number", "price", "amenities"]
+
+
+class SeatMapRow(BaseModel):
+    """A single seat in an imported seat map"""
+    floor: int
+    number: str
+    price: float
+    zone: Optional[str] = None
+    row_label: Optional[str] = None
+    amenities: Optional[str] = None
+
+    @field_validator("number")
+    @classmethod
+    def number_not_blank(cls, v: str) -> str:
+        v = str(v).strip()
+        if not v:
+            raise ValueError("number is required")
+        return v
+
+    @field_validator("price")
+    @classmethod
+    def price_positive(cls, v: float) -> float:
+        if v < 0:
+            raise ValueError("price must not be negative")
+        return v
+
+    @field_validator("zone", "row_label", "amenities", mode="before")
+    @classmethod
+    def blank_to_none(cls, v):
+        if isinstance(v, list):
+            v = ",".join(str(a).strip() for a in v)
+        if v is None or str(v).strip() == "":
+            return None
+        return str(v).strip()
+
+    @field_validator("zone")
+    @classmethod
+    def zone_upper(cls, v: Optional[str]) -> Optional[str]:
+        return v.upper() if v else v
+
+
+class SeatMapImportError(Exception):
+    """Raised when a seat map has invalid rows; carries per-line errors"""
+
+    def __init__(self, errors: List[Dict[str, Any]], total_errors: int):
+        self.errors = errors
+        self.total_errors = total_errors
+        super().__init__(f"{total_errors} invalid rows in seat map")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """Return 'csv', 'json' or 'jsonl' from the upload name / content type"""
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith(".jsonl") or name.endswith(".ndjson") or "ndjson" in ctype:
+        return "jsonl"
+    if name.endswith(".json") or "json" in ctype:
+        return "json"
+    return "csv"
+
+
+def iter_seat_map_records(fileobj, fmt: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (line_number, raw_record) from a binary file object.
+
+    CSV and JSON Lines are read incrementally; a plain JSON array is
+    accepted for convenience but has to be parsed in one go.
+    """
+    if fmt == "json":
+        records = json.load(codecs.getreader("utf-8-sig")(fileobj))
+        if not isinstance(records, list):
+            raise ValueError("JSON seat map must be an array of seat objects")
+        for index, record in enumerate(records, start=1):
+            yield index, record
+        return
+
+    text = codecs.getreader("utf-8-sig")(fileobj)
+    if fmt == "jsonl":
+        for line_no, line in enumerate(text, start=1):
+            line = line.strip()
+            if line:
+                yield line_no, json.loads(line)
+        return
+
+    reader = csv.DictReader(text)
+    if not reader.fieldnames:
+        return
+    reader.fieldnames = [f.strip().lower() for f in reader.fieldnames]
+    missing = {"floor", "number", "price"} - set(reader.fieldnames)
+    if missing:
+        raise ValueError(f"CSV seat map is missing columns: {', '.join(sorted(missing))}")
+    for record in reader:
+        # Header is line 1
+        yield reader.line_num, record
+
+
+async def import_seat_map(
+    db: AsyncSession,
+    room_id: str,
+    records: Iterator[Tuple[int, Dict[str, Any]]],
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> Dict[str, Any]:
+    """
+    Validate and insert seat map rows for a reading room.
+
+    Rows are validated one at a time and flushed with executemany every
+    `batch_size` rows. Nothing is committed here: the caller commits on
+    success, and any validation error rolls the whole import back.
+
+    Returns:
+        dict with counts, batch count and insert throughput
+    """
+    # Existing seats, so re-importing a map doesn't create duplicates
+    existing_result = await db.execute(
+        select(Cabin.floor, Cabin.number).where(Cabin.reading_room_id == room_id)
+    )
+    seen = {(floor, number) for floor, number in existing_result.all()}
+
+    errors: List[Dict[str, Any]] = []
+    total_errors = 0
+    pending: List[Dict[str, Any]] = []
+    inserted = 0
+    batches = 0
+    insert_seconds = 0.0
+    started = time.perf_counter()
+
+    async def flush():
+        nonlocal inserted, batches, insert_seconds
+        if not pending:
+            return
+        t0 = time.perf_counter()
+        await db.execute(insert(Cabin), pending)
+        insert_seconds += time.perf_counter() - t0
+        inserted += len(pending)
+        batches += 1
+        logger.info(f"🪑 Seat map import {room_id}: {inserted} seats inserted ({batches} batches)")
+        pending.clear()
+
+    rows_read = 0
+    for line_no, record in records:
+        rows_read += 1
+        try:
+            row = SeatMapRow.model_validate(record)
+        except ValidationError as e:
+            total_errors += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({
+                    "line": line_no,
+                    "errors": [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+                })
+            continue
+
+        key = (row.floor, row.number)
+        if key in seen:
+            total_errors += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_no, "errors": [f"duplicate seat {row.number} on floor {row.floor}"]})
+            continue
+        seen.add(key)
+
+        # Once a row is bad the import will be rejected; stop sending inserts
+        if total_errors:
+            continue
+
+        pending.append({
+            "reading_room_id": room_id,
+            "number": row.number,
+            "floor": row.floor,
+            "price": row.price,
+            "zone": row.zone,
+            "row_label": row.row_label,
+            "amenities": row.amenities or "",
+            "status": CabinStatus.AVAILABLE,
+        })
+        if len(pending) >= batch_size:
+            await flush()
+
+    if total_errors:
+        raise SeatMapImportError(errors, total_errors)
+
+    await flush()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rows_read": rows_read,
+        "inserted": inserted,
+        "batches": batches,
+        "batch_size": batch_size,
+        "elapsed_seconds": round(elapsed, 4),
+        "insert_seconds": round(insert_seconds, 4),
+        "rows_per_second": round(inserted / insert_seconds, 1) if insert_seconds > 0 else None,
+    }
@@ -0,0 +1,108 @@
+"""
+Trust Blocks - Per-user blocking state from pending verification reminders
+Each user's pending reminders are folded into one int: the low bits are the
+actions that are blocked, the bits above them the reminder types still
+pending (send_reminder allows one pending reminder per type). Masks are
+cached in-process, replaced whenever a reminder is sent or completed, and
+re-read after a TTL so changes made by other workers are picked up.
+"""
+
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.reminder import Reminder, ReminderType, ReminderStatus
+
+BLOCK_LISTINGS = 1 << 0
+BLOCK_PAYMENTS = 1 << 1
+BLOCK_BOOKINGS = 1 << 2
+BLOCK_MASK = BLOCK_LISTINGS | BLOCK_PAYMENTS | BLOCK_BOOKINGS
+
+# One bit per reminder type, above the block bits
+TYPE_BITS = {reminder_type: 1 << (3 + i) for i, reminder_type in enumerate(ReminderType)}
+
+BLOCK_NAMES = {
+    BLOCK_LISTINGS: "listings",
+    BLOCK_PAYMENTS: "payments",
+    BLOCK_BOOKINGS: "bookings",
+}
+
+
+def compute_mask(reminders: Iterable[Reminder]) -> int:
+    """Fold pending reminders into a mask"""
+    mask = 0
+    for r in reminders:
+        if r.blocks_listings:
+            mask |= BLOCK_LISTINGS
+        if r.blocks_payments:
+            mask |= BLOCK_PAYMENTS
+        if r.blocks_bookings:
+            mask |= BLOCK_BOOKINGS
+        if r.reminder_type:
+            mask |= TYPE_BITS[r.reminder_type]
+    return mask
+
+
+def describe(mask: int) -> dict:
+    """The /trust/user/has-blocks payload for a mask"""
+    reminder_types = [t.value for t, bit in TYPE_BITS.items() if mask & bit]
+    return {
+        "has_blocks": bool(reminder_types),
+        "blocks_listings": bool(mask & BLOCK_LISTINGS),
+        "blocks_payments": bool(mask & BLOCK_PAYMENTS),
+        "blocks_bookings": bool(mask & BLOCK_BOOKINGS),
+        "pending_reminders": len(reminder_types),
+        "reminder_types": reminder_types,
+    }
+
+
+class TrustBlockCache:
+    """In-process block masks per user, loaded lazily from pending reminders"""
+
+    def __init__(self, ttl: float = settings.TRUST_BLOCK_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._masks: Dict[str, Tuple[int, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, user_id: str) -> Optional[int]:
+        """Cached mask without touching the database (None if missing or stale)"""
+        entry = self._masks.get(user_id)
+        if entry is None or time.monotonic() - entry[1] >= self.ttl:
+            return None
+        return entry[0]
+
+    async def get(self, db: AsyncSession, user_id: str) -> int:
+        mask = self.peek(user_id)
+        if mask is not None:
+            self.hits += 1
+            return mask
+        self.misses += 1
+        return await self.refresh(db, user_id)
+
+    async def refresh(self, db: AsyncSession, user_id: str) -> int:
+        """Recompute a user's mask from the database (call after reminder writes)"""
+        result = await db.execute(
+            select(Reminder).where(
+                Reminder.user_id == user_id,
+                Reminder.status == ReminderStatus.PENDING
+            )
+        )
+        mask = compute_mask(result.scalars().all())
+        self._masks[user_id] = (mask, time.monotonic())
+        return mask
+
+    def invalidate(self, user_id: Optional[str] = None):
+        if user_id is None:
+            self._masks.clear()
+        else:
+            self._masks.pop(user_id, None)
+
+    def stats(self) -> dict:
+        return {"users_cached": len(self._masks), "hits": self.hits, "misses": self.misses}
+
+
+trust_blocks = TrustBlockCache()
@@ -20,6 +20,20 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     r = 6371 # Radius of earth in kilometers. Use 3956 for miles
     return c * r
 
+def bounding_box_clause(model, lat: float, lon: float, radius_km: float):
+    """
+    SQL pre-filter: rows whose coordinates fall in the square around
+    (lat, lon) that encloses radius_km. Exact distance is still checked
+    with haversine_distance on the (much smaller) result.
+    """
+    lat_delta = radius_km / 111.0
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    lon_delta = radius_km / (111.0 * cos_lat)
+    return (
+        model.latitude.between(lat - lat_delta, lat + lat_delta)
+        & model.longitude.between(lon - lon_delta, lon + lon_delta)
+    )
+
 def sort_by_proximity(user_lat: float, user_lon: float, items: list) -> list:
     """
     Sorts a list of objects (dicts or models) by distance to user.
@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque cursor.
+    Datetimes are stored as ISO strings and restored by decode_cursor.
+    """
+    payload = [
+        {"dt": v.isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[Tuple[Any, ...]]:
+    """Decode a cursor from encode_cursor; raises 400 if it is malformed"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError("wrong cursor size")
+        return tuple(
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) and "dt" in v else v
+            for v in payload
+        )
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
@@ -0,0 +1,63 @@
+"""
+Listing visibility rules as SQL predicates.
+
+A venue is visible to a viewer when all of these hold:
+- status: LIVE, or the viewer owns it (admins may ask for unverified listings)
+- city: its city is not paused in city_settings
+- trust: CLEAR / UNDER_REVIEW for the public; owners and super admins see all
+
+Shared by reading room, accommodation and featured listing queries so the
+filtering happens in the database instead of on loaded rows.
+"""
+
+from typing import Optional
+
+from sqlalchemy import and_, or_, exists, func, true
+
+from app.models.city import CitySettings
+from app.models.reading_room import ListingStatus
+from app.models.user import User, UserRole
+
+# Trust statuses the public may see ('UNDER_REVIEW' means the owner is fixing an issue)
+PUBLIC_TRUST_STATUSES = ("CLEAR", "UNDER_REVIEW")
+
+
+def city_active_clause(model):
+    """Venue's city is not paused (cities without settings count as active)"""
+    venue_city = func.lower(func.trim(func.coalesce(model.city, "")))
+    return ~exists().where(
+        func.lower(CitySettings.city_name) == venue_city,
+        func.coalesce(CitySettings.is_active, False) == False,
+    )
+
+
+def trust_visible_clause(model, current_user: Optional[User]):
+    """Hide FLAGGED / SUSPENDED venues from everyone but their owner and super admins"""
+    trust_status = getattr(model, "trust_status", None)
+    if trust_status is None:
+        # Model has no trust tracking
+        return true()
+    if current_user and current_user.role == UserRole.SUPER_ADMIN:
+        return true()
+    public = or_(trust_status.is_(None), trust_status.in_(PUBLIC_TRUST_STATUSES))
+    if current_user:
+        return or_(public, model.owner_id == current_user.id)
+    return public
+
+
+def listing_status_clause(model, current_user: Optional[User], include_unverified: bool = False):
+    """LIVE listings, plus the viewer's own; admins can include everything"""
+    if include_unverified and current_user and current_user.role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+        return true()
+    if current_user:
+        return or_(model.status == ListingStatus.LIVE, model.owner_id == current_user.id)
+    return model.status == ListingStatus.LIVE
+
+
+def visible_listing_clause(model, current_user: Optional[User] = None, include_unverified: bool = False):
+    """Full visibility predicate for ReadingRoom / Accommodation queries"""
+    return and_(
+        listing_status_clause(model, current_user, include_unverified),
+        city_active_clause(model),
+        trust_visible_clause(model, current_user),
+    )
@@ -0,0 +1,33 @@
+"""Add primary_image to reading_rooms / accommodations and backfill it from images"""
+import asyncio
+import sys
+from pathlib import Path
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def migrate():
+    from app.database import engine
+    from app.models.reading_room import first_image
+
+    for table in ("reading_rooms", "accommodations"):
+        async with engine.begin() as conn:
+            try:
+                await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN primary_image VARCHAR"))
+                print(f"✅ Added {table}.primary_image")
+            except Exception as e:
+                print(f"⚠️ {table}.primary_image: {e}")
+
+        async with engine.begin() as conn:
+            rows = (await conn.execute(
+                text(f"SELECT id, images FROM {table} WHERE primary_image IS NULL AND images IS NOT NULL")
+            )).all()
+            updates = [{"id": row_id, "img": first_image(images)} for row_id, images in rows]
+            updates = [u for u in updates if u["img"]]
+            if updates:
+                await conn.execute(text(f"UPDATE {table} SET primary_image = :img WHERE id = :id"), updates)
+            print(f"✅ Backfilled primary_image on {len(updates)} {table}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
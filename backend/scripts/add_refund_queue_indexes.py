@@ -0,0 +1,26 @@
+"""Add the indexes behind the admin refunds queue (status filter + keyset paging)"""
+import asyncio
+import sys
+from pathlib import Path
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def migrate():
+    from app.database import engine
+
+    indexes = {
+        "ix_refunds_status_requested": "refunds (status, requested_at, id)",
+        "ix_refunds_requested": "refunds (requested_at, id)",
+    }
+    for name, target in indexes.items():
+        async with engine.begin() as conn:
+            try:
+                await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+                print(f"✅ Index {name}")
+            except Exception as e:
+                print(f"⚠️ {name}: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Archive old audit log partitions to compressed files.
+
+Each closed month (partition_key 'YYYY-MM') older than --keep-months is
+written to archive/audit_logs/audit_logs_<month>.jsonl.gz and then removed
+from the live audit_logs table.
+
+Usage:
+    python scripts/archive_audit_logs.py --list
+    python scripts/archive_audit_logs.py --keep-months 6
+    python scripts/archive_audit_logs.py --partition 2025-01
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.services.audit_service import list_partitions, archive_partition, AUDIT_ARCHIVE_DIR
+
+
+def months_ago(n: int) -> str:
+    now = datetime.utcnow()
+    year, month = now.year, now.month - n
+    while month <= 0:
+        month += 12
+        year -= 1
+    return f"{year:04d}-{month:02d}"
+
+
+async def main(args):
+    async with AsyncSessionLocal() as db:
+        partitions = await list_partitions(db)
+
+        if args.list:
+            for p in partitions:
+                print(f"{p['partition'] or '(none)'}: {p['rows']} rows ({p['first']} - {p['last']})")
+            return
+
+        if args.partition:
+            targets = [args.partition]
+        else:
+            cutoff = months_ago(args.keep_months)
+            targets = [p["partition"] for p in partitions if p["partition"] and p["partition"] < cutoff]
+
+        if not targets:
+            print("ℹ️  Nothing to archive")
+            return
+
+        for partition in targets:
+            result = await archive_partition(db, partition, archive_dir=args.archive_dir)
+            if result["rows"]:
+                print(f"✅ Archived {result['rows']} entries from {partition} -> {result['path']}")
+            else:
+                print(f"ℹ️  Partition {partition} is empty")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old audit log partitions")
+    parser.add_argument("--list", action="store_true", help="List partitions and row counts")
+    parser.add_argument("--partition", help="Archive a single partition (YYYY-MM)")
+    parser.add_argument("--keep-months", type=int, default=6, help="Months kept in the live table")
+    parser.add_argument("--archive-dir", type=Path, default=AUDIT_ARCHIVE_DIR)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of large list responses.
+
+Builds in-memory reading room rows (no database needed) and times three
+ways of turning them into a response body:
+
+  default  - FastAPI's path: response_model validation + jsonable_encoder + json
+  fast     - same validation/encoding, rendered by FastJSONResponse (orjson)
+  trusted  - trusted_response(): one validation pass, dumped by pydantic-core
+
+Usage:
+    python scripts/bench_json_serialization.py
+    python scripts/bench_json_serialization.py --sizes 100 1000 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import FastJSONResponse, trusted_response, orjson
+from app.models.reading_room import ReadingRoom, ListingStatus
+from app.schemas.reading_room import ReadingRoomResponse
+
+CITIES = ["Bengaluru", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai"]
+AMENITIES = ["WiFi", "AC", "Locker", "Power Backup", "Water", "CCTV", "Parking"]
+
+
+def make_rooms(count: int, seed: int = 42) -> List[ReadingRoom]:
+    """Transient ORM rows shaped like real listings"""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    rooms = []
+    for i in range(count):
+        city = rng.choice(CITIES)
+        images = [f"https://cdn.example.com/rooms/{i}/{n}.jpg" for n in range(rng.randint(1, 6))]
+        rooms.append(ReadingRoom(
+            id=f"room-{i:06d}",
+            owner_id=f"owner-{i % 500:04d}",
+            name=f"Study Point {i}",
+            address=f"{rng.randint(1, 999)} Main Road, {city}",
+            description="Quiet air-conditioned reading room with individual cabins. " * rng.randint(1, 4),
+            images=json.dumps(images),
+            amenities=",".join(rng.sample(AMENITIES, rng.randint(2, len(AMENITIES)))),
+            contact_phone=f"98{rng.randint(10000000, 99999999)}",
+            price_start=float(rng.randint(800, 4000)),
+            city=city,
+            area=f"Sector {rng.randint(1, 60)}",
+            locality=f"Block {rng.choice('ABCDEFGH')}",
+            state="KA",
+            pincode=f"{rng.randint(100000, 999999)}",
+            latitude=12.9 + rng.random(),
+            longitude=77.5 + rng.random(),
+            is_sponsored=rng.random() < 0.1,
+            is_verified=rng.random() < 0.7,
+            status=ListingStatus.LIVE,
+            created_at=base + timedelta(minutes=i),
+        ))
+    return rooms
+
+
+def default_path(rows, field, response_class):
+    content = asyncio.run(serialize_response(field=field, response_content=rows))
+    return response_class(content).body
+
+
+def trusted_path(rows):
+    return trusted_response(rows, ReadingRoomResponse).body
+
+
+def timed(fn, repeat: int):
+    best = None
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, len(body)
+
+
+def main(args):
+    field = create_response_field(name="Response_get_reading_rooms", type_=List[ReadingRoomResponse])
+    print(f"📦 orjson: {'yes' if orjson else 'no (stdlib json fallback)'}; best of {args.repeat} runs")
+    print(f"{'rows':>7} {'KB':>8} {'default':>10} {'fast':>10} {'trusted':>10} {'speedup':>8}")
+    for size in args.sizes:
+        rows = make_rooms(size)
+        default_ms, nbytes = timed(lambda: default_path(rows, field, JSONResponse), args.repeat)
+        fast_ms, _ = timed(lambda: default_path(rows, field, FastJSONResponse), args.repeat)
+        trusted_ms, _ = timed(lambda: trusted_path(rows), args.repeat)
+        print(
+            f"{size:>7} {nbytes / 1024:>8.0f} {default_ms:>8.1f}ms {fast_ms:>8.1f}ms "
+            f"{trusted_ms:>8.1f}ms {default_ms / trusted_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON response serialization")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000], help="Rows per payload")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    main(parser.parse_args())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark login throughput and read latency under a login burst.
+
+Runs the app in-process (no server needed) against DATABASE_URL and compares
+hashing inline on the event loop with hashing on the worker pool. For each
+mode it reports login throughput and the p50/p95 latency of an authenticated
+read endpoint (/auth/me), both on its own and while logins are in flight.
+
+Usage:
+    python scripts/bench_password_hashing.py
+    python scripts/bench_password_hashing.py --logins 200 --concurrency 32 --reads 300
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from sqlalchemy import delete
+
+from app.main import app
+from app.database import engine, AsyncSessionLocal
+from app.models.user import User, UserRole
+from app.core import security
+from app.core.config import settings
+from app.routers import auth as auth_router
+
+BENCH_DOMAIN = "@bench-users.example.com"
+BENCH_PASSWORD = "bench-password-123"
+
+
+def per_request_client(asgi_app):
+    """Give every request its own client address so the rate limiter doesn't kick in"""
+    async def wrapped(scope, receive, send):
+        if scope["type"] == "http":
+            headers = dict(scope.get("headers") or [])
+            ip = headers.get(b"x-bench-client", b"127.0.0.1").decode()
+            scope = dict(scope, client=(ip, 0))
+        await asgi_app(scope, receive, send)
+    return wrapped
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def seed_users(count: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(User.__table__.create, checkfirst=True)
+    hashed = security.get_password_hash(BENCH_PASSWORD)
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.email.like(f"%{BENCH_DOMAIN}")))
+        db.add_all([
+            User(email=f"user{i}{BENCH_DOMAIN}", hashed_password=hashed, name=f"Bench {i}", role=UserRole.STUDENT)
+            for i in range(count)
+        ])
+        await db.commit()
+
+
+async def cleanup_users():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.email.like(f"%{BENCH_DOMAIN}")))
+        await db.commit()
+
+
+async def login(client, i: int):
+    response = await client.post(
+        "/auth/login",
+        data={"username": f"user{i}{BENCH_DOMAIN}", "password": BENCH_PASSWORD},
+        headers={"x-bench-client": f"10.0.{i // 250}.{i % 250}"},
+    )
+    return response
+
+
+async def run_logins(client, count: int, concurrency: int, users: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = {}
+
+    async def one(i):
+        async with semaphore:
+            response = await login(client, i % users)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return time.perf_counter() - started, statuses
+
+
+async def run_reads(client, token: str, count: int, stop: asyncio.Event = None):
+    latencies = []
+    headers = {"Authorization": f"Bearer {token}", "x-bench-client": "10.1.0.1"}
+    for _ in range(count):
+        if stop is not None and stop.is_set():
+            break
+        started = time.perf_counter()
+        await client.get("/auth/me", headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def bench_mode(client, mode: str, args) -> dict:
+    workers = 0 if mode == "inline" else args.workers
+    hasher = security.PasswordHasher(workers, max_pending=max(args.concurrency * 2, 1))
+    auth_router.password_hasher = hasher
+    try:
+        token = (await login(client, 0)).json()["access_token"]
+
+        idle = await run_reads(client, token, args.reads)
+
+        stop = asyncio.Event()
+        reads_task = asyncio.create_task(run_reads(client, token, args.reads, stop))
+        elapsed, statuses = await run_logins(client, args.logins, args.concurrency, args.users)
+        stop.set()
+        busy = await reads_task
+    finally:
+        hasher.shutdown()
+
+    return {
+        "mode": mode,
+        "logins_per_sec": args.logins / elapsed,
+        "statuses": statuses,
+        "idle_p50": percentile(idle, 50),
+        "idle_p95": percentile(idle, 95),
+        "busy_p50": percentile(busy, 50),
+        "busy_p95": percentile(busy, 95),
+        "busy_reads": len(busy),
+        "hasher": hasher.stats(),
+    }
+
+
+async def main(args):
+    print(f"🔐 Benchmarking password hashing against {settings.DATABASE_URL.split('@')[-1]}")
+    await seed_users(args.users)
+
+    transport = httpx.ASGITransport(app=per_request_client(app))
+    results = []
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for mode in args.modes:
+                print(f"⏱️  Running mode: {mode}")
+                results.append(await bench_mode(client, mode, args))
+    finally:
+        if not args.keep_users:
+            await cleanup_users()
+
+    print()
+    print(f"{'mode':<8} {'logins/s':>9} {'read p50':>9} {'read p95':>9} {'busy p50':>9} {'busy p95':>9}  statuses")
+    for r in results:
+        print(
+            f"{r['mode']:<8} {r['logins_per_sec']:>9.1f} {r['idle_p50']:>7.1f}ms {r['idle_p95']:>7.1f}ms "
+            f"{r['busy_p50']:>7.1f}ms {r['busy_p95']:>7.1f}ms  {r['statuses']}"
+        )
+    for r in results:
+        print(f"   {r['mode']} hasher: {r['hasher']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark password hashing modes")
+    parser.add_argument("--logins", type=int, default=100, help="Logins per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent login requests")
+    parser.add_argument("--users", type=int, default=20, help="Distinct bench users to seed")
+    parser.add_argument("--reads", type=int, default=200, help="Max read requests per phase")
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS, help="Pool size for pool mode")
+    parser.add_argument("--modes", nargs="+", default=["inline", "pool"], choices=["inline", "pool"])
+    parser.add_argument("--keep-users", action="store_true", help="Don't delete bench users afterwards")
+    asyncio.run(main(parser.parse_args()))
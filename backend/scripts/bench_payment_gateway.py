@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark payment gateway calls against the fake gateway.
+
+Starts scripts/fake_payment_gateway.py on a local port and creates orders
+concurrently, comparing
+  - blocking: a synchronous HTTP call made from async code (how the
+    razorpay SDK was used), which stalls the event loop for every call
+  - async: PaymentService's pooled async client
+For each mode it reports throughput, call latency and event-loop lag (how
+late a 10 ms heartbeat wakes up, i.e. what unrelated requests would feel).
+Then it injects gateway failures to exercise retries and the circuit breaker.
+
+Usage:
+    python scripts/bench_payment_gateway.py
+    python scripts/bench_payment_gateway.py --calls 400 --concurrency 40 --latency 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_payment_gateway import create_gateway_app, DEFAULT_KEY_ID, DEFAULT_KEY_SECRET
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark payment gateway calls")
+    parser.add_argument("--calls", type=int, default=200, help="Orders to create per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent callers")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake gateway latency (seconds)")
+    return parser.parse_args()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def start_gateway(latency: float):
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    gateway = create_gateway_app(latency=latency, seed=42)
+    server = uvicorn.Server(uvicorn.Config(gateway, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return gateway, server, f"http://127.0.0.1:{port}/v1"
+
+
+async def heartbeat(lags, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run_mode(name: str, call, calls: int, concurrency: int) -> dict:
+    latencies, lags, errors = [], [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    return {
+        "mode": name,
+        "throughput": calls / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "lag_p95_ms": percentile(lags, 95) * 1000,
+        "lag_max_ms": max(lags, default=0.0) * 1000,
+        "errors": errors,
+    }
+
+
+async def run(args, gateway, api_base):
+    import httpx
+    from app.services.payment_service import PaymentService
+
+    order = {"amount": 49900, "currency": "INR", "receipt": "bench", "notes": {}}
+    sync_client = httpx.Client(base_url=api_base, auth=(DEFAULT_KEY_ID, DEFAULT_KEY_SECRET))
+
+    async def blocking_call(i):
+        response = sync_client.post("/orders", json=order)
+        response.raise_for_status()
+
+    service = PaymentService()
+
+    async def async_call(i):
+        await service.create_order(amount=499, receipt=f"bench_{i}")
+
+    results = [
+        await run_mode("blocking", blocking_call, args.calls, args.concurrency),
+        await run_mode("async", async_call, args.calls, args.concurrency),
+    ]
+    sync_client.close()
+
+    print(f"\n💳 {args.calls} orders, concurrency {args.concurrency}, gateway latency {args.latency * 1000:.0f} ms")
+    print(f"{'mode':<10} {'orders/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'loop lag p95':>13} {'lag max':>8} {'errors':>7}")
+    for r in results:
+        print(f"{r['mode']:<10} {r['throughput']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['lag_p95_ms']:>11.1f}ms {r['lag_max_ms']:>6.1f}ms {r['errors']:>7}")
+
+    # Flaky gateway: retries should hide most failures
+    gateway.state.config["failure_rate"] = 0.3
+    flaky = await run_mode("flaky", async_call, args.calls, args.concurrency)
+    print(f"\n🔁 30% injected failures: {flaky['errors']}/{args.calls} orders failed, stats {service.stats()}")
+
+    # Dead gateway: the breaker should open and fail fast
+    gateway.state.config["failure_rate"] = 1.0
+    down = await run_mode("down", async_call, args.calls, args.concurrency)
+    print(f"🔌 Gateway down: {down['errors']}/{args.calls} failed, p95 {down['p95_ms']:.1f} ms, stats {service.stats()}")
+
+    await service.aclose()
+
+
+def main():
+    args = parse_args()
+    gateway, server, api_base = start_gateway(args.latency)
+    os.environ.update(RAZORPAY_KEY_ID=DEFAULT_KEY_ID, RAZORPAY_KEY_SECRET=DEFAULT_KEY_SECRET, RAZORPAY_API_BASE=api_base)
+    try:
+        asyncio.run(run(args, gateway, api_base))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Create the payment_events table (webhook inbox) in the database.
+Run this before pointing Razorpay webhooks at /payments/webhook.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import engine
+from app.models.payment_event import PaymentEvent
+
+
+async def create_table():
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: PaymentEvent.__table__.create(sync_conn, checkfirst=True))
+    print("✅ payment_events table ready")
+
+
+if __name__ == "__main__":
+    asyncio.run(create_table())
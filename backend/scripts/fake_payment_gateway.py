@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the Razorpay REST API, for local testing and load benchmarks.
+
+Implements the endpoints PaymentService uses (orders, payment fetch,
+capture, refund) with in-memory state, HTTP basic auth, configurable
+latency and injected failures. A test-only endpoint simulates the customer
+paying an order and returns the ids + signature the checkout page would
+post to /payments/verify. With --webhook-url it also delivers signed
+payment.captured / refund.processed webhooks (optionally duplicated).
+
+Usage:
+    python scripts/fake_payment_gateway.py --port 9100 --latency 0.15 --failure-rate 0.05
+    # then run the API with
+    RAZORPAY_API_BASE=http://127.0.0.1:9100/v1 RAZORPAY_KEY_ID=rzp_test_fake RAZORPAY_KEY_SECRET=fake_secret ...
+
+    POST /v1/test/orders/{order_id}/pay   -> {razorpay_order_id, razorpay_payment_id, razorpay_signature}
+    GET  /v1/test/stats                   -> request / failure counters
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import random
+import time
+import uuid
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+DEFAULT_KEY_ID = "rzp_test_fake"
+DEFAULT_KEY_SECRET = "fake_secret"
+
+
+def _error(status_code: int, code: str, description: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"error": {"code": code, "description": description}})
+
+
+def create_gateway_app(
+    key_id: str = DEFAULT_KEY_ID,
+    key_secret: str = DEFAULT_KEY_SECRET,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    failure_rate: float = 0.0,
+    seed: Optional[int] = None,
+    webhook_url: Optional[str] = None,
+    webhook_secret: Optional[str] = None,
+    webhook_duplicates: int = 0,
+    webhook_transport=None,
+) -> FastAPI:
+    gateway = FastAPI(title="Fake Razorpay")
+    rng = random.Random(seed)
+    expected_auth = "Basic " + base64.b64encode(f"{key_id}:{key_secret}".encode()).decode()
+    orders, payments = {}, {}
+    stats = {"requests": 0, "injected_failures": 0, "unauthorized": 0, "webhooks_sent": 0, "webhooks_failed": 0}
+    background = set()
+    # Mutable so tests can change behaviour while the server runs
+    gateway.state.config = {"latency": latency, "jitter": jitter, "failure_rate": failure_rate}
+
+    @gateway.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        if request.url.path.startswith("/v1/test/"):
+            return await call_next(request)
+        stats["requests"] += 1
+        config = gateway.state.config
+        delay = config["latency"] + rng.uniform(0, config["jitter"])
+        if delay:
+            await asyncio.sleep(delay)
+        if request.headers.get("authorization") != expected_auth:
+            stats["unauthorized"] += 1
+            return _error(401, "BAD_REQUEST_ERROR", "Authentication failed")
+        if config["failure_rate"] and rng.random() < config["failure_rate"]:
+            stats["injected_failures"] += 1
+            return _error(503, "SERVER_ERROR", "Injected failure")
+        return await call_next(request)
+
+    async def deliver_webhook(event: str, entities: dict):
+        """POST a signed event to webhook_url, repeated webhook_duplicates times like a retrying gateway"""
+        body = json.dumps({
+            "entity": "event",
+            "event": event,
+            "payload": {name: {"entity": entity} for name, entity in entities.items()},
+            "created_at": int(time.time()),
+        }).encode()
+        headers = {
+            "Content-Type": "application/json",
+            "X-Razorpay-Event-Id": f"evt_{uuid.uuid4().hex[:14]}",
+            "X-Razorpay-Signature": hmac.new((webhook_secret or "").encode(), body, hashlib.sha256).hexdigest(),
+        }
+        async with httpx.AsyncClient(transport=webhook_transport, timeout=10) as client:
+            for _ in range(webhook_duplicates + 1):
+                try:
+                    response = await client.post(webhook_url, content=body, headers=headers)
+                    response.raise_for_status()
+                    stats["webhooks_sent"] += 1
+                except httpx.HTTPError as e:
+                    stats["webhooks_failed"] += 1
+                    print(f"⚠️ Webhook {event} failed: {e}")
+
+    def send_webhook(event: str, entities: dict):
+        if webhook_url:
+            task = asyncio.create_task(deliver_webhook(event, entities))
+            background.add(task)
+            task.add_done_callback(background.discard)
+
+    @gateway.post("/v1/orders")
+    async def create_order(request: Request):
+        data = await request.json()
+        if not isinstance(data.get("amount"), int) or data["amount"] < 100:
+            return _error(400, "BAD_REQUEST_ERROR", "The amount must be atleast INR 1.00")
+        order = {
+            "id": f"order_{uuid.uuid4().hex[:14]}",
+            "entity": "order",
+            "amount": data["amount"],
+            "amount_paid": 0,
+            "amount_due": data["amount"],
+            "currency": data.get("currency", "INR"),
+            "receipt": data.get("receipt"),
+            "status": "created",
+            "notes": data.get("notes") or {},
+            "created_at": int(time.time()),
+        }
+        orders[order["id"]] = order
+        return order
+
+    @gateway.get("/v1/orders/{order_id}")
+    async def get_order(order_id: str):
+        if order_id not in orders:
+            return _error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+        return orders[order_id]
+
+    @gateway.get("/v1/payments/{payment_id}")
+    async def get_payment(payment_id: str):
+        if payment_id not in payments:
+            return _error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+        return payments[payment_id]
+
+    @gateway.post("/v1/payments/{payment_id}/capture")
+    async def capture_payment(payment_id: str, request: Request):
+        payment = payments.get(payment_id)
+        if payment is None:
+            return _error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+        data = await request.json()
+        if data.get("amount") != payment["amount"]:
+            return _error(400, "BAD_REQUEST_ERROR", "Capture amount must be equal to the amount authorized")
+        payment.update(status="captured", captured=True)
+        return payment
+
+    @gateway.post("/v1/payments/{payment_id}/refund")
+    async def refund_payment(payment_id: str, request: Request):
+        payment = payments.get(payment_id)
+        if payment is None:
+            return _error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+        data = await request.json()
+        amount = data.get("amount", payment["amount"] - payment["amount_refunded"])
+        if amount > payment["amount"] - payment["amount_refunded"]:
+            return _error(400, "BAD_REQUEST_ERROR", "The refund amount provided is greater than amount captured")
+        payment["amount_refunded"] += amount
+        payment["refund_status"] = "full" if payment["amount_refunded"] == payment["amount"] else "partial"
+        refund = {
+            "id": f"rfnd_{uuid.uuid4().hex[:14]}",
+            "entity": "refund",
+            "amount": amount,
+            "payment_id": payment_id,
+            "notes": data.get("notes") or {},
+            "status": "processed",
+            "created_at": int(time.time()),
+        }
+        send_webhook("refund.processed", {"refund": refund, "payment": dict(payment)})
+        return refund
+
+    @gateway.post("/v1/test/orders/{order_id}/pay")
+    async def pay_order(order_id: str, method: str = "card"):
+        """Simulate the customer completing checkout"""
+        order = orders.get(order_id)
+        if order is None:
+            return _error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+        payment_id = f"pay_{uuid.uuid4().hex[:14]}"
+        payments[payment_id] = {
+            "id": payment_id,
+            "entity": "payment",
+            "amount": order["amount"],
+            "currency": order["currency"],
+            "status": "captured",
+            "order_id": order_id,
+            "method": method,
+            "captured": True,
+            "amount_refunded": 0,
+            "refund_status": None,
+            "notes": order["notes"],
+            "created_at": int(time.time()),
+        }
+        order.update(status="paid", amount_paid=order["amount"], amount_due=0)
+        send_webhook("payment.captured", {"payment": dict(payments[payment_id])})
+        signature = hmac.new(key_secret.encode(), f"{order_id}|{payment_id}".encode(), hashlib.sha256).hexdigest()
+        return {"razorpay_order_id": order_id, "razorpay_payment_id": payment_id, "razorpay_signature": signature}
+
+    @gateway.get("/v1/test/stats")
+    async def get_stats():
+        return {**stats, "orders": len(orders), "payments": len(payments)}
+
+    return gateway
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Razorpay API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--key-id", default=DEFAULT_KEY_ID)
+    parser.add_argument("--key-secret", default=DEFAULT_KEY_SECRET)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base latency per call (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency up to this many seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of calls answered with 503")
+    parser.add_argument("--seed", type=int, help="Random seed for latency and failures")
+    parser.add_argument("--webhook-url", help="Deliver payment.captured / refund.processed events here, "
+                                              "e.g. http://127.0.0.1:8000/payments/webhook")
+    parser.add_argument("--webhook-secret", default="fake_webhook_secret", help="Secret used to sign webhooks")
+    parser.add_argument("--webhook-duplicates", type=int, default=0, help="Redeliver every webhook this many extra times")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    print(f"💳 Fake Razorpay on http://{args.host}:{args.port}/v1 (key {args.key_id})")
+    uvicorn.run(
+        create_gateway_app(
+            args.key_id, args.key_secret, args.latency, args.jitter, args.failure_rate, args.seed,
+            args.webhook_url, args.webhook_secret, args.webhook_duplicates
+        ),
+        host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Bring an existing notifications table in line with app.models.notification.
+Older databases created the table from a duplicate model (created_at, no
+date / message_id), which made every notification insert fail.
+"""
+import asyncio
+import sys
+from pathlib import Path
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def migrate():
+    from app.database import engine
+
+    columns = {
+        "date": "TIMESTAMP",
+        "message_id": "VARCHAR REFERENCES messages(id)",
+    }
+    for name, ddl in columns.items():
+        async with engine.begin() as conn:
+            try:
+                await conn.execute(text(f"ALTER TABLE notifications ADD COLUMN {name} {ddl}"))
+                print(f"✅ Added notifications.{name}")
+            except Exception as e:
+                print(f"⚠️ {name}: {e}")
+
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text("UPDATE notifications SET date = created_at WHERE date IS NULL"))
+            print("✅ Backfilled notifications.date from created_at")
+        except Exception as e:
+            print(f"⚠️ backfill: {e}")
+
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_notifications_user_date ON notifications (user_id, date)"))
+            print("✅ Index ix_notifications_user_date")
+        except Exception as e:
+            print(f"⚠️ index: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
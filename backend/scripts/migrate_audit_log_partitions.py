@@ -0,0 +1,44 @@
+"""Add partition_key and composite indexes to an existing audit_logs table"""
+import asyncio
+import sys
+from pathlib import Path
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def migrate():
+    from app.database import engine
+
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text("ALTER TABLE audit_logs ADD COLUMN partition_key VARCHAR(7)"))
+            print("✅ Added partition_key column")
+        except Exception as e:
+            print(f"⚠️ partition_key: {e}")
+
+    async with engine.begin() as conn:
+        # Backfill from timestamp ('YYYY-MM')
+        if engine.dialect.name == "postgresql":
+            backfill = "UPDATE audit_logs SET partition_key = to_char(timestamp, 'YYYY-MM') WHERE partition_key IS NULL"
+        else:
+            backfill = "UPDATE audit_logs SET partition_key = strftime('%Y-%m', timestamp) WHERE partition_key IS NULL"
+        result = await conn.execute(text(backfill))
+        print(f"✅ Backfilled partition_key on {result.rowcount} rows")
+
+    indexes = {
+        "ix_audit_logs_partition_key": "audit_logs (partition_key)",
+        "ix_audit_logs_entity_timestamp": "audit_logs (entity_type, entity_id, timestamp)",
+        "ix_audit_logs_actor_timestamp": "audit_logs (actor_id, timestamp)",
+        "ix_audit_logs_timestamp_id": "audit_logs (timestamp, id)",
+    }
+    for name, target in indexes.items():
+        async with engine.begin() as conn:
+            try:
+                await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+                print(f"✅ Index {name}")
+            except Exception as e:
+                print(f"⚠️ {name}: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
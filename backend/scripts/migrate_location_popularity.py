@@ -0,0 +1,49 @@
+"""Add locations.popularity_score / popularity_epoch, seeded from the lifetime usage_count"""
+import asyncio
+import sys
+from pathlib import Path
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def migrate():
+    from app.database import engine
+    from app.services.location_usage import popularity_weight, popularity_epoch
+
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text("ALTER TABLE locations ADD COLUMN popularity_score FLOAT NOT NULL DEFAULT 0"))
+            print("✅ Added locations.popularity_score")
+        except Exception as e:
+            print(f"⚠️ popularity_score: {e}")
+
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text("ALTER TABLE locations ADD COLUMN popularity_epoch FLOAT"))
+            print("✅ Added locations.popularity_epoch")
+        except Exception as e:
+            print(f"⚠️ popularity_epoch: {e}")
+
+    async with engine.begin() as conn:
+        # Existing picks count as if made today and decay from here
+        result = await conn.execute(
+            text(
+                "UPDATE locations SET popularity_score = COALESCE(usage_count, 0) * :weight, popularity_epoch = :epoch "
+                "WHERE popularity_score = 0"
+            ),
+            {"weight": popularity_weight(), "epoch": popularity_epoch()}
+        )
+        print(f"✅ Seeded popularity for {result.rowcount} locations")
+
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_locations_popularity_score ON locations (popularity_score)"
+            ))
+            print("✅ Index ix_locations_popularity_score")
+        except Exception as e:
+            print(f"⚠️ ix_locations_popularity_score: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,39 @@
+"""Widen otps.otp_code for hashed codes, add lookup/expiry indexes and drop stale codes"""
+import asyncio
+import sys
+from pathlib import Path
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def migrate():
+    from app.database import engine
+
+    if engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            try:
+                await conn.execute(text("ALTER TABLE otps ALTER COLUMN otp_code TYPE VARCHAR(64)"))
+                print("✅ Widened otps.otp_code to VARCHAR(64)")
+            except Exception as e:
+                print(f"⚠️ otp_code: {e}")
+
+    async with engine.begin() as conn:
+        # Existing rows hold plain-text codes that can never match a hash
+        result = await conn.execute(text("DELETE FROM otps"))
+        print(f"✅ Removed {result.rowcount} plain-text OTPs")
+
+    indexes = {
+        "ix_otps_email_type": "otps (user_email, otp_type)",
+        "ix_otps_expires_at": "otps (expires_at)",
+    }
+    for name, target in indexes.items():
+        async with engine.begin() as conn:
+            try:
+                await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {target}"))
+                print(f"✅ Index {name}")
+            except Exception as e:
+                print(f"⚠️ {name}: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
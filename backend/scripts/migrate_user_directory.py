@@ -0,0 +1,62 @@
+"""
+Add users.search_text for the admin user directory, backfill it and create
+its indexes (a pg_trgm GIN index on PostgreSQL so substring search stays
+indexed past 100k users).
+
+Run with: python scripts/migrate_user_directory.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+BATCH_SIZE = 1000
+
+
+async def migrate():
+    from app.database import engine
+    from app.models.user import User
+
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text("ALTER TABLE users ADD COLUMN search_text TEXT"))
+            print("✅ Added users.search_text")
+        except Exception as e:
+            print(f"⚠️ search_text: {e}")
+
+    # Backfill in keyset batches so a large table isn't locked in one statement
+    last_id, filled = "", 0
+    while True:
+        async with engine.begin() as conn:
+            rows = (await conn.execute(
+                text("SELECT id, name, email, phone FROM users WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": BATCH_SIZE}
+            )).all()
+            if not rows:
+                break
+            await conn.execute(
+                text("UPDATE users SET search_text = :search_text WHERE id = :id"),
+                [{"id": r.id, "search_text": User.build_search_text(r.name, r.email, r.phone)} for r in rows]
+            )
+        filled += len(rows)
+        last_id = rows[-1].id
+    print(f"✅ Backfilled search_text for {filled} users")
+
+    indexes = {"ix_users_role_email": "CREATE INDEX IF NOT EXISTS ix_users_role_email ON users (role, email)"}
+    if engine.dialect.name == "postgresql":
+        indexes["pg_trgm"] = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+        indexes["ix_users_search_trgm"] = (
+            "CREATE INDEX IF NOT EXISTS ix_users_search_trgm ON users USING gin (search_text gin_trgm_ops)"
+        )
+    for name, sql in indexes.items():
+        async with engine.begin() as conn:
+            try:
+                await conn.execute(text(sql))
+                print(f"✅ {name}")
+            except Exception as e:
+                print(f"⚠️ {name}: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Startup profile for the API.
+
+1. Import profile: runs `python -X importtime -c "import app.main"` in a
+   fresh interpreter and reports the slowest modules (cumulative), the app
+   modules that cost the most and self time grouped by top-level package.
+2. Startup: imports the app in this process, runs the startup event
+   (create tables, background workers, warm-up) against a throwaway SQLite
+   database and times the first requests.
+
+Usage:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --top 40
+    python scripts/profile_startup.py --no-warmup     # see what the first requests pay without warm-up
+    python scripts/profile_startup.py --json startup_profile.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+FIRST_REQUESTS = ["/reading-rooms/", "/subscriptions/plans", "/locations/states"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Profile API import and startup time")
+    parser.add_argument("--top", type=int, default=25, help="Modules to list per section")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip the startup warm-up")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    return parser.parse_args()
+
+
+def parse_importtime(stderr: str):
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        module = parts[2].rstrip()
+        depth = (len(module) - len(module.lstrip())) // 2
+        rows.append((module.strip(), int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def import_profile(env, top: int) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        print(completed.stderr[-2000:])
+        raise SystemExit("❌ Importing app.main failed")
+    rows = parse_importtime(completed.stderr)
+
+    by_package = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        by_package[module.split(".")[0]] += self_us
+    app_modules = {}
+    for row in rows:
+        if row[0].startswith("app.") and row[2] > app_modules.get(row[0], ("", 0, 0, 0))[2]:
+            app_modules[row[0]] = row
+    app_modules = list(app_modules.values())
+    total = next((cumulative for module, _, cumulative, _ in rows if module == "app.main"), 0)
+
+    return {
+        "total_seconds": total / 1e6,
+        "modules": len(rows),
+        "slowest_cumulative": [
+            {"module": m, "cumulative_seconds": c / 1e6, "self_seconds": s / 1e6}
+            for m, s, c, _ in sorted(rows, key=lambda r: -r[2])[:top]
+        ],
+        "app_modules": [
+            {"module": m, "cumulative_seconds": c / 1e6, "self_seconds": s / 1e6}
+            for m, s, c, _ in sorted(app_modules, key=lambda r: -r[2])[:top]
+        ],
+        "by_package": [
+            {"package": p, "self_seconds": us / 1e6}
+            for p, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        ],
+    }
+
+
+async def startup_profile() -> dict:
+    started = time.perf_counter()
+    from app.main import app
+    import app.database as database
+    imported = time.perf_counter()
+    database.engine.echo = False
+
+    from app.core.warmup import warmup_report
+    import httpx
+
+    await app.router.startup()
+    ready = time.perf_counter()
+    first_requests = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://profile") as client:
+            for path in FIRST_REQUESTS:
+                request_started = time.perf_counter()
+                response = await client.get(path)
+                first_requests[path] = {
+                    "status": response.status_code,
+                    "seconds": time.perf_counter() - request_started,
+                }
+    finally:
+        await app.router.shutdown()
+
+    return {
+        "import_seconds": imported - started,
+        "startup_seconds": ready - imported,
+        "ready_after_seconds": ready - started,
+        "warmup": dict(warmup_report),
+        "first_requests": first_requests,
+    }
+
+
+def print_report(imports: dict, startup: dict):
+    print(f"\n📦 Import profile: app.main took {imports['total_seconds']:.3f}s ({imports['modules']} modules)")
+    print(f"\n{'Slowest modules (cumulative)':<52} {'cumul':>8} {'self':>8}")
+    for row in imports["slowest_cumulative"]:
+        print(f"  {row['module']:<50} {row['cumulative_seconds']:>7.3f}s {row['self_seconds']:>7.3f}s")
+    print(f"\n{'App modules (cumulative)':<52} {'cumul':>8} {'self':>8}")
+    for row in imports["app_modules"]:
+        print(f"  {row['module']:<50} {row['cumulative_seconds']:>7.3f}s {row['self_seconds']:>7.3f}s")
+    print(f"\n{'Self time by package':<52} {'self':>8}")
+    for row in imports["by_package"]:
+        print(f"  {row['package']:<50} {row['self_seconds']:>7.3f}s")
+
+    print("\n🚀 Startup")
+    print(f"  import app.main        {startup['import_seconds']:.3f}s")
+    print(f"  startup event          {startup['startup_seconds']:.3f}s")
+    print(f"  ready after            {startup['ready_after_seconds']:.3f}s")
+    if startup["warmup"]:
+        print("  warm-up steps:")
+        for name, step in startup["warmup"].items():
+            status = "✅" if step["ok"] else f"⚠️ {step.get('error')}"
+            print(f"    {name:<20} {step['seconds']:.3f}s {status}")
+    print("  first requests:")
+    for path, info in startup["first_requests"].items():
+        print(f"    GET {path:<30} {info['status']} {info['seconds'] * 1000:.1f} ms")
+
+
+def main():
+    args = parse_args()
+    tmp_dir = tempfile.TemporaryDirectory(prefix="sspace-startup-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp_dir.name}/startup.db"
+    if args.no_warmup:
+        os.environ["WARMUP_ON_STARTUP"] = "false"
+    try:
+        imports = import_profile(dict(os.environ), args.top)
+        startup = asyncio.run(startup_profile())
+        print_report(imports, startup)
+        if args.json:
+            args.json.write_text(json.dumps({"imports": imports, "startup": startup}, indent=2))
+    finally:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
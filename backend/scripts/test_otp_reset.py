@@ -0,0 +1,69 @@
+"""
+Test: a reset code verified on its last allowed attempt can still reset the password
+
+Runs against the configured DATABASE_URL, on both OTP store backends, with a
+throwaway user that is deleted afterwards.
+Usage: python scripts/test_otp_reset.py
+"""
+import asyncio
+import sys
+import uuid
+sys.path.insert(0, '.')
+
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal
+from app.models.otp import OTP
+from app.models.user import User
+from app.services import otp_service
+from app.services.otp_store import MemoryOTPStore, DatabaseOTPStore, OTPCheck
+
+
+async def check_store(store):
+    name = type(store).__name__
+    email = f"otp-reset-{uuid.uuid4().hex[:8]}@example.com"
+    code, wrong = "123456", "000000"
+
+    async with AsyncSessionLocal() as db:
+        db.add(User(email=email, name="OTP Test", hashed_password="x"))
+        await db.commit()
+        try:
+            await store.issue(db, email, "password_reset", code, 600)
+
+            # Use up every try but the last, then verify with the last one
+            for _ in range(store.max_attempts - 1):
+                result = await store.check(db, email, "password_reset", wrong)
+                assert result.status == OTPCheck.INVALID, result
+            result = await store.check(db, email, "password_reset", code)
+            assert result.ok and result.attempts_left == 0, result
+
+            # Guessing is still capped...
+            result = await store.redeem(db, email, "password_reset", wrong)
+            assert result.status == OTPCheck.TOO_MANY_ATTEMPTS, result
+
+            # ...but the verified code resets the password, once
+            otp_service.otp_store = store
+            ok, message = await otp_service.reset_password_with_otp(db, email, code, "new-password-1")
+            assert ok, message
+            ok, message = await otp_service.reset_password_with_otp(db, email, code, "new-password-2")
+            assert not ok, message
+            print(f"  ✓ {name}: verified on attempt {store.max_attempts}, then reset")
+        finally:
+            await db.execute(delete(OTP).where(OTP.user_email == email))
+            await db.execute(delete(User).where(User.email == email))
+            await db.commit()
+
+
+async def main():
+    print("Testing verify-on-last-attempt then password reset")
+    print("-" * 40)
+    original = otp_service.otp_store
+    try:
+        await check_store(MemoryOTPStore())
+        await check_store(DatabaseOTPStore())
+    finally:
+        otp_service.otp_store = original
+    print("✅ OTP reset flow is working!")
+
+
+asyncio.run(main())
@@ -203,8 +203,9 @@ const App: React.FC = () => {
           let myStudents: User[] = [];
           if (appState.currentUser.role === UserRole.SUPER_ADMIN) {
             try {
-              // Super Admin sees ALL users
-              myStudents = await userService.getAllUsers();
+              // Super Admin: first directory page only, for name lookups;
+              // the Users view pages through the directory itself
+              myStudents = (await userService.getDirectory({ limit: 200 })).users;
             } catch (e) {
               console.error("Failed to fetch all users", e);
             }
@@ -226,7 +227,7 @@ const App: React.FC = () => {
           setAppState(prev => {
             // For Super Admin, we REPLACE the list (to ensure we see everyone exactly as they are)
             // For others, we might want to merge or keep defaults.
-            // Since getAllUsers returns everyone, replacing is safe for SA.
+            // The directory page is authoritative for SA, so replacing is safe.
 
             let finalUsers = [...prev.users];
             if (appState.currentUser?.role === UserRole.SUPER_ADMIN) {
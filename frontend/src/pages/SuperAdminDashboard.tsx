@@ -21,7 +21,7 @@ import { bookingService } from '../services/bookingService';
 import { boostService, BoostPlan, BoostRequest } from '../services/boostService';
 import { subscriptionService } from '../services/subscriptionService';
 import { paymentService, RefundAdmin } from '../services/paymentService';
-import { userService } from '../services/userService';
+import { userService, UserDirectoryPage } from '../services/userService';
 import { SuperAdminReadingRoomReview } from './SuperAdminReadingRoomReview';
 import { SuperAdminAccommodationReview } from './SuperAdminAccommodationReview';
 import { SuperAdminAdsView } from './SuperAdminAdsView';
@@ -50,6 +50,19 @@ export const SuperAdminDashboard: React.FC<SuperAdminDashboardProps> = ({ state
         loadAds();
     }, []);
 
+    // --- USER COUNTS ---
+    // state.users holds only the first directory page, so totals come from the server
+    const [userCounts, setUserCounts] = useState<{ total: number; roleCounts: Record<string, number>; pendingKyc: number } | null>(null);
+
+    useEffect(() => {
+        Promise.all([
+            userService.getDirectory({ limit: 1 }),
+            userService.getDirectory({ role: UserRole.ADMIN, verificationStatus: 'PENDING', limit: 1 })
+        ]).then(([all, pending]) => {
+            setUserCounts({ total: all.total, roleCounts: all.roleCounts, pendingKyc: pending.total });
+        }).catch(e => console.error("Failed to load user counts", e));
+    }, []);
+
     const loadAds = async () => {
         try {
             // Use new adService.getAllAds with include_inactive=true for admin view
@@ -1057,7 +1070,7 @@ export const SuperAdminDashboard: React.FC<SuperAdminDashboardProps> = ({ state
                         <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mb-6">
                             <div className="p-4 bg-indigo-50 rounded-lg border border-indigo-100">
                                 <p className="text-xs text-indigo-600 uppercase font-bold tracking-wider">Live Users</p>
-                                <p className="text-3xl font-extrabold text-indigo-900 mt-1">{state.users.length}</p>
+                                <p className="text-3xl font-extrabold text-indigo-900 mt-1">{userCounts ? userCounts.total : state.users.length}</p>
                             </div>
 
                             <div className="p-4 bg-green-50 rounded-lg border border-green-100">
@@ -1076,7 +1089,7 @@ export const SuperAdminDashboard: React.FC<SuperAdminDashboardProps> = ({ state
                                 <p className="text-xs text-orange-600 uppercase font-bold tracking-wider">Pending KYC</p>
                                 <p className="text-3xl font-extrabold text-orange-900 mt-1">
                                     {/* Functional: Count ADMINs with PENDING status */}
-                                    {state.users.filter(u => u.role === UserRole.ADMIN && u.verificationStatus === 'PENDING').length}
+                                    {userCounts ? userCounts.pendingKyc : state.users.filter(u => u.role === UserRole.ADMIN && u.verificationStatus === 'PENDING').length}
                                 </p>
                             </div>
 
@@ -1371,12 +1384,37 @@ export const SuperAdminDashboard: React.FC<SuperAdminDashboardProps> = ({ state
     const UsersView = () => {
         const [editingUser, setEditingUser] = useState<any>(null);
         const [isUserModalOpen, setIsUserModalOpen] = useState(false);
-        const [localUsers, setLocalUsers] = useState<User[]>(state.users);
+        const [localUsers, setLocalUsers] = useState<User[]>([]);
+        const [search, setSearch] = useState('');
+        const [roleTab, setRoleTab] = useState('');
+        const [directoryPage, setDirectoryPage] = useState<UserDirectoryPage | null>(null);
+        const [isLoadingUsers, setIsLoadingUsers] = useState(false);
+
+        const roleTabs = [
+            { role: '', label: 'All' },
+            { role: 'STUDENT', label: 'Students' },
+            { role: 'ADMIN', label: 'Owners' },
+            { role: 'SUPER_ADMIN', label: 'Staff' }
+        ];
 
-        // Update local users when state.users changes
+        const loadUsers = async (cursor: string | null = null) => {
+            setIsLoadingUsers(true);
+            try {
+                const page = await userService.getDirectory({ q: search, role: roleTab, cursor, limit: 50 });
+                setDirectoryPage(page);
+                setLocalUsers(prev => cursor ? [...prev, ...page.users] : page.users);
+            } catch (e) {
+                console.error('Failed to load users', e);
+            } finally {
+                setIsLoadingUsers(false);
+            }
+        };
+
+        // Search and role tabs are applied by the server; either change restarts from the first page
         useEffect(() => {
-            setLocalUsers(state.users);
-        }, [state.users]);
+            const timer = setTimeout(() => loadUsers(), 300);
+            return () => clearTimeout(timer);
+        }, [search, roleTab]);
 
         const handleEditUser = (user: any) => {
             setEditingUser({ ...user });
@@ -1413,10 +1451,33 @@ export const SuperAdminDashboard: React.FC<SuperAdminDashboardProps> = ({ state
                         <p className="text-gray-500">Manage all students and partners.</p>
                     </div>
                     <div className="flex gap-2">
-                        <Input placeholder="Search users..." className="min-w-[300px]" />
+                        <Input
+                            placeholder="Search name, email or phone..."
+                            className="min-w-[300px]"
+                            value={search}
+                            onChange={e => setSearch(e.target.value)}
+                        />
                     </div>
                 </div>
 
+                <div className="flex gap-2">
+                    {roleTabs.map(tab => {
+                        const counts: Record<string, number> = directoryPage?.roleCounts || {};
+                        const count = tab.role
+                            ? counts[tab.role] || 0
+                            : Object.values(counts).reduce((sum, n) => sum + n, 0);
+                        return (
+                            <button
+                                key={tab.role || 'ALL'}
+                                onClick={() => setRoleTab(tab.role)}
+                                className={`px-4 py-2 rounded-lg text-sm font-medium ${roleTab === tab.role ? 'bg-indigo-600 text-white' : 'bg-white text-gray-600 border border-gray-200 hover:bg-gray-50'}`}
+                            >
+                                {tab.label} <span className="ml-1 opacity-75">{count}</span>
+                            </button>
+                        );
+                    })}
+                </div>
+
             <Card className="p-0 overflow-hidden border border-gray-200 shadow-sm">
                 <table className="w-full text-left text-sm text-gray-500">
                     <thead className="bg-gray-50 text-xs uppercase text-gray-700 font-semibold">
@@ -1460,8 +1521,19 @@ export const SuperAdminDashboard: React.FC<SuperAdminDashboardProps> = ({ state
                                 </td>
                             </tr>
                         ))}
+                        {!isLoadingUsers && localUsers.length === 0 && (
+                            <tr><td colSpan={5} className="px-6 py-8 text-center text-gray-400">No users match your search.</td></tr>
+                        )}
                     </tbody>
                 </table>
+                <div className="flex justify-between items-center px-6 py-3 bg-gray-50 text-sm text-gray-500">
+                    <span>Showing {localUsers.length} of {directoryPage?.total ?? 0}</span>
+                    {directoryPage?.nextCursor && (
+                        <Button size="sm" variant="ghost" disabled={isLoadingUsers} onClick={() => loadUsers(directoryPage.nextCursor)}>
+                            {isLoadingUsers ? 'Loading...' : 'Load more'}
+                        </Button>
+                    )}
+                </div>
             </Card>
 
             <Modal isOpen={isUserModalOpen} onClose={() => setIsUserModalOpen(false)} title="Edit User">
@@ -2955,14 +3027,17 @@ export const SuperAdminDashboard: React.FC<SuperAdminDashboardProps> = ({ state
 
     const AnalyticsView = () => {
         // Data Prep
-        const totalUsers = state.users.length;
+        const totalUsers = userCounts ? userCounts.total : state.users.length;
         const totalVenues = state.readingRooms.length; // From prop state (might need refreshing if relying on supplyService for fresh, but prop is okay for general)
         const totalBookings = state.bookings.length;
 
         // User Distribution
-        const students = state.users.filter(u => u.role === 'STUDENT').length;
-        const admins = state.users.filter(u => u.role === 'ADMIN').length;
-        const superAdmins = state.users.filter(u => u.role === 'SUPER_ADMIN').length;
+        const countRole = (role: string) => userCounts
+            ? userCounts.roleCounts[role] || 0
+            : state.users.filter(u => u.role === role).length;
+        const students = countRole('STUDENT');
+        const admins = countRole('ADMIN');
+        const superAdmins = countRole('SUPER_ADMIN');
 
         const userPieData = [
             { name: 'Students', value: students, color: '#4F46E5' }, // Indigo
@@ -15,7 +15,24 @@ export interface Favorite {
   item_city: string | null;
 }
 
+export interface FavoriteCheckResult {
+  is_favorited: boolean;
+  favorite_id: string | null;
+}
+
+interface PendingCheck {
+  accommodationId?: string;
+  readingRoomId?: string;
+  resolve: (result: FavoriteCheckResult) => void;
+  reject: (error: unknown) => void;
+}
+
 class FavoritesService {
+  // Checks requested in the same tick (e.g. every card in a listing grid)
+  // are sent together to /favorites/check-many
+  private pendingChecks: PendingCheck[] = [];
+  private checkTimer: ReturnType<typeof setTimeout> | null = null;
+
   private getAuthHeader() {
     const token = localStorage.getItem('studySpace_token');
     if (token) {
@@ -51,20 +68,49 @@ class FavoritesService {
     );
   }
 
-  async checkFavorite(accommodationId?: string, readingRoomId?: string): Promise<{
-    is_favorited: boolean;
-    favorite_id: string | null;
-  }> {
-    const params = new URLSearchParams();
-    if (accommodationId) params.append('accommodation_id', accommodationId);
-    if (readingRoomId) params.append('reading_room_id', readingRoomId);
+  async checkFavorite(accommodationId?: string, readingRoomId?: string): Promise<FavoriteCheckResult> {
+    return new Promise((resolve, reject) => {
+      this.pendingChecks.push({ accommodationId, readingRoomId, resolve, reject });
+      if (!this.checkTimer) {
+        this.checkTimer = setTimeout(() => this.flushChecks(), 0);
+      }
+    });
+  }
 
-    const response = await axios.get(
-      `${API_BASE_URL}/favorites/check?${params}`,
+  async checkFavorites(accommodationIds: string[], readingRoomIds: string[]): Promise<{
+    accommodations: Record<string, string | null>;
+    reading_rooms: Record<string, string | null>;
+  }> {
+    const response = await axios.post(
+      `${API_BASE_URL}/favorites/check-many`,
+      { accommodation_ids: accommodationIds, reading_room_ids: readingRoomIds },
       { headers: this.getAuthHeader() }
     );
     return response.data;
   }
+
+  private async flushChecks() {
+    const batch = this.pendingChecks;
+    this.pendingChecks = [];
+    this.checkTimer = null;
+
+    const accommodationIds = [...new Set(batch.filter(c => c.accommodationId).map(c => c.accommodationId as string))];
+    const readingRoomIds = [...new Set(batch.filter(c => !c.accommodationId && c.readingRoomId).map(c => c.readingRoomId as string))];
+
+    try {
+      const result = await this.checkFavorites(accommodationIds, readingRoomIds);
+      for (const check of batch) {
+        const favoriteId = check.accommodationId
+          ? result.accommodations[check.accommodationId] ?? null
+          : check.readingRoomId
+            ? result.reading_rooms[check.readingRoomId] ?? null
+            : null;
+        check.resolve({ is_favorited: favoriteId !== null, favorite_id: favoriteId });
+      }
+    } catch (error) {
+      batch.forEach(check => check.reject(error));
+    }
+  }
 }
 
 export const favoritesService = new FavoritesService();
@@ -1,22 +1,52 @@
 import api from './api';
 import { User } from '../types';
 
+export interface UserDirectoryParams {
+    q?: string;  // name, email or phone; at least 2 characters
+    role?: string;
+    verificationStatus?: User['verificationStatus'];
+    limit?: number;
+    cursor?: string | null;
+}
+
+export interface UserDirectoryPage {
+    users: User[];
+    nextCursor: string | null;
+    total: number;  // matches across the selected role
+    roleCounts: Record<string, number>;  // matches per role, ignoring the role filter
+}
+
 export const userService = {
-    getAllUsers: async (): Promise<User[]> => {
-        const response = await api.get('/users/');
-        // Mapping backend response to frontend User type if strictly needed,
-        // but typically they match. 
-        // Backend UserResponse: id, email, name, role, avatar_url, phone
-        // Frontend User: id, name, email, role, avatarUrl, phone...
-        return response.data.map((u: any) => ({
-            id: u.id,
-            name: u.name,
-            email: u.email,
-            role: u.role,
-            avatarUrl: u.avatar_url,
-            phone: u.phone,
-            verificationStatus: u.verification_status
-        }));
+    /**
+     * One page of the user directory (Super Admin only).
+     * Search and role filtering run on the server; pass nextCursor back as
+     * `cursor` for the following page.
+     */
+    getDirectory: async (params: UserDirectoryParams = {}): Promise<UserDirectoryPage> => {
+        const response = await api.get('/users/directory', {
+            params: {
+                q: params.q && params.q.trim().length >= 2 ? params.q.trim() : undefined,
+                role: params.role || undefined,
+                verification_status: params.verificationStatus || undefined,
+                limit: params.limit ?? 50,
+                cursor: params.cursor || undefined
+            }
+        });
+        const data = response.data;
+        return {
+            users: data.users.map((u: any) => ({
+                id: u.id,
+                name: u.name,
+                email: u.email,
+                role: u.role,
+                avatarUrl: u.avatar_url,
+                phone: u.phone,
+                verificationStatus: u.verification_status
+            })),
+            nextCursor: data.next_cursor,
+            total: data.total,
+            roleCounts: data.role_counts
+        };
     },
 
     getUserById: async (userId: string): Promise<User | null> => {